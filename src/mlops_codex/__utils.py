@@ -5,6 +5,8 @@ import typing
 from functools import wraps
 from typing import Callable, Type
 
+from mlops_codex.shared import json_codec
+
 
 def parse_dict_or_file(obj):
     if isinstance(obj, str):
@@ -36,7 +38,7 @@ def parse_json_to_yaml(data) -> str:
     Returns:
         str: data in the yaml format
     """
-    return json.dumps(data)
+    return json_codec.dumps(data).decode("utf-8")
 
 
 def extract_execution_number_from_string(text: str) -> int:
@@ -1,9 +1,6 @@
 from datetime import datetime, timedelta
-from time import sleep
 from typing import Optional
 
-import requests
-
 from mlops_codex.__model_states import ModelExecutionState
 from mlops_codex.__utils import (
     parse_json_to_yaml,
@@ -17,9 +14,17 @@ from mlops_codex.exceptions import (
     ModelError,
     ServerError,
 )
-from mlops_codex.http_request_handler import refresh_token, try_login
+from mlops_codex.http_request_handler import TokenManager, Transport, try_login
 from mlops_codex.logger_config import get_logger
-from mlops_codex.shared.utils import check_lib_version
+from mlops_codex.shared.data_transmitter import (
+    DOWNLOAD_CHUNK_SIZE,
+    ranged_download,
+    stream_to_file,
+)
+from mlops_codex.shared.progress import ProgressCallback
+from mlops_codex.shared.utils import check_lib_version_in_background
+from mlops_codex.shared.waiter import CancelHook, WaitPolicy, wait_until
+from mlops_codex.watcher import FutureExecutionMixin
 
 logger = get_logger()
 
@@ -27,6 +32,30 @@ logger = get_logger()
 class BaseMLOps:
     """
     Super base class to initialize other variables and URLs for other MLOps classes.
+
+    Parameters
+    ----------
+    login: str
+        Login for authenticating with the client
+    password: str
+        Password for authenticating with the client
+    tenant: str
+        Company name
+    transport: Optional[Transport], optional
+        Pooled HTTP transport used by every request of this object. When not informed,
+        the transport of `parent` is reused, or a new one is created
+    parent: Optional[BaseMLOps], optional
+        Object that created this one. Its connections and its user session are shared
+        with this object, so it does not log in again
+    lazy_connect: bool, optional
+        Do not contact the server when the object is created. The user logs in on the
+        first request instead. Objects created with a `parent` are always lazy
+
+    Attributes
+    ----------
+    wait_policy: WaitPolicy
+        Intervals and timeout used by the `wait_*` methods. Objects created with a
+        `parent` start with the policy of the parent
     """
 
     def __init__(
@@ -34,28 +63,75 @@ class BaseMLOps:
         *,
         login: str,
         password: str,
-        tenant: str
+        tenant: str,
+        transport: Optional[Transport] = None,
+        parent: Optional["BaseMLOps"] = None,
+        lazy_connect: bool = False,
     ) -> None:
 
-        check_lib_version()
+        check_lib_version_in_background()
 
         self.credentials = (login, password, tenant)
         self.base_url = "https://neomaril.datarisk.net/"
         self.base_url = parse_url(self.base_url)
 
-        self.user_token, self.version = try_login(
+        if transport is None:
+            transport = parent._transport if parent is not None else Transport()
+        self._transport = transport
+        self._parent = parent
+        self._version = None
+        self.wait_policy = parent.wait_policy if parent is not None else WaitPolicy()
+
+        if parent is not None and parent.credentials == self.credentials:
+            self._token_manager = parent._token_manager
+        else:
+            self._token_manager = TokenManager(
+                *self.credentials, self.base_url, transport=self._transport
+            )
+
+        if parent is None and not lazy_connect:
+            self.connect()
+
+    @property
+    def user_token(self) -> str:
+        """User bearer token. The user logs in on the first access"""
+        return self._token_manager.get_token()
+
+    @property
+    def version(self) -> Optional[str]:
+        """Version of the MLOps server. The server is contacted on the first access"""
+        if self._version is None:
+            if self._parent is not None:
+                self._version = self._parent.version
+            else:
+                self.connect()
+        return self._version
+
+    def connect(self) -> None:
+        """
+        Check that the server is available and log in.
+
+        Raises
+        ------
+        AuthenticationError
+            Invalid credentials
+        ServerError
+            Server unavailable
+        """
+        token, self._version = try_login(
             self.credentials[0],
             self.credentials[1],
             self.credentials[2],
             self.base_url,
+            self._transport,
         )
+        self._token_manager.set_token(token)
         logger.info("Successfully connected to MLOps")
 
     def _logs(
         self,
         *,
         url,
-        credentials,
         start: Optional[str] = None,
         end: Optional[str] = None,
         routine: Optional[str] = None,
@@ -85,12 +161,11 @@ class BaseMLOps:
             assert type in ["Ok", "Error", "Debug", "Warning"]
             query["type"] = type
 
-        response = requests.get(
+        response = self._transport.get(
             url,
             params=query,
-            headers={
-                "Authorization": "Bearer " + refresh_token(*credentials, self.base_url)
-            },
+            headers={"Authorization": "Bearer " + self._token_manager.get_token()},
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 200:
@@ -163,15 +238,16 @@ class BaseMLOpsClient(BaseMLOps):
 
         url = f"{self.base_url}/groups"
 
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
-        response = requests.get(
+        response = self._transport.get(
             url,
             headers={
                 "Authorization": "Bearer " + token,
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.list_groups.__qualname__,
             },
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 200:
@@ -222,9 +298,9 @@ class BaseMLOpsClient(BaseMLOps):
         data = {"name": name, "description": description}
 
         url = f"{self.base_url}/groups"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
-        response = requests.post(
+        response = self._transport.post(
             url,
             data=data,
             headers={
@@ -232,6 +308,7 @@ class BaseMLOpsClient(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.create_group.__qualname__,
             },
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 201:
@@ -305,9 +382,9 @@ class BaseMLOpsClient(BaseMLOps):
         """
 
         url = f"{self.base_url}/groups/refresh/{name}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
-        response = requests.get(
+        response = self._transport.get(
             url,
             params={"force": str(force).lower()},
             headers={
@@ -315,6 +392,7 @@ class BaseMLOpsClient(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.refresh_group_token.__qualname__,
             },
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 201:
@@ -338,10 +416,12 @@ class BaseMLOpsClient(BaseMLOps):
         raise InputError("Bad Input. Client error")
 
 
-class MLOpsExecution(BaseMLOps):
+class MLOpsExecution(FutureExecutionMixin, BaseMLOps):
     """
     Base class for MLOps asynchronous model executions. With this class you can visualize the status of an execution and download the results after and execution has finished.
 
+    The execution also works like a `concurrent.futures.Future`: `done`, `result`, `exception` and `add_done_callback` are resolved by a background poller, so no thread is blocked while it runs.
+
     Parameters
     ----------
     parent_id: str
@@ -356,6 +436,8 @@ class MLOpsExecution(BaseMLOps):
         Login for authenticating with the client. You can also use the env variable MLOPS_USER to set this
     password: Optional[str], optional
         Password for authenticating with the client. You can also use the env variable MLOPS_PASSWORD to set this
+    parent: Optional[BaseMLOps], optional
+        Object that created this execution. Its connections and user session are shared with the execution
 
     Raises
     ------
@@ -403,8 +485,9 @@ class MLOpsExecution(BaseMLOps):
         group: Optional[str] = None,
         exec_id: Optional[str] = None,
         group_token: Optional[str] = None,
+        parent: Optional[BaseMLOps] = None,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(login=login, password=password, tenant=tenant, parent=parent)
 
         self.exec_type = exec_type
         self.exec_id = exec_id
@@ -432,12 +515,13 @@ class MLOpsExecution(BaseMLOps):
 
         else:
             url = f"{self.base_url}/{self.__url_path.replace('/async', '')}/describe/{group}/{parent_id}/{exec_id}"
-            response = requests.get(
+            response = self._transport.get(
                 url,
                 headers={
                     "Authorization": "Bearer "
-                    + refresh_token(*self.credentials, self.base_url)
+                    + self._token_manager.get_token()
                 },
+                token_manager=self._token_manager,
             )
 
             if response.status_code == 401:
@@ -485,7 +569,7 @@ class MLOpsExecution(BaseMLOps):
 
         url = f"{self.base_url}/{self.__url_path}/status/{self.group}/{self.exec_id}"
 
-        response = requests.get(
+        response = self._transport.get(
             url, headers={"Authorization": "Bearer " + self.__token}
         )
         if response.status_code not in [200, 410]:
@@ -500,22 +584,41 @@ class MLOpsExecution(BaseMLOps):
 
         return result
 
-    def wait_ready(self) -> None:
+    def wait_ready(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ) -> None:
         """
         Waits the execution until is no longer running
 
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+
+        Raises
+        ------
+        ExecutionError
+            Execution failed
+        WaitTimeoutError
+            The execution did not finish before `timeout`
+        WaitCancelledError
+            The wait was cancelled
+
         Example
         -------
         >>> model.wait_ready()
         """
 
-        self.status = ModelExecutionState[self.get_status()["Status"]]
-        while self.status in [
-            ModelExecutionState.Requested,
-            ModelExecutionState.Running,
-        ]:
-            sleep(30)
-            self.status = ModelExecutionState[self.get_status()["Status"]]
+        self.status = wait_until(
+            lambda: ModelExecutionState[self.get_status()["Status"]],
+            lambda status: status
+            not in [ModelExecutionState.Requested, ModelExecutionState.Running],
+            policy=self.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+        )
         if self.status == ModelExecutionState.Failed:
             logger.error("Execution failed! Please check the logs")
             raise ExecutionError(
@@ -524,10 +627,17 @@ class MLOpsExecution(BaseMLOps):
         logger.info("Execution completed successfully")
 
     def download_result(
-        self, *, path: Optional[str] = "./", filename: Optional[str] = "output.zip"
+        self,
+        *,
+        path: Optional[str] = "./",
+        filename: Optional[str] = "output.zip",
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+        parts: Optional[int] = None,
     ) -> None:
         """
-        Gets the output of the execution.
+        Gets the output of the execution. The file is streamed to disk and only appears at its path once it is complete.
 
         Parameters
         ---------
@@ -535,11 +645,21 @@ class MLOpsExecution(BaseMLOps):
             Path of the result file. Default value is './'
         filename: Optional[str], optional
             Name of the result file. Default value is 'output.zip'
+        chunk_size: int, optional
+            Number of bytes read at a time, which bounds the memory used. Default value is 1 MB
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called after every chunk with the bytes received and the throughput
+        checksum: Optional[str], optional
+            Expected digest of the file, like 'sha256:ab12...'
+        parts: Optional[int], optional
+            Download with HTTP Range requests, fetching up to this many byte ranges in parallel. An interrupted download is resumed by calling this method again. Falls back to a single stream when the server does not support ranges. Default value is None, which always uses a single stream
 
         Raises
         ------
         ExecutionError
             Execution is unavailable or failed status.
+        DownloadError
+            The file is incomplete or does not match `checksum`.
         """
         if self.status in [ModelExecutionState.Running, ModelExecutionState.Requested]:
             self.status = ModelExecutionState[self.get_status()["Status"]]
@@ -547,32 +667,55 @@ class MLOpsExecution(BaseMLOps):
         if self.exec_type in ["AsyncModel", "AsyncPreprocessing"]:
             token = self.__token
         elif self.exec_type == "Training":
-            token = refresh_token(*self.credentials, self.base_url)
+            token = self._token_manager.get_token()
 
         if self.status == ModelExecutionState.Succeeded:
             url = (
                 f"{self.base_url}/{self.__url_path}/result/{self.group}/{self.exec_id}"
             )
-            response = requests.get(
-                url,
-                headers={
-                    "Authorization": "Bearer " + token,
-                    "Neomaril-Origin": "Codex",
-                    "Neomaril-Method": self.download_result.__qualname__,
-                },
-            )
-            if response.status_code not in [200, 410]:
-                formatted_msg = parse_json_to_yaml(response.json())
-                logger.error(f"Something went wrong...\n{formatted_msg}")
-                raise ExecutionError(f'Execution "{self.exec_id}" unavailable')
+            headers = {
+                "Authorization": "Bearer " + token,
+                "Neomaril-Origin": "Codex",
+                "Neomaril-Method": self.download_result.__qualname__,
+            }
 
             if not path.endswith("/"):
                 filename = "/" + filename
 
-            with open(path + filename, "wb") as f:
-                f.write(response.content)
+            if parts:
+                destination = ranged_download(
+                    dict(
+                        url=url,
+                        method="GET",
+                        success_code=200,
+                        custom_exception=ExecutionError,
+                        custom_exception_message=f'Execution "{self.exec_id}" unavailable',
+                        specific_error_code=404,
+                        headers=headers,
+                        transport=self._transport,
+                    ),
+                    path + filename,
+                    parts=parts,
+                    chunk_size=chunk_size,
+                    progress=progress,
+                    checksum=checksum,
+                )
+            else:
+                response = self._transport.get(url, headers=headers, stream=True)
+                if response.status_code not in [200, 410]:
+                    formatted_msg = parse_json_to_yaml(response.json())
+                    logger.error(f"Something went wrong...\n{formatted_msg}")
+                    raise ExecutionError(f'Execution "{self.exec_id}" unavailable')
+
+                destination = stream_to_file(
+                    response,
+                    path + filename,
+                    chunk_size=chunk_size,
+                    progress=progress,
+                    checksum=checksum,
+                )
 
-            logger.info(f"Output saved in {path + filename}")
+            logger.info(f"Output saved in {destination}")
         elif self.status == ModelExecutionState.Failed:
             raise ExecutionError("Execution failed")
         else:
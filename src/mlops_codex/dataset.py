@@ -1,11 +1,27 @@
+import asyncio
 from dataclasses import dataclass, field
 from typing import Optional
 
 from mlops_codex.__utils import parse_json_to_yaml
-from mlops_codex.base import BaseMLOpsClient
+from mlops_codex.base import BaseMLOps, BaseMLOpsClient
 from mlops_codex.exceptions import DatasetNotFoundError
-from mlops_codex.http_request_handler import make_request, refresh_token
+from mlops_codex.http_request_handler import (
+    TokenManager,
+    Transport,
+    async_make_request,
+    make_request,
+    refresh_token,
+)
 from mlops_codex.logger_config import get_logger
+from mlops_codex.shared.compression import ACCEPT_ENCODING
+from mlops_codex.shared.data_transmitter import (
+    DOWNLOAD_CHUNK_SIZE,
+    async_stream_to_file,
+    ranged_download,
+    stream_to_file,
+)
+from mlops_codex.shared.progress import ProgressCallback
+from mlops_codex.shared.upload_index import forget_upload
 
 logger = get_logger()
 
@@ -46,12 +62,31 @@ class MLOpsDatasetClient(BaseMLOpsClient):
         Password for authenticating with the client. You can also use the env variable MLOPS_PASSWORD to set this
     url: str
         URL to MLOps Server. Default value is https://neomaril.datarisk.net, use it to test your deployment first before changing to production. You can also use the env variable MLOPS_URL to set this
+    transport: Optional[Transport], optional
+        Pooled HTTP transport shared by the client and every dataset it returns
+    parent: Optional[BaseMLOps], optional
+        Object that created this client. Its connections and user session are shared with the client
+    lazy_connect: bool, optional
+        Do not contact the server when the client is created. The user logs in on the first request instead
     """
 
     def __init__(
-        self, login: str, password: str, tenant: str
+        self,
+        login: str,
+        password: str,
+        tenant: str,
+        transport: Optional[Transport] = None,
+        parent: Optional[BaseMLOps] = None,
+        lazy_connect: bool = False,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(
+            login=login,
+            password=password,
+            tenant=tenant,
+            transport=transport,
+            parent=parent,
+            lazy_connect=lazy_connect,
+        )
 
     def __query_datasets(
         self,
@@ -62,7 +97,7 @@ class MLOpsDatasetClient(BaseMLOpsClient):
         group: Optional[str] = None,
     ):
         url = f"{self.base_url}/datasets/list"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         query = {}
 
@@ -89,6 +124,8 @@ class MLOpsDatasetClient(BaseMLOpsClient):
                 "Neomaril-Method": self.list_datasets.__qualname__,
             },
             params=query,
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
         return response
 
@@ -104,6 +141,8 @@ class MLOpsDatasetClient(BaseMLOpsClient):
                     hash=dataset_hash,
                     dataset_name=r["Name"],
                     group=r["Group"],
+                    transport=self._transport,
+                    token_manager=self._token_manager,
                 )
 
         logger.info(f"Dataset {dataset_hash} not found")
@@ -124,7 +163,7 @@ class MLOpsDatasetClient(BaseMLOpsClient):
         >>> dataset.delete()
         """
         url = f"{self.url}/datasets/{group}/{dataset_hash}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         make_request(
             url=url,
             method="DELETE",
@@ -137,8 +176,11 @@ class MLOpsDatasetClient(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.delete.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
+        forget_upload(self.base_url, self.credentials[2], group, dataset_hash)
         logger.info(f"Dataset {dataset_hash} deleted.")
 
     def list_datasets(
@@ -193,6 +235,10 @@ class MLOpsDataset:
         Name of the group where we will search the dataset
     origin: str
         Origin of the dataset. It can be "Training", "Preprocessing", "Datasource" or "Model"
+    transport: Optional[Transport], optional
+        Pooled HTTP transport of the client that created the dataset
+    token_manager: Optional[TokenManager], optional
+        User session of the client that created the dataset. When not informed, the user logs in on every download
     """
 
     login: str = field(repr=False)
@@ -202,14 +248,24 @@ class MLOpsDataset:
     hash: str
     dataset_name: str
     group: str
+    transport: Optional[Transport] = field(default=None, repr=False, compare=False)
+    token_manager: Optional[TokenManager] = field(
+        default=None, repr=False, compare=False
+    )
 
     def download(
         self,
         path: Optional[str] = "./",
         filename: Optional[str] = "dataset",
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+        parts: Optional[int] = None,
     ) -> None:
         """
         Download a dataset from mlops. The dataset will be a csv or parquet file.
+        It is streamed to disk and only appears at its path once it is complete.
 
         Parameters
         ----------
@@ -217,6 +273,16 @@ class MLOpsDataset:
             Path to the downloaded dataset. Defaults to './'.
         filename: str, optional
             Name of the downloaded dataset. Defaults to 'dataset.zip'.
+        chunk_size: int, optional
+            Number of bytes read at a time, which bounds the memory used. Defaults to 1 MB.
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called after every chunk with the bytes received and the throughput.
+        checksum: Optional[str], optional
+            Expected digest of the file, like 'sha256:ab12...'.
+        parts: Optional[int], optional
+            Download with HTTP Range requests, fetching up to this many byte ranges in parallel.
+            An interrupted download is resumed by calling this method again. Falls back to a
+            single stream when the server does not support ranges. Defaults to None.
 
         Raises
         ------
@@ -226,31 +292,121 @@ class MLOpsDataset:
             Raised if there is no dataset with the given name.
         ServerError
             Raised if the server encounters an issue.
+        DownloadError
+            Raised if the file is incomplete or does not match the checksum.
         """
 
-        if not path.endswith("/"):
-            path = path + "/"
+        if self.token_manager is not None:
+            token = self.token_manager.get_token()
+        else:
+            token = refresh_token(
+                self.login, self.password, self.tenant, self.base_url, self.transport
+            )
+        if parts:
+            destination = ranged_download(
+                self._download_request(token),
+                self._download_path(path, filename),
+                parts=parts,
+                chunk_size=chunk_size,
+                progress=progress,
+                checksum=checksum,
+                suffix=self._dataset_suffix,
+            )
+        else:
+            response = make_request(**self._download_request(token), stream=True)
+            destination = stream_to_file(
+                response,
+                self._download_path(path, filename),
+                chunk_size=chunk_size,
+                progress=progress,
+                checksum=checksum,
+                suffix=self._dataset_suffix,
+            )
+        logger.info(f"MLOpsDataset downloaded to {destination}")
+
+    async def adownload(
+        self,
+        path: Optional[str] = "./",
+        filename: Optional[str] = "dataset",
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+    ) -> None:
+        """
+        Asyncio version of `download`. Requires the optional `httpx` dependency
 
-        url = f"{self.base_url}/datasets/result/{self.group}/{self.hash}"
-        token = refresh_token(self.login, self.password, self.base_url)
-        response = make_request(
-            url=url,
+        Parameters
+        ----------
+        path: str, optional
+            Path to the downloaded dataset. Defaults to './'.
+        filename: str, optional
+            Name of the downloaded dataset. Defaults to 'dataset.zip'.
+        chunk_size: int, optional
+            Number of bytes read at a time, which bounds the memory used. Defaults to 1 MB.
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called after every chunk with the bytes received and the throughput.
+        checksum: Optional[str], optional
+            Expected digest of the file, like 'sha256:ab12...'.
+
+        Raises
+        ------
+        AuthenticationError
+            Raised if there is an authentication issue.
+        DatasetNotFoundError
+            Raised if there is no dataset with the given name.
+        ServerError
+            Raised if the server encounters an issue.
+        DownloadError
+            Raised if the file is incomplete or does not match the checksum.
+        """
+        if self.token_manager is not None:
+            token = await self.token_manager.aget_token()
+        else:
+            token = await asyncio.to_thread(
+                refresh_token,
+                self.login,
+                self.password,
+                self.tenant,
+                self.base_url,
+                self.transport,
+            )
+        response = await async_make_request(
+            **self._download_request(token), stream=True
+        )
+        destination = await async_stream_to_file(
+            response,
+            self._download_path(path, filename),
+            chunk_size=chunk_size,
+            progress=progress,
+            checksum=checksum,
+            suffix=self._dataset_suffix,
+        )
+        logger.info(f"MLOpsDataset downloaded to {destination}")
+
+    def _download_request(self, token: str) -> dict:
+        """Build the arguments of the request that downloads the dataset"""
+        return dict(
+            url=f"{self.base_url}/datasets/result/{self.group}/{self.hash}",
             method="GET",
             success_code=200,
             headers={
                 "Authorization": "Bearer " + token,
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.download.__qualname__,
+                "Accept-Encoding": ACCEPT_ENCODING,
             },
+            token_manager=self.token_manager,
+            transport=self.transport,
         )
 
-        try:
-            response.content.decode("utf-8")
-            filename += ".csv"
-        except UnicodeDecodeError:
-            filename += ".parquet"
-
-        with open(path + filename, "wb") as dataset_file:
-            dataset_file.write(response.content)
+    @staticmethod
+    def _download_path(path: str, filename: str) -> str:
+        if not path.endswith("/"):
+            path = path + "/"
+        return path + filename
 
-        logger.info(f"MLOpsDataset downloaded to {path + filename}")
+    @staticmethod
+    def _dataset_suffix(head: bytes) -> str:
+        """Tell the file extension from the first bytes of the dataset"""
+        return ".parquet" if head.startswith(b"PAR1") else ".csv"
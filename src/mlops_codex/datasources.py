@@ -1,7 +1,5 @@
 import json
-from typing import Dict, Union
-
-import requests
+from typing import Dict, Optional, Union
 
 from mlops_codex.__utils import parse_json_to_yaml
 from mlops_codex.base import BaseMLOps, BaseMLOpsClient
@@ -13,7 +11,7 @@ from mlops_codex.exceptions import (
     InputError,
     ServerError,
 )
-from mlops_codex.http_request_handler import make_request, refresh_token
+from mlops_codex.http_request_handler import Transport, make_request
 from mlops_codex.logger_config import get_logger
 
 logger = get_logger()
@@ -33,6 +31,10 @@ class MLOpsDataSourceClient(BaseMLOpsClient):
         You can also use the env variable MLOPS_PASSWORD to set this
     url: str
         URL to MLOps Server. Default value is https://neomaril.datarisk.net/, use it to test your deployment first before changing to production. You can also use the env variable MLOPS_URL to set this
+    transport: Optional[Transport], optional
+        Pooled HTTP transport shared by the client and every datasource it returns
+    lazy_connect: bool, optional
+        Do not contact the server when the client is created. The user logs in on the first request instead
 
     Raises
     ------
@@ -45,9 +47,20 @@ class MLOpsDataSourceClient(BaseMLOpsClient):
     """
 
     def __init__(
-        self, login: str, password: str, tenant: str
+        self,
+        login: str,
+        password: str,
+        tenant: str,
+        transport: Optional[Transport] = None,
+        lazy_connect: bool = False,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(
+            login=login,
+            password=password,
+            tenant=tenant,
+            transport=transport,
+            lazy_connect=lazy_connect,
+        )
 
     def register_datasource(
         self,
@@ -93,6 +106,7 @@ class MLOpsDataSourceClient(BaseMLOpsClient):
             login=self.credentials[0],
             password=self.credentials[1],
             tenant=self.credentials[2],
+            parent=self,
         )
 
         url = f"{self.base_url}/datasource/register/{group}"
@@ -113,9 +127,9 @@ class MLOpsDataSourceClient(BaseMLOpsClient):
                 open(credential_path, "rb"),
             )
         }
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
-        response = requests.post(
+        response = self._transport.post(
             url=url,
             data=form_data,
             files=files,
@@ -125,6 +139,7 @@ class MLOpsDataSourceClient(BaseMLOpsClient):
                 "Neomaril-Method": self.register_datasource.__qualname__,
             },
             timeout=60,
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 200:
@@ -189,9 +204,9 @@ class MLOpsDataSourceClient(BaseMLOpsClient):
         """
         url = f"{self.base_url}/datasource/list?group={group}&provider={provider}"
 
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
-        response = requests.get(
+        response = self._transport.get(
             url=url,
             headers={
                 "Authorization": "Bearer " + token,
@@ -199,6 +214,7 @@ class MLOpsDataSourceClient(BaseMLOpsClient):
                 "Neomaril-Method": self.list_datasources.__qualname__,
             },
             timeout=60,
+            token_manager=self._token_manager,
         )
         if response.status_code == 200:
             results = response.json().get("Results")
@@ -251,6 +267,7 @@ class MLOpsDataSourceClient(BaseMLOpsClient):
                     login=self.credentials[0],
                     password=self.credentials[1],
                     tenant=self.credentials[2],
+                    parent=self,
                 )
         raise InputError("Datasource not found!")
 
@@ -278,6 +295,8 @@ class MLOpsDataSource(BaseMLOps):
         Google GCP as "GCP".
     group: str
         Name of the group where we will search the datasources
+    parent: Optional[BaseMLOps], optional
+        Object that created this datasource. Its connections and user session are shared with it
     """
 
     def __init__(
@@ -288,13 +307,16 @@ class MLOpsDataSource(BaseMLOps):
         group: str,
         login: str,
         password: str,
-        tenant: str
+        tenant: str,
+        parent: Optional[BaseMLOps] = None,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(login=login, password=password, tenant=tenant, parent=parent)
         self.datasource_name = datasource_name
         self.provider = provider
         self.group = group
-        self.__datasets = MLOpsDatasetClient(login=login, password=password, tenant=tenant)
+        self.__datasets = MLOpsDatasetClient(
+            login=login, password=password, tenant=tenant, parent=self
+        )
 
     def import_dataset(
         self, *, dataset_uri: str, dataset_name: str, force: bool = False
@@ -336,9 +358,9 @@ class MLOpsDataSource(BaseMLOps):
 
         force = str(force).lower()
 
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         url = f"{self.base_url}/datasource/import/{self.group}/{self.datasource_name}?force={force}"
-        response = requests.post(
+        response = self._transport.post(
             url=url,
             data=form_data,
             headers={
@@ -347,6 +369,7 @@ class MLOpsDataSource(BaseMLOps):
                 "Neomaril-Method": self.import_dataset.__qualname__,
             },
             timeout=60,
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 200:
@@ -361,6 +384,8 @@ class MLOpsDataSource(BaseMLOps):
                     hash=dataset_hash,
                     dataset_name=dataset_name,
                     group=self.group,
+                    transport=self._transport,
+                    token_manager=self._token_manager,
                 )
                 return dataset
             else:
@@ -374,6 +399,8 @@ class MLOpsDataSource(BaseMLOps):
                         hash=ds,
                         dataset_name=dataset_name + f"_{i}",
                         group=self.group,
+                        transport=self._transport,
+                        token_manager=self._token_manager,
                     )
                     dts[f"dataset_{i}"] = dataset
                 return dts
@@ -403,8 +430,8 @@ class MLOpsDataSource(BaseMLOps):
         """
         url = f"{self.base_url}/datasources/{self.group}/{self.datasource_name}"
 
-        token = refresh_token(*self.credentials, self.base_url)
-        response = requests.delete(
+        token = self._token_manager.get_token()
+        response = self._transport.delete(
             url=url,
             headers={
                 "Authorization": "Bearer " + token,
@@ -412,6 +439,7 @@ class MLOpsDataSource(BaseMLOps):
                 "Neomaril-Method": self.delete.__qualname__,
             },
             timeout=60,
+            token_manager=self._token_manager,
         )
         logger.info(response.json().get("Message"))
 
@@ -453,6 +481,8 @@ class MLOpsDataSource(BaseMLOps):
                     hash=dataset.get("Hash"),
                     dataset_name=dataset.get("Name"),
                     group=self.group,
+                    transport=self._transport,
+                    token_manager=self._token_manager,
                 )
         raise DatasetNotFoundError("Dataset hash not found!")
 
@@ -492,7 +522,7 @@ class MLOpsDataSource(BaseMLOps):
         >>> dataset.get_status()
         """
         url = f"{self.base_url}/datasets/status/{group}/{dataset_hash}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         response = make_request(
             url=url,
             method="GET",
@@ -505,6 +535,8 @@ class MLOpsDataSource(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.get_status.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
         status = response.json().get("Status")
@@ -80,3 +80,27 @@ class UnexpectedError(Exception):
     """Raised when an unexpected error occurs"""
 
     pass
+
+
+class WaitTimeoutError(Exception):
+    """Raised when a wait does not finish before its timeout"""
+
+    pass
+
+
+class WaitCancelledError(Exception):
+    """Raised when a wait is cancelled by its cancellation hook"""
+
+    pass
+
+
+class DownloadError(Exception):
+    """Raised when a downloaded file is incomplete or does not match its checksum"""
+
+    pass
+
+
+class CircuitOpenError(ServerError):
+    """Raised without contacting the server when its endpoint is failing and its circuit breaker is open"""
+
+    pass
@@ -3,11 +3,8 @@ External Monitoring Module
 """
 
 from datetime import datetime
-from time import sleep
 from typing import NamedTuple, Optional
 
-import requests
-
 from mlops_codex.__model_states import MonitoringStatus
 from mlops_codex.__utils import parse_json_to_yaml, validate_kwargs
 from mlops_codex.base import BaseMLOps, BaseMLOpsClient
@@ -19,8 +16,9 @@ from mlops_codex.exceptions import (
     InputError,
     ServerError,
 )
-from mlops_codex.http_request_handler import refresh_token
+from mlops_codex.http_request_handler import Transport
 from mlops_codex.logger_config import get_logger
+from mlops_codex.shared.waiter import CancelHook, wait_until
 from mlops_codex.validations import validate_python_version
 
 logger = get_logger()
@@ -29,6 +27,11 @@ logger = get_logger()
 class MLOpsExternalMonitoring(BaseMLOps):
     """
     Class that handles an external monitoring object
+
+    Parameters
+    ----------
+    parent: Optional[BaseMLOps], optional
+        Object that created this monitoring. Its connections and user session are shared with it
     """
 
     def __init__(
@@ -38,10 +41,11 @@ class MLOpsExternalMonitoring(BaseMLOps):
         login: str,
         password: str,
         tenant: str,
-        status: Optional[MonitoringStatus] = MonitoringStatus.Unvalidated
+        status: Optional[MonitoringStatus] = MonitoringStatus.Unvalidated,
+        parent: Optional[BaseMLOps] = None,
     ):
 
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(login=login, password=password, tenant=tenant, parent=parent)
         self.external_monitoring_url = f"{self.base_url}/external-monitoring"
         self.ex_monitoring_hash = ex_monitoring_hash
         self.group = group
@@ -85,17 +89,18 @@ class MLOpsExternalMonitoring(BaseMLOps):
             file_name = file_extensions[file.rsplit(".", maxsplit=1)[-1]]
 
         upload_data = [(field, (file_name, open(file, "rb")))]
-        response = requests.patch(
+        response = self._transport.patch(
             url,
             data=form,
             files=upload_data,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
+                + self._token_manager.get_token(),
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.upload_file.__qualname__,
             },
             timeout=60,
+            token_manager=self._token_manager,
         )
 
         formatted_msg = parse_json_to_yaml(response.json())
@@ -245,15 +250,16 @@ class MLOpsExternalMonitoring(BaseMLOps):
             )
             return
 
-        response = requests.patch(
+        response = self._transport.patch(
             url=f"{self.external_monitoring_url}/{self.ex_monitoring_hash}/status",
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
+                + self._token_manager.get_token(),
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.host.__qualname__,
             },
             timeout=60,
+            token_manager=self._token_manager,
         )
 
         formatted_msg = parse_json_to_yaml(response.json())
@@ -280,39 +286,35 @@ class MLOpsExternalMonitoring(BaseMLOps):
 
         raise ExternalMonitoringError("Unknown error. Please contact administrator.")
 
-    def wait_ready(self):
+    def wait_ready(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ):
         """
         Check the status of the external monitoring.
 
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+
         Returns
         -------
         str
             The status of the external monitoring.
         """
-        response = requests.get(
-            url=f"{self.external_monitoring_url}/{self.ex_monitoring_hash}/status",
-            headers={
-                "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
-            },
-            timeout=60,
-        )
-        message = response.json()
-        status = message["Status"]
-
-        print("Waiting the monitoring host...", end="")
 
-        while status not in [MonitoringStatus.Validated, MonitoringStatus.Invalidated]:
-            response = requests.get(
+        def get_status() -> dict:
+            response = self._transport.get(
                 url=f"{self.external_monitoring_url}/{self.ex_monitoring_hash}/status",
                 headers={
                     "Authorization": "Bearer "
-                    + refresh_token(*self.credentials, self.base_url),
+                    + self._token_manager.get_token(),
                 },
                 timeout=60,
+                token_manager=self._token_manager,
             )
-            message = response.json()
-            status = message["Status"]
 
             formatted_msg = parse_json_to_yaml(response.json())
             if response.status_code == 401:
@@ -335,8 +337,20 @@ class MLOpsExternalMonitoring(BaseMLOps):
                     "Unexpected error. Could not register the monitoring."
                 )
 
-            print(".", end="", flush=True)
-            sleep(30)
+            return response.json()
+
+        print("Waiting the monitoring host...", end="")
+
+        message = wait_until(
+            get_status,
+            lambda message: message["Status"]
+            in [MonitoringStatus.Validated, MonitoringStatus.Invalidated],
+            policy=self.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+            on_check=lambda _: print(".", end="", flush=True),
+        )
+        status = message["Status"]
 
         if status == MonitoringStatus.Invalidated:
             res_message = message["Message"]
@@ -363,7 +377,7 @@ class MLOpsExternalMonitoring(BaseMLOps):
         url = f"{self.base_url}/monitoring/search/records/{self.group}/{self.ex_monitoring_hash}"
         print(
             parse_json_to_yaml(
-                self._logs(url=url, credentials=self.credentials, start=start, end=end)
+                self._logs(url=url, start=start, end=end)
             )
         )
 
@@ -382,6 +396,10 @@ class MLOpsExternalMonitoringClient(BaseMLOpsClient):
         You can also use the env variable MLOPS_PASSWORD to set this
     url: str
         URL to MLOps Server. Default value is https://neomaril.datarisk.net/, use it to test your deployment first before changing to production. You can also use the env variable MLOPS_URL to set this
+    transport: Optional[Transport], optional
+        Pooled HTTP transport shared by the client and every monitoring it returns
+    lazy_connect: bool, optional
+        Do not contact the server when the client is created. The user logs in on the first request instead
 
     Raises
     ------
@@ -394,9 +412,20 @@ class MLOpsExternalMonitoringClient(BaseMLOpsClient):
     """
 
     def __init__(
-        self, login: str, password: str, tenant: str
+        self,
+        login: str,
+        password: str,
+        tenant: str,
+        transport: Optional[Transport] = None,
+        lazy_connect: bool = False,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(
+            login=login,
+            password=password,
+            tenant=tenant,
+            transport=transport,
+            lazy_connect=lazy_connect,
+        )
 
     # TODO: It would be more appropriate to move this to an internal creation method, as its current placement seems illogical.
     #       btw, it is my mistake!!
@@ -446,16 +475,17 @@ class MLOpsExternalMonitoringClient(BaseMLOpsClient):
         Returns:
             External monitoring Hash
         """
-        response = requests.post(
+        response = self._transport.post(
             url,
             json=configuration,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
+                + self._token_manager.get_token(),
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.register_monitoring.__qualname__,
             },
             timeout=60,
+            token_manager=self._token_manager,
         )
         formatted_msg = parse_json_to_yaml(response.json())
 
@@ -590,6 +620,7 @@ class MLOpsExternalMonitoringClient(BaseMLOpsClient):
             group=kwargs["group"],
             ex_monitoring_hash=external_monitoring_hash,
             status=MonitoringStatus.Unvalidated,
+            parent=self,
         )
 
         logger.info(
@@ -600,13 +631,14 @@ class MLOpsExternalMonitoringClient(BaseMLOpsClient):
 
     def __list_external_monitoring(self):
         url = f"{self.base_url}/external-monitoring"
-        response = requests.get(
+        response = self._transport.get(
             url=url,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
+                + self._token_manager.get_token(),
             },
             timeout=60,
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 401:
@@ -669,6 +701,7 @@ class MLOpsExternalMonitoringClient(BaseMLOpsClient):
                     tenant=self.credentials[2],
                     group=group,
                     ex_monitoring_hash=external_monitoring_hash,
+                    parent=self,
                 )
                 external_monitoring.wait_ready()
                 return external_monitoring
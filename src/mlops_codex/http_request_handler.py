@@ -1,6 +1,14 @@
-from typing import Tuple, Union
+import asyncio
+import base64
+import json
+import threading
+import time
+from typing import Optional, Tuple, Union
 
 import requests
+from lazy_imports import try_import
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 
 from mlops_codex.__utils import parse_json_to_yaml
 from mlops_codex.exceptions import (
@@ -10,12 +18,493 @@ from mlops_codex.exceptions import (
     UnexpectedError,
 )
 from mlops_codex.logger_config import get_logger
+from mlops_codex.shared import json_codec
+from mlops_codex.shared.circuit_breaker import CircuitBreaker, EndpointCircuitBreakers
+from mlops_codex.shared.compression import CompressionPolicy
+from mlops_codex.shared.multipart import MultipartEncoder
+from mlops_codex.shared.progress import ProgressCallback
+from mlops_codex.shared.retry import RetryPolicy
+from mlops_codex.shared.utils import LazySingleton
 
 logger = get_logger()
 
+with try_import() as _httpx_import:
+    import httpx
+
+
+class _CodecResponse(requests.Response):
+    """Response whose `json()` decodes the body with the JSON codec of the SDK"""
+
+    def json(self, **kwargs):
+        if not kwargs:
+            try:
+                return json_codec.loads(self.content)
+            except ValueError:
+                pass
+        return super().json(**kwargs)
+
+
+class _CodecAdapter(HTTPAdapter):
+    """Connection pool adapter that builds `_CodecResponse` responses"""
+
+    def build_response(self, req, resp) -> requests.Response:
+        response = super().build_response(req, resp)
+        response.__class__ = _CodecResponse
+        return response
+
+
+if _httpx_import.is_successful():
+
+    class _AsyncCodecResponse(httpx.Response):
+        """Response whose `json()` decodes the body with the JSON codec of the SDK"""
+
+        def json(self, **kwargs):
+            if not kwargs:
+                try:
+                    return json_codec.loads(self.content)
+                except ValueError:
+                    pass
+            return super().json(**kwargs)
+
+
+def _encode_json(kwargs) -> None:
+    """Replace the `json` argument of a request by a body encoded with the JSON codec"""
+    payload = kwargs.pop("json", None)
+    if payload is None or kwargs.get("data") is not None or kwargs.get("files"):
+        return
+    kwargs["data"] = json_codec.dumps(payload)
+    headers = kwargs.get("headers") or {}
+    if not any(key.lower() == "content-type" for key in headers):
+        kwargs["headers"] = {**headers, "Content-Type": "application/json"}
+
+
+class Transport:
+    """Pooled HTTP transport shared by a client and every object it creates.
+
+    Wraps a single `requests.Session`, so TCP and TLS connections are kept alive
+    and reused between calls instead of being opened for every request.
+
+    Args:
+        pool_connections: Number of hosts whose connection pools are kept
+        pool_maxsize: Maximum number of connections kept alive for each host
+        pool_block: Wait for a free connection when the pool of a host is exhausted,
+            instead of opening a connection that will not be reused
+        keep_alive: Keep connections open between requests
+        retry: Policy used to send failed requests again. Defaults to `RetryPolicy()`
+        circuit_breakers: Circuit breakers that block the endpoint families that keep
+            failing. Defaults to `EndpointCircuitBreakers()`
+        compression: Policy used to compress large request bodies. Defaults to None,
+            which sends every body as it is
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[EndpointCircuitBreakers] = None,
+        compression: Optional[CompressionPolicy] = None,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.retry = retry or RetryPolicy()
+        self.compression = compression
+        self.circuit_breakers = (
+            circuit_breakers
+            if circuit_breakers is not None
+            else EndpointCircuitBreakers()
+        )
+
+        self.session = requests.Session()
+        adapter = _CodecAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        self.__async_transport: Optional["AsyncTransport"] = None
+
+    @property
+    def async_transport(self) -> "AsyncTransport":
+        """Asyncio counterpart of this transport, with the same pool settings"""
+        if self.__async_transport is None:
+            self.__async_transport = AsyncTransport(
+                pool_maxsize=self.pool_maxsize,
+                keep_alive=self.keep_alive,
+                retry=self.retry,
+                circuit_breakers=self.circuit_breakers,
+                compression=self.compression,
+            )
+        return self.__async_transport
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        token_manager: Optional["TokenManager"] = None,
+        progress: Optional[ProgressCallback] = None,
+        retry: Optional[RetryPolicy] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request through the pooled session
+
+        Multipart uploads (`files=`) are streamed: the files are read in blocks while
+        the body is sent, instead of being loaded in memory first. Connection errors,
+        timeouts and transient statuses are retried as told by the retry policy, and
+        requests to an endpoint family whose circuit breaker is open fail right away
+        with `CircuitOpenError`. JSON bodies are encoded and decoded with the codec
+        returned by `get_json_codec`, and large bodies are compressed when the
+        transport has a compression policy.
+
+        Args:
+            method: HTTP method (get, post, delete, patch, etc)
+            url: URL of the endpoint
+            token_manager: Manager of the user token sent in the headers. When
+                informed, a 401 response makes it log in again and the request is
+                retried once with the new token.
+            progress: Function called while the files are uploaded, with the bytes
+                sent and the throughput
+            retry: Retry policy of this request. Defaults to the one of the transport
+            **kwargs: Any other argument accepted by `requests.Session.request`
+
+        Returns:
+            requests.Response
+        """
+        _encode_json(kwargs)
+        files = kwargs.pop("files", None)
+        if files:
+            body = MultipartEncoder(kwargs.pop("data", None), files, progress=progress)
+            kwargs["data"] = body
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                "Content-Type": body.content_type,
+            }
+        if self.compression is not None:
+            kwargs["data"], kwargs["headers"] = self.compression.encode(
+                kwargs.get("data"), kwargs.get("headers")
+            )
+
+        policy = retry or self.retry
+        breaker = self.circuit_breakers.breaker_for(url)
+        attempt = 1
+        while True:
+            try:
+                response = self.__attempt(method, url, token_manager, breaker, kwargs)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if (
+                    attempt >= policy.max_attempts
+                    or not policy.retry_error(
+                        method, kwargs.get("headers"), _request_was_sent(error)
+                    )
+                    or not _rewind_body(kwargs.get("data"))
+                ):
+                    raise
+                delay = policy.delay(attempt)
+                failure = error.__class__.__name__
+            else:
+                if (
+                    attempt >= policy.max_attempts
+                    or not policy.retry_status(
+                        method,
+                        kwargs.get("headers"),
+                        response.status_code,
+                        response.headers,
+                    )
+                    or not _rewind_body(kwargs.get("data"))
+                ):
+                    return response
+                delay = policy.delay(attempt, response.headers)
+                failure = f"status {response.status_code}"
+                response.close()
+            logger.warning(
+                f"{method} {url} failed with {failure}. Retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1} of {policy.max_attempts})"
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def __attempt(
+        self,
+        method: str,
+        url: str,
+        token_manager: Optional["TokenManager"],
+        breaker: Optional[CircuitBreaker],
+        kwargs,
+    ) -> requests.Response:
+        """Send the request once through the circuit breaker of its endpoint family"""
+        if breaker is None:
+            return self.__send(method, url, token_manager, kwargs)
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            response = self.__send(method, url, token_manager, kwargs)
+        except BaseException:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        breaker.record(
+            not _is_server_failure(response.status_code), time.monotonic() - started
+        )
+        return response
+
+    def __send(
+        self, method: str, url: str, token_manager: Optional["TokenManager"], kwargs
+    ) -> requests.Response:
+        """Send the request once, logging in again when the token was rejected"""
+        response = self.session.request(method, url, **kwargs)
+
+        if response.status_code == 401 and token_manager is not None:
+            headers = kwargs.get("headers") or {}
+            stale_token = (
+                headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            )
+            token_manager.invalidate(stale_token)
+            kwargs["headers"] = {
+                **headers,
+                "Authorization": f"Bearer {token_manager.get_token()}",
+            }
+            _rewind_body(kwargs.get("data"))
+            response.close()
+            response = self.session.request(method, url, **kwargs)
+
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        """Close every connection kept by the pool"""
+        self.session.close()
+
+
+class AsyncTransport:
+    """Pooled asyncio HTTP transport, built on `httpx.AsyncClient`.
+
+    Connections are kept alive and reused between calls made from the same event
+    loop. A new pool is opened when the transport is used from another loop.
+    Requires the optional `httpx` dependency (`pip install datarisk-mlops-codex[async]`).
+
+    Args:
+        pool_maxsize: Maximum number of connections kept open
+        keep_alive: Keep connections open between requests
+        retry: Policy used to send failed requests again. Defaults to `RetryPolicy()`
+        circuit_breakers: Circuit breakers that block the endpoint families that keep
+            failing. Defaults to `EndpointCircuitBreakers()`
+        compression: Policy used to compress large request bodies. Multipart uploads
+            are not compressed by this transport. Defaults to None
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_maxsize: int = 32,
+        keep_alive: bool = True,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[EndpointCircuitBreakers] = None,
+        compression: Optional[CompressionPolicy] = None,
+    ) -> None:
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.retry = retry or RetryPolicy()
+        self.compression = compression
+        self.circuit_breakers = (
+            circuit_breakers
+            if circuit_breakers is not None
+            else EndpointCircuitBreakers()
+        )
+        self.__client = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _client(self) -> "httpx.AsyncClient":
+        _httpx_import.check()
+        loop = asyncio.get_running_loop()
+        if self.__client is None or self.__loop is not loop:
+            self.__client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize
+                    if self.keep_alive
+                    else 0,
+                )
+            )
+            self.__loop = loop
+        return self.__client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        token_manager: Optional["TokenManager"] = None,
+        retry: Optional[RetryPolicy] = None,
+        **kwargs,
+    ) -> "httpx.Response":
+        """Send a request through the pooled client
+
+        Accepts the same arguments as `Transport.request`, so both transports can be
+        fed by the same request builders.
+
+        Args:
+            method: HTTP method (get, post, delete, patch, etc)
+            url: URL of the endpoint
+            token_manager: Manager of the user token sent in the headers. When
+                informed, a 401 response makes it log in again and the request is
+                retried once with the new token.
+            retry: Retry policy of this request. Defaults to the one of the transport
+            **kwargs: Any other argument accepted by `requests.Session.request`. With
+                `stream=True` the body is not read, and the response must be closed
+                with `aclose`
+
+        Returns:
+            httpx.Response
+        """
+        _encode_json(kwargs)
+        if isinstance(kwargs.get("data"), (str, bytes)):
+            kwargs["content"] = kwargs.pop("data")
+            if self.compression is not None:
+                kwargs["content"], kwargs["headers"] = self.compression.encode(
+                    kwargs["content"], kwargs.get("headers")
+                )
+        stream = kwargs.pop("stream", False)
+        kwargs = {key: value for key, value in kwargs.items() if value is not None}
+
+        policy = retry or self.retry
+        breaker = self.circuit_breakers.breaker_for(url)
+        attempt = 1
+        while True:
+            try:
+                response = await self.__attempt(
+                    method, url, token_manager, breaker, stream, kwargs
+                )
+            except httpx.TransportError as error:
+                sent = not isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt >= policy.max_attempts or not policy.retry_error(
+                    method, kwargs.get("headers"), sent
+                ):
+                    raise
+                delay = policy.delay(attempt)
+                failure = error.__class__.__name__
+            else:
+                if attempt >= policy.max_attempts or not policy.retry_status(
+                    method, kwargs.get("headers"), response.status_code, response.headers
+                ):
+                    return response
+                delay = policy.delay(attempt, response.headers)
+                failure = f"status {response.status_code}"
+                await response.aclose()
+            logger.warning(
+                f"{method} {url} failed with {failure}. Retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1} of {policy.max_attempts})"
+            )
+            _rewind_files(kwargs.get("files"))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __attempt(
+        self,
+        method: str,
+        url: str,
+        token_manager: Optional["TokenManager"],
+        breaker: Optional[CircuitBreaker],
+        stream: bool,
+        kwargs,
+    ) -> "httpx.Response":
+        """Send the request once through the circuit breaker of its endpoint family"""
+        if breaker is None:
+            return await self.__send(method, url, token_manager, stream, kwargs)
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            response = await self.__send(method, url, token_manager, stream, kwargs)
+        except BaseException:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        breaker.record(
+            not _is_server_failure(response.status_code), time.monotonic() - started
+        )
+        return response
+
+    async def __send(
+        self,
+        method: str,
+        url: str,
+        token_manager: Optional["TokenManager"],
+        stream: bool,
+        kwargs,
+    ) -> "httpx.Response":
+        """Send the request once, logging in again when the token was rejected"""
+        client = self._client()
+        response = await client.send(
+            client.build_request(method, url, **kwargs), stream=stream
+        )
+
+        if response.status_code == 401 and token_manager is not None:
+            headers = kwargs.get("headers") or {}
+            stale_token = (
+                headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            )
+            token_manager.invalidate(stale_token)
+            kwargs["headers"] = {
+                **headers,
+                "Authorization": f"Bearer {await token_manager.aget_token()}",
+            }
+            _rewind_files(kwargs.get("files"))
+            await response.aclose()
+            response = await client.send(
+                client.build_request(method, url, **kwargs), stream=stream
+            )
+
+        response.__class__ = _AsyncCodecResponse
+        return response
+
+    async def get(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close every connection kept by the pool"""
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
+
+
+_default_transport: LazySingleton[Transport] = LazySingleton(Transport)
+
+
+def get_default_transport() -> Transport:
+    """Return the transport used by requests that are not bound to a client
+
+    Returns:
+        Transport shared by the whole process
+    """
+    return _default_transport.get()
+
 
 def try_login(
-    login: str, password: str, tenant: str, base_url: str
+    login: str,
+    password: str,
+    tenant: str,
+    base_url: str,
+    transport: Optional[Transport] = None,
 ) -> Union[Tuple[str, str], Exception]:
     """Try to sign in MLOps
 
@@ -24,6 +513,7 @@ def try_login(
         password: User password
         tenant: User tenant
         base_url: URL that will handle the requests
+        transport: Transport used to send the requests. Defaults to the process one
 
     Returns:
         User login token
@@ -33,7 +523,8 @@ def try_login(
         ServerError: Raises if the server is not correctly running
         BaseException: Raises if the server status is different from 200
     """
-    response = requests.get(f"{base_url}/health", timeout=60)
+    transport = transport or get_default_transport()
+    response = transport.get(f"{base_url}/health", timeout=60)
 
     server_status = response.status_code
 
@@ -46,13 +537,20 @@ def try_login(
     if server_status != 200:
         raise Exception(f"Unexpected error! {response.text}")
 
-    token = refresh_token(login, password, tenant, base_url)
+    token = refresh_token(login, password, tenant, base_url, transport)
     version = response.json().get("Version")
     return token, version
 
 
-def refresh_token(login: str, password: str, tenant: str, base_url: str):
-    response = requests.post(
+def refresh_token(
+    login: str,
+    password: str,
+    tenant: str,
+    base_url: str,
+    transport: Optional[Transport] = None,
+):
+    transport = transport or get_default_transport()
+    response = transport.post(
         f"{base_url}/login",
         data={"user": login, "password": password, "tenant": tenant},
         timeout=60,
@@ -64,6 +562,162 @@ def refresh_token(login: str, password: str, tenant: str, base_url: str):
         raise AuthenticationError(response.text)
 
 
+def _decode_token_expiry(token: str) -> Optional[float]:
+    """Read the `exp` claim of a JWT without validating its signature
+
+    Args:
+        token: Bearer token returned by the login endpoint
+
+    Returns:
+        Expiry as a unix timestamp, or None if the token does not carry one
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    """Thread-safe cache for the user bearer token.
+
+    The token is reused until `refresh_margin` seconds before it expires. When
+    several threads find it expired at the same time, only one of them logs in
+    again and the others reuse the new token.
+
+    Args:
+        login: User email
+        password: User password
+        tenant: User tenant
+        base_url: URL that will handle the requests
+        refresh_margin: Seconds before the expiry at which the token is renewed
+        default_ttl: Lifetime assumed for tokens that do not carry an `exp` claim
+        transport: Transport used to log in. Defaults to the process one
+    """
+
+    def __init__(
+        self,
+        login: str,
+        password: str,
+        tenant: str,
+        base_url: str,
+        *,
+        refresh_margin: float = 60,
+        default_ttl: float = 300,
+        transport: Optional[Transport] = None,
+    ) -> None:
+        self.base_url = base_url
+        self.transport = transport
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.__credentials = (login, password, tenant)
+        self.__lock = threading.Lock()
+        self.__state: Tuple[Optional[str], float] = (None, 0.0)
+
+    def set_token(self, token: str) -> None:
+        """Record a token obtained elsewhere (e.g. by `try_login`)
+
+        Args:
+            token: User bearer token
+        """
+        expires_at = _decode_token_expiry(token)
+        if expires_at is None:
+            expires_at = time.time() + self.default_ttl
+        self.__state = (token, expires_at)
+
+    def __cached(self) -> Optional[str]:
+        token, expires_at = self.__state
+        if token is not None and time.time() < expires_at - self.refresh_margin:
+            return token
+        return None
+
+    def get_token(self) -> str:
+        """Return a valid user token, logging in again only when needed
+
+        Returns:
+            User bearer token
+        """
+        token = self.__cached()
+        if token is not None:
+            return token
+
+        with self.__lock:
+            token = self.__cached()
+            if token is None:
+                token = refresh_token(
+                    *self.__credentials, self.base_url, self.transport
+                )
+                self.set_token(token)
+            return token
+
+    async def aget_token(self) -> str:
+        """Asyncio version of `get_token`. Logging in again runs in a worker thread
+
+        Returns:
+            User bearer token
+        """
+        token = self.__cached()
+        if token is not None:
+            return token
+        return await asyncio.to_thread(self.get_token)
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Drop the cached token so the next `get_token` logs in again
+
+        Args:
+            token: Token rejected by the server. When informed, the cache is only
+                dropped if it still holds this token, so concurrent 401 responses
+                trigger a single login.
+        """
+        with self.__lock:
+            if token is None or self.__state[0] == token:
+                self.__state = (None, 0.0)
+
+
+def _is_server_failure(status_code: int) -> bool:
+    """Tell if a status means the server is failing or overloaded"""
+    return status_code >= 500 or status_code == 429
+
+
+def _request_was_sent(error: requests.RequestException) -> bool:
+    """Tell if a request that failed may have reached the server"""
+    if isinstance(error, requests.ConnectTimeout):
+        return False
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return not isinstance(reason, NewConnectionError)
+
+
+def _rewind_body(body) -> bool:
+    """Move a request body back to its beginning. Returns False when it can't be sent again"""
+    if body is None or isinstance(body, (str, bytes, dict, list, tuple)):
+        return True
+    if hasattr(body, "seek"):
+        body.seek(0)
+        return True
+    return False
+
+
+def _rewind_files(files) -> None:
+    """Move the file objects of a multipart upload back to their beginning"""
+    if not files:
+        return
+    values = files.values() if isinstance(files, dict) else (v for _, v in files)
+    for value in values:
+        file_obj = value[1] if isinstance(value, tuple) else value
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+
+
+def _error_body(response):
+    """Decode the body of an error response, or return its text when it is not JSON"""
+    try:
+        return json_codec.loads(response.content)
+    except ValueError:
+        return response.text
+
+
 def handle_common_errors(
     response: requests.Response,
     specific_error_code,
@@ -84,7 +738,7 @@ def handle_common_errors(
     if response.status_code == 401:
         raise AuthenticationError("Unauthorized: Check your credentials or token.")
     elif response.status_code == 400:
-        logger.error(parse_json_to_yaml(response.json()))
+        logger.error(parse_json_to_yaml(_error_body(response)))
         raise InputError("The request had a error in the input.")
     elif response.status_code >= 500:
         raise ServerError("Server is down or unavailable.")
@@ -92,10 +746,10 @@ def handle_common_errors(
         if logger_msg:
             logger.info(logger_msg)
         else:
-            logger.info(response.json())
+            logger.info(_error_body(response))
         raise custom_exception(custom_exception_message)
 
-    formatted_msg = parse_json_to_yaml(response.json())
+    formatted_msg = parse_json_to_yaml(_error_body(response))
     logger.info(f"Something went wrong. \n{formatted_msg}")
     raise UnexpectedError(
         "Unexpected error during HTTP request. Please contact the administrator."
@@ -116,6 +770,11 @@ def make_request(
     json=None,
     files=None,
     timeout=60,
+    token_manager: Optional[TokenManager] = None,
+    transport: Optional[Transport] = None,
+    stream: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    retry: Optional[RetryPolicy] = None,
 ):
     """
     Makes a generic HTTP request.
@@ -134,6 +793,17 @@ def make_request(
         json (dict, optional): Data for POST/PUT requests (JSON).
         files (dict, optional): Data for POST/PUT requests (files).
         timeout (int, optional): Timeout in seconds for the request. Default is 60.
+        token_manager (TokenManager, optional): Manager of the user token sent in the
+            headers. When informed, a 401 response makes it log in again and the
+            request is retried once with the new token.
+        transport (Transport, optional): Pooled transport used to send the request.
+            Defaults to the one shared by the whole process.
+        stream (bool, optional): Do not read the body of a successful response, so it
+            can be consumed in chunks. Default is False.
+        progress (Callable[[TransferProgress], None], optional): Function called while
+            the files are uploaded, with the bytes sent and the throughput.
+        retry (RetryPolicy, optional): Retry policy of this request. Defaults to the
+            one of the transport.
 
     Returns:
         requests.Response
@@ -141,7 +811,87 @@ def make_request(
     Raises:
         requests.exceptions.RequestException: If the request fails.
     """
-    response = requests.request(
+    transport = transport or get_default_transport()
+    response = transport.request(
+        method=method,
+        url=url,
+        headers=headers,
+        params=params,
+        data=data,
+        json=json,
+        files=files,
+        timeout=timeout,
+        token_manager=token_manager,
+        stream=stream,
+        progress=progress,
+        retry=retry,
+    )
+
+    return _check_response(
+        response,
+        success_code,
+        custom_exception,
+        custom_exception_message,
+        specific_error_code,
+        logger_msg,
+    )
+
+
+async def async_make_request(
+    url: str,
+    method: str,
+    success_code: int,
+    custom_exception=None,
+    custom_exception_message=None,
+    specific_error_code=None,
+    logger_msg=None,
+    headers=None,
+    params=None,
+    data=None,
+    json=None,
+    files=None,
+    timeout=60,
+    token_manager: Optional[TokenManager] = None,
+    transport: Optional[Transport] = None,
+    stream: bool = False,
+    retry: Optional[RetryPolicy] = None,
+):
+    """
+    Asyncio version of `make_request`. Takes the same arguments and handles the
+    response in the same way.
+
+    Args:
+        url (str): URL of the endpoint.
+        method (str): HTTP method (get, post, delete, patch, etc).
+        success_code (int): Status codes indicating success.
+        custom_exception (_SpecialForm[Exception]): Custom exception class.
+        custom_exception_message (str): Custom exception message.
+        specific_error_code (int): Specific error code.
+        logger_msg (str): Logger message.
+        headers (dict, optional): Request headers.
+        params (dict, optional): URL parameters for GET requests.
+        data (dict, optional): Data for POST/PUT requests (form-encoded).
+        json (dict, optional): Data for POST/PUT requests (JSON).
+        files (dict, optional): Data for POST/PUT requests (files).
+        timeout (int, optional): Timeout in seconds for the request. Default is 60.
+        token_manager (TokenManager, optional): Manager of the user token sent in the
+            headers. When informed, a 401 response makes it log in again and the
+            request is retried once with the new token.
+        transport (Transport, optional): Transport whose `async_transport` sends the
+            request. Defaults to the one shared by the whole process.
+        stream (bool, optional): Do not read the body of a successful response, so it
+            can be consumed in chunks. Default is False.
+        retry (RetryPolicy, optional): Retry policy of this request. Defaults to the
+            one of the transport.
+
+    Returns:
+        httpx.Response
+
+    Raises:
+        httpx.HTTPError: If the request fails.
+    """
+    transport = transport or get_default_transport()
+    response = await transport.async_transport.request(
         method=method,
         url=url,
         headers=headers,
@@ -150,8 +900,32 @@ def make_request(
         json=json,
         files=files,
         timeout=timeout,
+        token_manager=token_manager,
+        stream=stream,
+        retry=retry,
     )
+    if stream and response.status_code != success_code:
+        await response.aread()
 
+    return _check_response(
+        response,
+        success_code,
+        custom_exception,
+        custom_exception_message,
+        specific_error_code,
+        logger_msg,
+    )
+
+
+def _check_response(
+    response,
+    success_code,
+    custom_exception,
+    custom_exception_message,
+    specific_error_code,
+    logger_msg,
+):
+    """Return the response when it has the expected status, raise the matching error otherwise"""
     if response.status_code == success_code:
         return response
     handle_common_errors(
@@ -1,8 +1,8 @@
-import json
 import os
 from typing import Union
 
 from mlops_codex.exceptions import InputError
+from mlops_codex.shared import json_codec
 
 
 class Logger:
@@ -130,7 +130,7 @@ class Logger:
     def callback(self, output: Union[str, int, float, list, dict]) -> str:
         """
         Compile the logs with the response for Sync models only. Should be the return of function being executed.
-        This output should be able to be parsed as a JSON, so if you are using a non-primitive type as your return, make sure it can be parsed by `json.dumps`.
+        This output should be able to be parsed as a JSON, so if you are using a non-primitive type as your return, make sure it can be parsed as JSON. NumPy arrays and scalars, timestamps and decimals are accepted.
 
         Example
         -------
@@ -155,7 +155,9 @@ class Logger:
 
         if self.model_type.lower() == "sync":
             if isinstance(output, (dict, list)):
-                output = "[OUTPUT]" + json.dumps(output) + "[OUTPUT]"
+                output = (
+                    "[OUTPUT]" + json_codec.dumps(output).decode("utf-8") + "[OUTPUT]"
+                )
             elif isinstance(output, (int, float)):
                 output = "[OUTPUT]" + str(output) + "[OUTPUT]"
             else:
@@ -1,10 +1,31 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import asyncio
 import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from time import sleep
-from typing import List, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
 
 from mlops_codex.__model_states import ModelExecutionState, ModelState, MonitoringStatus
 from mlops_codex.__utils import (
@@ -14,36 +35,84 @@ from mlops_codex.__utils import (
 from mlops_codex.base import BaseMLOps, BaseMLOpsClient, MLOpsExecution
 from mlops_codex.datasources import MLOpsDataset
 from mlops_codex.exceptions import (
+    AuthenticationError,
     InputError,
     ModelError,
     PreprocessingError,
 )
-from mlops_codex.http_request_handler import make_request, refresh_token
+from mlops_codex.http_request_handler import (
+    TokenManager,
+    Transport,
+    async_make_request,
+    make_request,
+)
 from mlops_codex.logger_config import get_logger
-from mlops_codex.preprocessing import MLOpsPreprocessing
+from mlops_codex.preprocessing import MLOpsPreprocessing, PreprocessExecution
+from mlops_codex.shared import json_codec
+from mlops_codex.shared.compression import ACCEPT_ENCODING
+from mlops_codex.shared.data_transmitter import (
+    DOWNLOAD_CHUNK_SIZE,
+    async_stream_to_file,
+    chunked_upload,
+    ranged_download,
+    stream_to_file,
+)
+from mlops_codex.shared.execution_journal import (
+    ASYNC_MODEL,
+    find_submission,
+    get_execution_journal,
+    journaled_inputs,
+    record_state,
+    record_submission,
+)
+from mlops_codex.shared.hedging import Hedger
+from mlops_codex.shared.latency import LatencyHistogram, LatencySummary, summarize
+from mlops_codex.shared.micro_batcher import MicroBatcher
+from mlops_codex.shared.parquet_buffer import is_table, to_parquet_buffer
+from mlops_codex.shared.partitioning import concatenate_outputs, iter_shards
+from mlops_codex.shared.prediction_cache import CacheBackend, PredictionCache
+from mlops_codex.shared.progress import ProgressCallback
+from mlops_codex.shared.upload_index import find_upload, forget_upload, record_upload
+from mlops_codex.shared.waiter import (
+    CancelHook,
+    WaitPolicy,
+    async_wait_until,
+    wait_until,
+)
 from mlops_codex.validations import (
     file_extension_validation,
     validate_data,
     validate_group_existence,
     validate_python_version,
 )
+from mlops_codex.watcher import FutureExecutionMixin
+
+if TYPE_CHECKING:
+    import pyarrow
 
 logger = get_logger()
 
 
-def _model_status(url, credentials, group, model_hash):
+def _model_status(
+    url,
+    token_manager: TokenManager,
+    group,
+    model_hash,
+    transport: Optional[Transport] = None,
+):
     """Get the status of a model
 
     Args:
         url: Url used to connect to the MLOps server
-        credentials: User credentials
+        token_manager: Manager of the user token
         group: Group where the model is located
         model_hash: Hash of the model
+        transport: Pooled transport used to send the request
 
     Returns:
         ModelState: Status of the model
     """
-    token = refresh_token(*credentials, url)
+    token = token_manager.get_token()
 
     response = make_request(
         url=f"{url}/model/status/{group}/{model_hash}",
@@ -58,6 +127,8 @@ def _model_status(url, credentials, group, model_hash):
             "Neomaril-Origin": "Codex",
             "Neomaril-Method": _model_status.__qualname__,
         },
+        token_manager=token_manager,
+        transport=transport,
     ).json()
 
     status = response["Status"]
@@ -84,6 +155,8 @@ class MLOpsModel(BaseMLOps):
         Group the model is inserted.
     group_token: str
         Token for executing the model (show when creating a group). It can be informed when getting the model or when running predictions, or using the env variable MLOPS_GROUP_TOKEN
+    parent: Optional[BaseMLOps], optional
+        Object that created this model. Its connections and user session are shared with the model
 
     Raises
     ------
@@ -103,8 +176,9 @@ class MLOpsModel(BaseMLOps):
         password: str,
         tenant: str,
         group_token: str,
+        parent: Optional[BaseMLOps] = None,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(login=login, password=password, tenant=tenant, parent=parent)
 
         self.model_hash = model_hash
         self.group = group
@@ -132,7 +206,7 @@ class MLOpsModel(BaseMLOps):
             Some input parameters is invalid
         """
         logger.info(f"MLOpsModel hosting {self.name}...")
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         _ = make_request(
             url=f"{self.base_url}/model/{operation.lower()}/host/{self.group}/{self.model_hash}",
             method="GET",
@@ -142,6 +216,8 @@ class MLOpsModel(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.host.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
     def _describe(self):
@@ -152,7 +228,7 @@ class MLOpsModel(BaseMLOps):
             dict: Description of the model
         """
         url = f"{self.base_url}/model/describe/{self.group}/{self.model_hash}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         response = make_request(
             url=url,
             method="GET",
@@ -164,6 +240,8 @@ class MLOpsModel(BaseMLOps):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         ).json()
         return response
 
@@ -178,7 +256,7 @@ class MLOpsModel(BaseMLOps):
             dict: Description of the model execution
         """
         url = f"{self.base_url}/model/describe/{self.group}/{self.model_hash}/{execution_id}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         response = make_request(
             url=url,
@@ -191,6 +269,8 @@ class MLOpsModel(BaseMLOps):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         ).json()
         return response
 
@@ -209,19 +289,35 @@ class MLOpsModel(BaseMLOps):
             The model status
         """
         return _model_status(
-            self.base_url, self.credentials, self.group, self.model_hash
+            self.base_url,
+            self._token_manager,
+            self.group,
+            self.model_hash,
+            self._transport,
         )
 
-    def wait_ready(self):
+    def wait_ready(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ):
         """
         Waits the model to be with status different from Ready or Building
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
         """
-        current_status = ModelState.Building
         print("Waiting for model finish building...", end="", flush=True)
-        while current_status in [ModelState.Ready, ModelState.Building]:
-            sleep(30)
-            current_status = self.status()
-            print(".", end="", flush=True)
+        current_status = wait_until(
+            self.status,
+            lambda status: status not in [ModelState.Ready, ModelState.Building],
+            policy=self.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+            on_check=lambda _: print(".", end="", flush=True),
+        )
         print()
 
         if current_status == ModelState.Deployed:
@@ -256,6 +352,7 @@ class MLOpsModel(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.health.__qualname__,
             },
+            transport=self._transport,
         ).json()["Message"]
 
         if response == "OK":
@@ -301,7 +398,7 @@ class MLOpsModel(BaseMLOps):
             return None
 
         url = f"{self.base_url}/model/restart/{self.group}/{self.model_hash}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         _ = make_request(
             url=url,
@@ -316,6 +413,8 @@ class MLOpsModel(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.restart_model.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
         logger.info("Model is restarting...")
@@ -357,7 +456,6 @@ class MLOpsModel(BaseMLOps):
         url = f"{self.base_url}/model/logs/{self.group}/{self.model_hash}"
         logs_result = self._logs(
             url=url,
-            credentials=self.credentials,
             start=start,
             end=end,
             routine=routine,
@@ -392,7 +490,7 @@ class MLOpsModel(BaseMLOps):
             "This is irreversible, if you want to use the model again later you will need to upload again (and it will have a new hash)."
         )
 
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         _ = make_request(
             url=f"{self.base_url}/model/delete/{self.group}/{self.model_hash}",
@@ -407,6 +505,8 @@ class MLOpsModel(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.delete.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
         logger.info(f"Model with hash {self.model_hash} deleted.")
@@ -426,7 +526,7 @@ class MLOpsModel(BaseMLOps):
             Model disable failed
         """
 
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         _ = make_request(
             url=f"{self.base_url}/model/disable/{self.group}/{self.model_hash}",
@@ -441,6 +541,8 @@ class MLOpsModel(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.disable.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
         logger.info(
@@ -492,7 +594,7 @@ class MLOpsModel(BaseMLOps):
         url = (
             f"{self.base_url}/monitoring/status/{self.group}/{self.model_hash}/{period}"
         )
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         response = make_request(
             url=url,
@@ -501,6 +603,8 @@ class MLOpsModel(BaseMLOps):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         ).json()
 
         status = MonitoringStatus[response["Status"]]
@@ -528,7 +632,7 @@ class MLOpsModel(BaseMLOps):
         logger.info(f"Monitoring host for {self.model_hash} model started.")
 
         url = f"{self.base_url}/monitoring/host/{self.group}/{self.model_hash}/{period}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         _ = make_request(
             url=url,
@@ -537,25 +641,38 @@ class MLOpsModel(BaseMLOps):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
-    def wait_monitoring(self, period: str):
+    def wait_monitoring(
+        self,
+        period: str,
+        *,
+        timeout: Optional[float] = None,
+        cancel: Optional[CancelHook] = None,
+    ):
         """
         Wait for the monitoring configuration
 
         Parameters
         ----------
         period (str): Period of monitoring. It must be 'Day', 'Week' or 'Month'
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
         """
-        current_status = MonitoringStatus.Validating
         print("Waiting for monitoring host to finish...", end="", flush=True)
-        while current_status in [
-            MonitoringStatus.Unvalidated,
-            MonitoringStatus.Validating,
-        ]:
-            sleep(30)
-            current_status = self.host_monitoring_status(period)
-            print(".", end="", flush=True)
+        current_status = wait_until(
+            lambda: self.host_monitoring_status(period),
+            lambda status: status
+            not in [MonitoringStatus.Unvalidated, MonitoringStatus.Validating],
+            policy=self.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+            on_check=lambda _: print(".", end="", flush=True),
+        )
         print()
 
         if current_status == MonitoringStatus.Validated:
@@ -647,7 +764,7 @@ class MLOpsModel(BaseMLOps):
             )
 
         url = f"{self.base_url}/monitoring/register/{self.group}/{self.model_hash}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         response = make_request(
             url=url,
             method="POST",
@@ -659,6 +776,8 @@ class MLOpsModel(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.register_monitoring.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         ).json()
 
         model_id = response["ModelHash"]
@@ -672,6 +791,67 @@ class MLOpsModel(BaseMLOps):
         logger.info("Model monitoring host finished successfully.")
 
 
+@dataclass
+class BatchPredictionResult:
+    """
+    Outcome of `SyncModel.predict_batch`.
+
+    Parameters
+    ----------
+    results: List[Optional[dict]]
+        Prediction of each row, in the order of the input. Rows that failed are None
+    errors: Dict[int, Exception]
+        Error raised by each row that failed, by the position of the row
+    elapsed: float
+        Seconds taken by the whole batch
+    latency: Optional[LatencySummary]
+        Latency percentiles of the requests of the batch
+    """
+
+    results: List[Optional[dict]]
+    errors: Dict[int, Exception]
+    elapsed: float
+    latency: Optional[LatencySummary]
+
+    @property
+    def throughput(self) -> float:
+        """Rows scored per second"""
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether every row succeeded"""
+        return not self.errors
+
+
+@dataclass
+class PartitionedPredictionResult:
+    """
+    Outcome of `AsyncModel.predict_partitioned`.
+
+    Parameters
+    ----------
+    executions: List[ModelExecution]
+        Execution of each shard, in the order of the input
+    files: List[str]
+        Paths of the joined results
+    attempts: List[int]
+        Executions started for each shard, in the order of the input
+    elapsed: float
+        Seconds taken by the whole prediction
+    """
+
+    executions: List["ModelExecution"]
+    files: List[str]
+    attempts: List[int]
+    elapsed: float
+
+    @property
+    def retried(self) -> int:
+        """Number of shards that had to be sent more than once"""
+        return sum(attempts > 1 for attempts in self.attempts)
+
+
 class SyncModel(MLOpsModel):
     def __init__(
         self,
@@ -682,6 +862,7 @@ class SyncModel(MLOpsModel):
         password: str,
         tenant: str,
         group_token: Optional[str] = None,
+        parent: Optional[BaseMLOps] = None,
     ):
         super().__init__(
             name=name,
@@ -691,16 +872,24 @@ class SyncModel(MLOpsModel):
             password=password,
             group_token=group_token,
             tenant=tenant,
+            parent=parent,
         )
+        self.latency = LatencyHistogram()
+        self._batcher: Optional[MicroBatcher] = None
+        self.cache: Optional[PredictionCache] = None
+        self._hedger: Optional[Hedger] = None
+        self.__batch_pool: Optional[ThreadPoolExecutor] = None
+        self.__batch_payload = False
+        self.__unbatch: Optional[Callable[[Any], List[Any]]] = None
 
     def predict(
         self,
         json_data: Union[str, dict],
         preprocessing: Optional[MLOpsPreprocessing] = None,
         group_token: Optional[str] = None,
-    ):
+    ) -> dict:
         """
-        Run the hosted model for a specific input. It will show the result of the prediction
+        Run the hosted model for a specific input
 
         Parameters
         ----------
@@ -710,28 +899,357 @@ class SyncModel(MLOpsModel):
             Class for preprocessing json_data
         group_token: str, default=None
             Token of the group
+
+        Returns
+        -------
+        dict
+            The prediction result
         """
+        if self.cache is None and self._batcher is None and self._hedger is None:
+            request = self._predict_request(json_data, preprocessing, group_token)
+            started = time.monotonic()
+            response = make_request(**request).json()
+            self.latency.record(time.monotonic() - started)
+            return response
+
         if group_token:
             self.set_token(group_token)
+        if isinstance(json_data, str) and json_data.endswith(".json"):
+            with open(json_data, "rb") as f:
+                json_data = json_codec.loads(f.read())
+
+        key = None
+        if self.cache is not None:
+            key = PredictionCache.key(
+                self.model_hash,
+                preprocessing.preprocessing_id if preprocessing else None,
+                json_data,
+            )
+            cached = self.cache.get(key)
+            if cached is not PredictionCache.MISSING:
+                return cached
 
-        logger.info("Validating data...")
+        if self._batcher is not None:
+            response = self._batcher((json_data, preprocessing))
+        else:
+            response = self.__send((json_data, preprocessing))
+            if isinstance(response, Exception):
+                raise response
+
+        if key is not None:
+            self.cache.set(key, response)
+        return response
+
+    def enable_cache(
+        self, ttl: float = 60, backend: Optional[CacheBackend] = None
+    ) -> PredictionCache:
+        """
+        Keep the results of `predict`, so identical calls made within `ttl` seconds skip the
+        network. Calls are identical when they have the same input and preprocessing. Only use it
+        when the predictions of the model are deterministic.
+
+        Parameters
+        ----------
+        ttl: float, optional
+            Seconds a prediction stays valid. Default is 60
+        backend: Optional[CacheBackend], optional
+            Storage of the predictions. Default is a `MemoryCacheBackend` of 64 MB. Use a
+            `SQLiteCacheBackend` to share the predictions between processes
+
+        Returns
+        -------
+        PredictionCache
+            The cache, whose `metrics()` report hits, misses and usage
+        """
+        self.cache = PredictionCache(ttl, backend)
+        return self.cache
+
+    def disable_cache(self) -> None:
+        """Stop caching the results of `predict`"""
+        self.cache = None
+
+    def enable_hedging(
+        self,
+        *,
+        percentile: float = 95,
+        max_hedge_rate: float = 0.05,
+        min_samples: int = 20,
+    ) -> Hedger:
+        """
+        Send a second copy of a `predict` request when the first one is slower than the `percentile`
+        of the recent latencies of the model, and keep whichever answers first. This cuts the tail
+        latency caused by occasional slow responses, at the cost of a few extra requests.
+
+        Parameters
+        ----------
+        percentile: float, optional
+            Percentile of the latencies in `latency` after which a request is hedged. Default is 95
+        max_hedge_rate: float, optional
+            Maximum fraction of the calls that send a second request. Default is 0.05
+        min_samples: int, optional
+            Number of latencies recorded before hedging starts. Default is 20
+
+        Returns
+        -------
+        Hedger
+            The hedger, whose `metrics()` report how many calls were hedged
+        """
+        self.disable_hedging()
+        self._hedger = Hedger(
+            self.__send_one,
+            self.latency,
+            percentile=percentile,
+            max_hedge_rate=max_hedge_rate,
+            min_samples=min_samples,
+        )
+        return self._hedger
+
+    def disable_hedging(self) -> None:
+        """Go back to a single request per `predict` call"""
+        hedger, self._hedger = self._hedger, None
+        if hedger is not None:
+            hedger.close()
+
+    def enable_batching(
+        self,
+        *,
+        max_wait: float = 0.005,
+        max_batch: int = 32,
+        batch_payload: bool = False,
+        unbatch: Optional[Callable[[Any], List[Any]]] = None,
+    ) -> None:
+        """
+        Group the `predict` calls made at the same time from many threads, and send them together.
+
+        Calls are collected for up to `max_wait` seconds or `max_batch` calls, and identical inputs
+        of a batch are sent only once. Each caller still receives its own result. By default the
+        inputs of a batch are sent as parallel requests over the pooled connections. With
+        `batch_payload=True`, they are sent in a single request whose `Input` is the list of inputs,
+        for scoring functions that accept lists.
+
+        Parameters
+        ----------
+        max_wait: float, optional
+            Seconds a call waits for others to join its batch. Default is 0.005
+        max_batch: int, optional
+            Maximum number of calls in a batch. Default is 32
+        batch_payload: bool, optional
+            Send each batch as a single request with a list of inputs. Default is False
+        unbatch: Optional[Callable[[Any], List[Any]]], optional
+            With `batch_payload`, function that turns the response of a batch into the list of
+            results, one per input. Default expects the response to be that list
+        """
+        self.disable_batching()
+        self.__batch_payload = batch_payload
+        self.__unbatch = unbatch
+        if not batch_payload:
+            self.__batch_pool = ThreadPoolExecutor(
+                max_workers=max_batch, thread_name_prefix="mlops-codex-predict"
+            )
+        self._batcher = MicroBatcher(
+            self.__dispatch_batch,
+            max_wait=max_wait,
+            max_batch=max_batch,
+            name=f"mlops-codex-batcher-{self.model_hash}",
+        )
+
+    def disable_batching(self) -> None:
+        """Send the calls still waiting in a batch and go back to one request per `predict` call"""
+        batcher, self._batcher = self._batcher, None
+        if batcher is not None:
+            batcher.close()
+        if self.__batch_pool is not None:
+            self.__batch_pool.shutdown(wait=True)
+            self.__batch_pool = None
+
+    def __dispatch_batch(
+        self, items: List[Tuple[Any, Optional[MLOpsPreprocessing]]]
+    ) -> List[Any]:
+        """Send a batch of `predict` calls, sending identical inputs only once"""
+        unique: Dict[str, Tuple[Any, Optional[MLOpsPreprocessing]]] = {}
+        keys = []
+        for json_data, preprocessing in items:
+            script_hash = preprocessing.preprocessing_id if preprocessing else None
+            key = json_codec.dumps([json_data, script_hash], sort_keys=True)
+            unique.setdefault(key, (json_data, preprocessing))
+            keys.append(key)
+
+        if self.__batch_payload:
+            results = self.__send_batch_payload(list(unique.values()))
+        else:
+            results = list(self.__batch_pool.map(self.__send, unique.values()))
+        by_key = dict(zip(unique, results))
+        return [by_key[key] for key in keys]
+
+    def __send(self, item: Tuple[Any, Optional[MLOpsPreprocessing]]) -> Any:
+        """Send a single prediction request, hedged when hedging is enabled"""
+        if self._hedger is not None:
+            return self._hedger(item)
+        return self.__send_one(item)
+
+    def __send_one(self, item: Tuple[Any, Optional[MLOpsPreprocessing]]) -> Any:
+        json_data, preprocessing = item
+        try:
+            request = self._predict_request(json_data, preprocessing, None)
+            started = time.monotonic()
+            response = make_request(**request).json()
+            self.latency.record(time.monotonic() - started)
+            return response
+        except Exception as e:
+            return e
+
+    def __send_batch_payload(
+        self, items: List[Tuple[Any, Optional[MLOpsPreprocessing]]]
+    ) -> List[Any]:
+        """Send one request for each preprocessing of the batch, with the list of its inputs"""
+        groups: Dict[Optional[str], List[int]] = {}
+        for index, (_, preprocessing) in enumerate(items):
+            script_hash = preprocessing.preprocessing_id if preprocessing else None
+            groups.setdefault(script_hash, []).append(index)
+
+        results: List[Any] = [None] * len(items)
+        for positions in groups.values():
+            inputs = [items[i][0] for i in positions]
+            try:
+                request = self._predict_request(inputs, items[positions[0]][1], None)
+                started = time.monotonic()
+                response = make_request(**request).json()
+                self.latency.record(time.monotonic() - started)
+                outputs = self.__unbatch(response) if self.__unbatch else response
+                if not isinstance(outputs, list) or len(outputs) != len(inputs):
+                    raise ModelError(
+                        f"The batch response of model {self.model_hash} does not have one result for each of its {len(inputs)} inputs"
+                    )
+            except Exception as e:
+                outputs = [e] * len(inputs)
+            for i, output in zip(positions, outputs):
+                results[i] = output
+        return results
+
+    def predict_batch(
+        self,
+        records: Union[List[dict], pd.DataFrame],
+        preprocessing: Optional[MLOpsPreprocessing] = None,
+        group_token: Optional[str] = None,
+        *,
+        concurrency: int = 8,
+    ) -> BatchPredictionResult:
+        """
+        Run the hosted model for many inputs, sending up to `concurrency` requests at the same time.
+        A row that fails does not stop the others: its error is kept in the result.
+
+        Parameters
+        ----------
+        records: Union[List[dict], pd.DataFrame]
+            Inputs of the model, one per row. Missing values of a DataFrame are sent as null
+        preprocessing: MLOpsPreprocessing, default=None
+            Class for preprocessing the records
+        group_token: str, default=None
+            Token of the group
+        concurrency: int, optional
+            Maximum number of requests sent at the same time. Keep it below the `pool_maxsize` of
+            the transport, so every request reuses a connection. Default is 8
+
+        Returns
+        -------
+        BatchPredictionResult
+            Predictions in the order of the input, errors of the failed rows, throughput and latency
+        """
+        if isinstance(records, pd.DataFrame):
+            records = (
+                records.astype(object)
+                .where(records.notna(), None)
+                .to_dict(orient="records")
+            )
+        records = list(records)
+        if group_token:
+            self.set_token(group_token)
+
+        results: List[Optional[dict]] = [None] * len(records)
+        errors: Dict[int, Exception] = {}
+        latencies: List[float] = []
+
+        def score(index: int) -> None:
+            started = time.monotonic()
+            try:
+                results[index] = self.predict(records[index], preprocessing)
+            except Exception as e:
+                errors[index] = e
+            latencies.append(time.monotonic() - started)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(records)))) as pool:
+            list(pool.map(score, range(len(records))))
+
+        result = BatchPredictionResult(
+            results=results,
+            errors=dict(sorted(errors.items())),
+            elapsed=time.monotonic() - started,
+            latency=summarize(latencies),
+        )
+        logger.info(
+            f"Scored {len(records)} rows in {result.elapsed:.1f}s "
+            f"({result.throughput:.1f} rows/s), {len(errors)} failed. Latency {result.latency}"
+        )
+        return result
+
+    async def apredict(
+        self,
+        json_data: Union[str, dict],
+        preprocessing: Optional[MLOpsPreprocessing] = None,
+        group_token: Optional[str] = None,
+    ) -> dict:
+        """
+        Asyncio version of `predict`. Requires the optional `httpx` dependency
+
+        Parameters
+        ----------
+        json_data: Union[str, dict]
+            Input file that will be used to run the model. It must be a dict or a json file
+        preprocessing: MLOpsPreprocessing, default=None
+            Class for preprocessing json_data
+        group_token: str, default=None
+            Token of the group
+
+        Returns
+        -------
+        dict
+            The prediction result
+        """
+        request = self._predict_request(json_data, preprocessing, group_token)
+        started = time.monotonic()
+        response = await async_make_request(**request)
+        self.latency.record(time.monotonic() - started)
+        return response.json()
+
+    def _predict_request(
+        self,
+        json_data: Union[str, dict],
+        preprocessing: Optional[MLOpsPreprocessing],
+        group_token: Optional[str],
+    ) -> dict:
+        """Build the arguments of the request that runs a synchronous prediction"""
+        if group_token:
+            self.set_token(group_token)
+
+        logger.debug("Validating data...")
 
         if isinstance(json_data, str) and json_data.endswith(".json"):
-            with open(json_data, "r", encoding="utf-8") as f:
-                json_data = json.load(f)
+            with open(json_data, "rb") as f:
+                json_data = json_codec.loads(f.read())
 
         upload_data = {"Input": json_data}
 
         if preprocessing:
-            logger.info("Found preprocessing...")
+            logger.debug("Found preprocessing...")
             upload_data["ScriptHash"] = preprocessing.preprocessing_id
 
-        logger.info("Running data prediction...")
+        logger.debug("Running data prediction...")
 
-        response = make_request(
+        return dict(
             url=f"{self.base_url}/model/sync/run/{self.group}/{self.model_hash}",
             method="POST",
-            data=json.dumps(upload_data),
+            data=json_codec.dumps(upload_data),
             success_code=200,
             custom_exception=ModelError,
             custom_exception_message=f"Failed to predict data for model {self.model_hash} in group {self.group}",
@@ -742,11 +1260,8 @@ class SyncModel(MLOpsModel):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.predict.__qualname__,
             },
-        ).json()
-
-        logger.info("Prediction result:\n")
-        formated_response = parse_json_to_yaml(response)
-        print(formated_response)
+            transport=self._transport,
+        )
 
     def __call__(
         self,
@@ -754,7 +1269,7 @@ class SyncModel(MLOpsModel):
         preprocessing: MLOpsPreprocessing = None,
         group_token=None,
     ):
-        self.predict(json_data, preprocessing, group_token)
+        return self.predict(json_data, preprocessing, group_token)
 
 
 class AsyncModel(MLOpsModel):
@@ -767,6 +1282,7 @@ class AsyncModel(MLOpsModel):
         password: str,
         tenant: str,
         group_token: Optional[str] = None,
+        parent: Optional[BaseMLOps] = None,
     ):
         super().__init__(
             name=name,
@@ -776,6 +1292,7 @@ class AsyncModel(MLOpsModel):
             password=password,
             group_token=group_token,
             tenant=tenant,
+            parent=parent,
         )
 
     def execution_status(
@@ -796,19 +1313,57 @@ class AsyncModel(MLOpsModel):
         ModelExecutionStatus
             Status of the execution
         """
+        response = make_request(
+            **self._execution_status_request(execution_id, group_token)
+        ).json()
+        status = self._parse_execution_status(response)
+        record_state(ASYNC_MODEL, self.model_hash, execution_id, status)
+        return status
+
+    async def aexecution_status(
+        self, execution_id: Union[int, str], group_token: Optional[str] = None
+    ):
+        """
+        Asyncio version of `execution_status`. Requires the optional `httpx` dependency
+
+        Parameters
+        ----------
+        execution_id: Union[int, str]
+            Execution id of a model prediction
+        group_token: Optional[str], default=None
+            Token of the group
+
+        Returns
+        -------
+        ModelExecutionStatus
+            Status of the execution
+        """
+        response = await async_make_request(
+            **self._execution_status_request(execution_id, group_token)
+        )
+        status = self._parse_execution_status(response.json())
+        record_state(ASYNC_MODEL, self.model_hash, execution_id, status)
+        return status
+
+    def _execution_status_request(
+        self, execution_id: Union[int, str], group_token: Optional[str]
+    ) -> dict:
+        """Build the arguments of the request that fetches the status of an execution"""
         if group_token:
             self.set_token(group_token)
 
-        url = f"{self.base_url}/model/async/status/{self.group}/{execution_id}"
-        response = make_request(
-            url=url,
+        return dict(
+            url=f"{self.base_url}/model/async/status/{self.group}/{execution_id}",
             method="GET",
             success_code=200,
             headers={
                 "Authorization": f"Bearer {self.group_token}",
             },
-        ).json()
+            transport=self._transport,
+        )
 
+    @staticmethod
+    def _parse_execution_status(response: dict) -> ModelExecutionState:
         status = ModelExecutionState[response["Status"]]
         if status == ModelExecutionState.Failed:
             msg = response["Message"]
@@ -816,7 +1371,12 @@ class AsyncModel(MLOpsModel):
         return status
 
     def wait_run_ready(
-        self, execution_id: Union[int, str], group_token: Optional[str] = None
+        self,
+        execution_id: Union[int, str],
+        group_token: Optional[str] = None,
+        *,
+        timeout: Optional[float] = None,
+        cancel: Optional[CancelHook] = None,
     ):
         """
         Loop until the model is ready to run
@@ -827,16 +1387,21 @@ class AsyncModel(MLOpsModel):
             Execution id of a model prediction
         group_token: Optional[str], default=None
             Token of the group
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
         """
-        current_status = ModelExecutionState.Running
         print("Waiting for model finish prediction...", end="", flush=True)
-        while current_status in [
-            ModelExecutionState.Requested,
-            ModelExecutionState.Running,
-        ]:
-            sleep(30)
-            current_status = self.execution_status(execution_id, group_token)
-            print(".", end="", flush=True)
+        current_status = wait_until(
+            lambda: self.execution_status(execution_id, group_token),
+            lambda status: status
+            not in [ModelExecutionState.Requested, ModelExecutionState.Running],
+            policy=self.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+            on_check=lambda _: print(".", end="", flush=True),
+        )
         print()
 
         if current_status == ModelExecutionState.Succeeded:
@@ -844,28 +1409,82 @@ class AsyncModel(MLOpsModel):
         else:
             logger.info(f"Prediction failed. Status {current_status}")
 
+    async def await_run_ready(
+        self,
+        execution_id: Union[int, str],
+        group_token: Optional[str] = None,
+        *,
+        timeout: Optional[float] = None,
+        cancel: Optional[CancelHook] = None,
+    ):
+        """
+        Asyncio version of `wait_run_ready`. Sleeps with `asyncio.sleep` between the checks
+
+        Parameters
+        ----------
+        execution_id: Union[int, str]
+            Execution id of a model prediction
+        group_token: Optional[str], default=None
+            Token of the group
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[asyncio.Event, threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+
+        Returns
+        -------
+        ModelExecutionState
+            Final status of the execution
+        """
+        current_status = await async_wait_until(
+            lambda: self.aexecution_status(execution_id, group_token),
+            lambda status: status
+            not in [ModelExecutionState.Requested, ModelExecutionState.Running],
+            policy=self.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+        )
+
+        if current_status == ModelExecutionState.Succeeded:
+            logger.info("Prediction succeeded")
+        else:
+            logger.info(f"Prediction failed. Status {current_status}")
+        return current_status
+
     def predict(
         self,
-        data: Union[str, Tuple[str, str], List[Tuple[str, str]], MLOpsDataset, List[MLOpsDataset]],
+        data: Union[str, Tuple[str, str], List[Tuple[str, str]], MLOpsDataset, List[MLOpsDataset], pd.DataFrame, "pyarrow.Table"],
         preprocessing: MLOpsPreprocessing = None,
         group_token=None,
         wait_complete: bool = True,
+        *,
+        progress: Optional[ProgressCallback] = None,
+        part_size: Optional[int] = None,
     ):
         """
         Run the hosted model for a specific input. It will show the result of the prediction
 
         Parameters
         ----------
-        data: str | tuple[str, str] | list[tuple[str, str]] | MLOpsDataset | None
+        data: str | tuple[str, str] | list[tuple[str, str]] | MLOpsDataset | pd.DataFrame | pyarrow.Table | None
             Data that will be used to run the model. You can upload a dataset hash as string, a tuple with file name and file path,
             a list of tuples with file name and file path, a MLOpsDataset or a list of MLOpsDataset.
             If you provide a single string, it will consider it as a dataset hash.
+            A pandas DataFrame or a pyarrow Table is sent as a compressed Parquet file, written in memory (or in a temporary file when it is large) instead of a file of yours.
         preprocessing: MLOpsPreprocessing, default=None
-            Class for preprocessing data.
+            Class for preprocessing data. The dataset it generates is given to the model by its hash, and it is only
+            downloaded and uploaded again, through a temporary folder, when the server does not inform the hash.
         group_token: str, default=None
             Token of the group
         wait_complete: bool, default=True
             Wait for model to be ready and returns a MLOpsModel instance with the new model.
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called while the input file is uploaded, with the bytes sent and the throughput
+        part_size: Optional[int], optional
+            When informed, the input file is uploaded in parts of this many bytes, sent in parallel
+            and retried one by one. If the upload fails, calling `predict` again only sends the
+            missing parts. Servers without chunked uploads receive the file in a single request.
+            DataFrames and Tables are always sent in a single request
 
         Returns
         -------
@@ -873,14 +1492,361 @@ class AsyncModel(MLOpsModel):
             Class to handle model execution
         """
 
+        digest = self._input_digest(data, preprocessing)
+        previous = self._journaled_execution(digest, group_token)
+        if previous is not None:
+            if wait_complete:
+                self.wait_run_ready(previous.exec_id, self.group_token)
+            return previous
+
+        request = self._run_request(data, preprocessing, group_token)
+        uploaded = preprocessing is None and "files" in request and isinstance(data, str)
+        try:
+            response = self.__send_run(request, progress, part_size)
+        except (InputError, ModelError):
+            dataset_hash = self._reused_upload(request, data, preprocessing)
+            if dataset_hash is None:
+                raise
+            logger.warning(f"Dataset {dataset_hash} was not accepted. Uploading {data} again")
+            forget_upload(self.base_url, self.credentials[2], self.group, dataset_hash)
+            request = self._run_request(data, None, None)
+            response = self.__send_run(request, progress, part_size)
+            uploaded = True
+
+        if uploaded:
+            record_upload(
+                self.base_url, self.credentials[2], self.group, data, response.get("DatasetHash")
+            )
+
+        logger.info("Running data prediction...")
+
+        execution_id = response["ExecutionId"]
+        record_submission(ASYNC_MODEL, self.model_hash, self.group, execution_id, digest)
+
+        if wait_complete:
+            self.wait_run_ready(execution_id, self.group_token)
+
+        logger.info("Analysis complete. Predictions are now available!")
+
+        model_execution = ModelExecution(exec_id=execution_id, model=self)
+        return model_execution
+
+    def __send_run(
+        self,
+        request: dict,
+        progress: Optional[ProgressCallback],
+        part_size: Optional[int],
+    ) -> dict:
+        """Send the request that starts an asynchronous prediction, and close its files"""
+        files = request.get("files")
+        try:
+            if part_size and files and isinstance(files[0][1][1].name, str):
+                [(field, (filename, file_obj))] = request.pop("files")
+                file_obj.close()
+                return chunked_upload(
+                    request,
+                    field,
+                    file_obj.name,
+                    filename=filename,
+                    part_size=part_size,
+                    progress=progress,
+                ).json()
+            return make_request(**request, progress=progress).json()
+        finally:
+            for _, (_, file_obj) in files or []:
+                file_obj.close()
+
+    async def apredict(
+        self,
+        data: Union[str, Tuple[str, str], List[Tuple[str, str]], MLOpsDataset, List[MLOpsDataset], pd.DataFrame, "pyarrow.Table"],
+        preprocessing: MLOpsPreprocessing = None,
+        group_token=None,
+        wait_complete: bool = True,
+    ):
+        """
+        Asyncio version of `predict`. Requires the optional `httpx` dependency.
+        A preprocessing step, when informed, runs in a worker thread
+
+        Parameters
+        ----------
+        data: str | tuple[str, str] | list[tuple[str, str]] | MLOpsDataset | pd.DataFrame | pyarrow.Table | None
+            Data that will be used to run the model. You can upload a dataset hash as string, a tuple with file name and file path,
+            a list of tuples with file name and file path, a MLOpsDataset or a list of MLOpsDataset.
+            If you provide a single string, it will consider it as a dataset hash.
+            A pandas DataFrame or a pyarrow Table is sent as a compressed Parquet file, written in memory (or in a temporary file when it is large) instead of a file of yours.
+        preprocessing: MLOpsPreprocessing, default=None
+            Class for preprocessing data. The dataset it generates is given to the model by its hash, and it is only
+            downloaded and uploaded again, through a temporary folder, when the server does not inform the hash.
+        group_token: str, default=None
+            Token of the group
+        wait_complete: bool, default=True
+            Wait for the prediction to finish before returning
+
+        Returns
+        -------
+        ModelExecution
+            Class to handle model execution
+        """
+        digest = await asyncio.to_thread(self._input_digest, data, preprocessing)
+        previous = await asyncio.to_thread(self._journaled_execution, digest, group_token)
+        if previous is not None:
+            if wait_complete:
+                await self.await_run_ready(previous.exec_id, self.group_token)
+            return previous
+
+        request = await asyncio.to_thread(
+            self._run_request, data, preprocessing, group_token
+        )
+        uploaded = preprocessing is None and "files" in request and isinstance(data, str)
+        try:
+            response = await self.__asend_run(request)
+        except (InputError, ModelError):
+            dataset_hash = self._reused_upload(request, data, preprocessing)
+            if dataset_hash is None:
+                raise
+            logger.warning(f"Dataset {dataset_hash} was not accepted. Uploading {data} again")
+            forget_upload(self.base_url, self.credentials[2], self.group, dataset_hash)
+            request = await asyncio.to_thread(self._run_request, data, None, None)
+            response = await self.__asend_run(request)
+            uploaded = True
+
+        if uploaded:
+            await asyncio.to_thread(
+                record_upload,
+                self.base_url,
+                self.credentials[2],
+                self.group,
+                data,
+                response.get("DatasetHash"),
+            )
+
+        logger.info("Running data prediction...")
+
+        execution_id = response["ExecutionId"]
+        record_submission(ASYNC_MODEL, self.model_hash, self.group, execution_id, digest)
+
+        if wait_complete:
+            await self.await_run_ready(execution_id, self.group_token)
+
+        return ModelExecution(exec_id=execution_id, model=self)
+
+    @staticmethod
+    async def __asend_run(request: dict) -> dict:
+        """Asyncio version of `__send_run`, without chunked uploads"""
+        try:
+            return (await async_make_request(**request)).json()
+        finally:
+            for _, (_, file_obj) in request.get("files") or []:
+                file_obj.close()
+
+    def predict_partitioned(
+        self,
+        data: str,
+        *,
+        partition_rows: int = 1_000_000,
+        max_in_flight: int = 4,
+        retries: int = 2,
+        path: str = "./predictions",
+        group_token: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> PartitionedPredictionResult:
+        """
+        Score a large CSV or Parquet file as many asynchronous executions, one for each shard of the file.
+
+        The file is split while it is read, so it is never loaded in memory as a whole: CSV files in shards of
+        `partition_rows` records, and Parquet files in shards of whole row groups with at least `partition_rows` rows.
+        Up to `max_in_flight` shards are uploaded and scored at the same time. A shard that could not be sent, or whose
+        execution fails, is sent again, up to `retries` times, without touching the other shards. A shard still running
+        after `timeout` is not sent again. Once every shard succeeded, their results are downloaded and joined in the
+        order of the input. When the execution journal is enabled, every shard execution is journaled, and calling
+        `predict_partitioned` again after a crash re-attaches to the shards that succeeded or are still running.
+
+        Parameters
+        ----------
+        data: str
+            Path of a CSV or Parquet file
+        partition_rows: int, optional
+            Rows in each shard. Default is 1,000,000
+        max_in_flight: int, optional
+            Maximum number of shards being scored at the same time. Default is 4
+        retries: int, optional
+            Times a failed shard is sent again. Default is 2
+        path: str, optional
+            Folder where the joined results are written. Default is "./predictions"
+        group_token: Optional[str], optional
+            Token of the group
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait for each execution. Default is the timeout of `wait_policy`
+
+        Raises
+        ------
+        ModelError
+            When a shard still fails after its retries, or is still running after `timeout`
+
+        Returns
+        -------
+        PartitionedPredictionResult
+            Executions of the shards and paths of the joined results
+        """
+        if group_token:
+            self.set_token(group_token)
+        validate_data(data, {"csv", "parquet"})
+
+        started = time.monotonic()
+        os.makedirs(path, exist_ok=True)
+        workdir = tempfile.mkdtemp(dir=path, prefix=".mlops-shards-")
+        slots = threading.BoundedSemaphore(max_in_flight)
+        futures = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max_in_flight, thread_name_prefix="mlops-codex-shard"
+            ) as pool:
+                shards = iter_shards(data, partition_rows)
+                while True:
+                    slots.acquire()
+                    item = next(shards, None)
+                    if item is None:
+                        slots.release()
+                        break
+                    filename, shard = item
+                    future = pool.submit(
+                        self.__run_shard,
+                        len(futures),
+                        filename,
+                        shard,
+                        workdir,
+                        retries,
+                        timeout,
+                    )
+                    future.add_done_callback(lambda _: slots.release())
+                    futures.append(future)
+            logger.info(f"Sent {len(futures)} shards of {data}")
+
+            outcomes, failures = [], []
+            for index, future in enumerate(futures):
+                try:
+                    outcomes.append(future.result())
+                except Exception as error:
+                    failures.append(f"shard {index}: {error}")
+            if failures:
+                raise ModelError(
+                    f"{len(failures)} of {len(futures)} shards failed. " + "; ".join(failures)
+                )
+
+            files = concatenate_outputs([archive for _, archive, _ in outcomes], path)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        logger.info(f"Partitioned prediction complete. Results in {', '.join(files)}")
+        return PartitionedPredictionResult(
+            executions=[execution for execution, _, _ in outcomes],
+            files=files,
+            attempts=[attempts for _, _, attempts in outcomes],
+            elapsed=time.monotonic() - started,
+        )
+
+    def __run_shard(
+        self,
+        index: int,
+        filename: str,
+        shard,
+        workdir: str,
+        retries: int,
+        timeout: Optional[float],
+    ) -> Tuple["ModelExecution", str, int]:
+        """
+        Score a shard until it succeeds or runs out of retries, and download its result. A shard is only sent again
+        when it could not be submitted or its execution failed: an execution still running after `timeout` raises
+        `WaitTimeoutError`, since sending it again would score the same rows twice
+        """
+        try:
+            digest = journaled_inputs(shard)
+            previous = self._journaled_execution(digest, None)
+            for attempt in range(1, retries + 2):
+                try:
+                    if previous is not None:
+                        execution_id, previous = previous.exec_id, None
+                    else:
+                        execution_id = self.__submit_shard(filename, shard, digest)
+                except (AuthenticationError, InputError):
+                    raise
+                except Exception as error:
+                    if attempt > retries:
+                        raise
+                    logger.warning(
+                        f"Shard {index} could not be sent: {error}. Sending it again (retry {attempt} of {retries})"
+                    )
+                    continue
+
+                status = wait_until(
+                    lambda: self.execution_status(execution_id),
+                    lambda status: status
+                    not in [ModelExecutionState.Requested, ModelExecutionState.Running],
+                    policy=self.wait_policy,
+                    timeout=timeout,
+                )
+                if status == ModelExecutionState.Succeeded:
+                    execution = ModelExecution(exec_id=execution_id, model=self)
+                    name = f"result-{index:05d}.zip"
+                    execution.download(name=name, path=workdir)
+                    return execution, os.path.join(workdir, name), attempt
+
+                message = f"Execution {execution_id} of shard {index} ended with status {status.name}"
+                if attempt > retries:
+                    raise ModelError(message)
+                logger.warning(f"{message}. Sending it again (retry {attempt} of {retries})")
+        finally:
+            shard.close()
+
+    def __submit_shard(self, filename: str, shard, digest: Optional[str]) -> int:
+        """Start the execution of a shard, journal it and return its id"""
+        shard.seek(0)
+        request = self._start_request(self.predict_partitioned.__qualname__)
+        request["files"] = [("input", (filename, shard))]
+        execution_id = make_request(**request).json()["ExecutionId"]
+        record_submission(ASYNC_MODEL, self.model_hash, self.group, execution_id, digest)
+        return execution_id
+
+    def _start_request(self, neomaril_method: str) -> dict:
+        """Build the arguments of the request that starts an asynchronous prediction, without its input"""
+        return dict(
+            url=f"{self.base_url}/model/async/run/{self.group}/{self.model_hash}",
+            method="POST",
+            success_code=202,
+            custom_exception=ModelError,
+            custom_exception_message=f"Failed to predict data for model {self.model_hash} in group {self.group}",
+            specific_error_code=404,
+            logger_msg=f"Failed to predict data for model {self.model_hash} in group {self.group}",
+            headers={
+                "Authorization": f"Bearer {self.group_token}",
+                "Neomaril-Origin": "Codex",
+                "Neomaril-Method": neomaril_method,
+            },
+            transport=self._transport,
+        )
+
+    def _run_request(
+        self,
+        data: Union[str, Tuple[str, str], List[Tuple[str, str]], MLOpsDataset, List[MLOpsDataset], pd.DataFrame, "pyarrow.Table"],
+        preprocessing: Optional[MLOpsPreprocessing],
+        group_token: Optional[str],
+    ) -> dict:
+        """Build the arguments of the request that starts an asynchronous prediction"""
         if group_token:
             self.set_token(group_token)
 
         logger.info("Validating data...")
 
-        if Path(data).is_file():
+        table = is_table(data)
+        if table and preprocessing:
+            raise InputError(
+                "Preprocessing runs on a file or a dataset. Save the DataFrame to a file to preprocess it"
+            )
+        if not table and Path(data).is_file():
             validate_data(data, {"csv", "parquet"})
 
+        request = self._start_request(self.predict.__qualname__)
+
         if preprocessing:
             logger.info("Preprocessing data...")
             preprocessing.set_token(self.group_token)
@@ -894,87 +1860,108 @@ class AsyncModel(MLOpsModel):
                 raise PreprocessingError(
                     "Fail during preprocessing script. Please check your input file and your preprocessing script."
                 )
-            logger.info("Data preprocessing succeeded. Downloading file...")
-
-            preprocessing_run.download()
-
-            logger.info("Preprocessing complete.")
-
-            preprocessed_data_path = "./preprocessed_data.parquet"
-            files = [("input", ("preprocessed_data.parquet", open(preprocessed_data_path, "rb")))]
-
-            response = make_request(
-                url=f"{self.base_url}/model/async/run/{self.group}/{self.model_hash}",
-                method="POST",
-                files=files,
-                success_code=202,
-                custom_exception=ModelError,
-                custom_exception_message=f"Failed to predict data for model {self.model_hash} in group {self.group}",
-                specific_error_code=404,
-                logger_msg=f"Failed to predict data for model {self.model_hash} in group {self.group}",
-                headers={
-                    "Authorization": f"Bearer {self.group_token}",
-                    "Neomaril-Origin": "Codex",
-                    "Neomaril-Method": self.predict.__qualname__,
-                },
-            ).json()
+            dataset_hash = (
+                preprocessing_run.get_output_dataset_hash()
+                if isinstance(preprocessing_run, PreprocessExecution)
+                else None
+            )
+            if dataset_hash:
+                logger.info(f"Data preprocessing succeeded. Using its output dataset {dataset_hash}")
+                request["data"] = {"dataset_hash": dataset_hash}
+            else:
+                logger.info("Data preprocessing succeeded. Downloading file...")
+                request["files"] = [("input", ("preprocessed_data.parquet", self._download_preprocessed(preprocessing_run)))]
+                logger.info("Preprocessing complete.")
+        elif table:
+            request["files"] = [("input", ("input.parquet", to_parquet_buffer(data)))]
+        elif Path(data).is_file():
+            dataset_hash = find_upload(self.base_url, self.credentials[2], self.group, data)
+            if dataset_hash:
+                request["data"] = {"dataset_hash": dataset_hash}
+            else:
+                request["files"] = [("input", (data.split("/")[-1], open(data, "rb")))]
         else:
+            request["data"] = {"dataset_hash": data}
 
-            file_exists = Path(data).is_file()
-
-            if file_exists:
-
-                files = [("input", (data.split("/")[-1], open(data, "rb")))]
-
-                response = make_request(
-                    url=f"{self.base_url}/model/async/run/{self.group}/{self.model_hash}",
-                    method="POST",
-                    files=files,
-                    success_code=202,
-                    custom_exception=ModelError,
-                    custom_exception_message=f"Failed to predict data for model {self.model_hash} in group {self.group}",
-                    specific_error_code=404,
-                    logger_msg=f"Failed to predict data for model {self.model_hash} in group {self.group}",
-                    headers={
-                        "Authorization": f"Bearer {self.group_token}",
-                        "Neomaril-Origin": "Codex",
-                        "Neomaril-Method": self.predict.__qualname__,
-                    },
-                ).json()
+        return request
 
-            else:
-                form_data = {"dataset_hash": data}
-                response = make_request(
-                    url=f"{self.base_url}/model/async/run/{self.group}/{self.model_hash}",
-                    method="POST",
-                    data=form_data,
-                    success_code=202,
-                    custom_exception=ModelError,
-                    custom_exception_message=f"Failed to predict data for model {self.model_hash} in group {self.group}",
-                    specific_error_code=404,
-                    logger_msg=f"Failed to predict data for model {self.model_hash} in group {self.group}",
-                    headers={
-                        "Authorization": f"Bearer {self.group_token}",
-                        "Neomaril-Origin": "Codex",
-                        "Neomaril-Method": self.predict.__qualname__,
-                    },
-                ).json()
-
-        logger.info("Running data prediction...")
+    @staticmethod
+    def _input_digest(data, preprocessing: Optional[MLOpsPreprocessing]) -> Optional[str]:
+        """Digest of the input of a prediction for the execution journal, None when it is a table"""
+        if is_table(data):
+            return None
+        if preprocessing is not None:
+            return journaled_inputs(getattr(preprocessing, "preprocessing_id", None), data)
+        return journaled_inputs(data)
+
+    def _journaled_execution(
+        self, digest: Optional[str], group_token: Optional[str]
+    ) -> Optional["ModelExecution"]:
+        """Execution of the same input in the journal, when it succeeded or is still running"""
+        entry = find_submission(ASYNC_MODEL, self.model_hash, self.group, digest)
+        if entry is None:
+            return None
+        if not entry.finished:
+            status = self.execution_status(entry.execution_id, group_token)
+            if status == ModelExecutionState.Failed:
+                return None
+        logger.info(
+            f"This input was already submitted as execution {entry.execution_id} ({entry.state}). Re-attaching to it"
+        )
+        return ModelExecution(exec_id=int(entry.execution_id), model=self)
 
-        execution_id = response["ExecutionId"]
+    def resume_executions(self, *, pending_only: bool = True) -> List["ModelExecution"]:
+        """
+        Re-attach to the executions of this model found in the execution journal, like after a restart of the process
 
-        if wait_complete:
-            self.wait_run_ready(execution_id, self.group_token)
+        Parameters
+        ----------
+        pending_only: bool, optional
+            Only the executions that did not succeed or fail yet. Default is True
 
-        logger.info("Analysis complete. Predictions are now available!")
+        Raises
+        ------
+        InputError
+            When the execution journal is not enabled
 
-        model_execution = ModelExecution(exec_id=execution_id, model=self)
-        return model_execution
+        Returns
+        -------
+        List[ModelExecution]
+            Handles of the executions, in the order they were submitted
+        """
+        journal = get_execution_journal()
+        if journal is None:
+            raise InputError(
+                "The execution journal is not enabled. Use set_execution_journal or the env variable MLOPS_EXECUTION_JOURNAL"
+            )
+        filters = dict(kind=ASYNC_MODEL, parent_hash=self.model_hash, group=self.group)
+        entries = journal.pending(**filters) if pending_only else journal.entries(**filters)
+        logger.info(f"Re-attaching to {len(entries)} executions of model {self.model_hash}")
+        return [ModelExecution(exec_id=int(entry.execution_id), model=self) for entry in entries]
+
+    @staticmethod
+    def _download_preprocessed(preprocessing_run) -> BinaryIO:
+        """Download the output of a preprocessing to a new temporary folder, removed once the file is released"""
+        workdir = tempfile.mkdtemp(prefix="mlops-preprocessed-")
+        try:
+            preprocessing_run.download(path=workdir)
+            file_obj = open(os.path.join(workdir, "preprocessed_data.parquet"), "rb")
+        except BaseException:
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise
+        weakref.finalize(file_obj, shutil.rmtree, workdir, ignore_errors=True)
+        return file_obj
+
+    @staticmethod
+    def _reused_upload(request: dict, data, preprocessing) -> Optional[str]:
+        """Dataset hash sent in place of an input file that was already uploaded"""
+        if preprocessing is None and isinstance(data, str) and Path(data).is_file():
+            return (request.get("data") or {}).get("dataset_hash")
+        return None
 
     def __call__(
         self,
-        data: Union[str, Tuple[str, str], List[Tuple[str, str]], MLOpsDataset, List[MLOpsDataset]],
+        data: Union[str, Tuple[str, str], List[Tuple[str, str]], MLOpsDataset, List[MLOpsDataset], pd.DataFrame, "pyarrow.Table"],
         preprocessing: MLOpsPreprocessing = None,
         group_token=None,
         wait_complete=True,
@@ -984,12 +1971,14 @@ class AsyncModel(MLOpsModel):
 
         Parameters
         ----------
-        data: str | tuple[str, str] | list[tuple[str, str]] | MLOpsDataset | None
+        data: str | tuple[str, str] | list[tuple[str, str]] | MLOpsDataset | pd.DataFrame | pyarrow.Table | None
             Data that will be used to run the model. You can upload a dataset hash as string, a tuple with file name and file path,
             a list of tuples with file name and file path, a MLOpsDataset or a list of MLOpsDataset.
             If you provide a single string, it will consider it as a dataset hash.
+            A pandas DataFrame or a pyarrow Table is sent as a compressed Parquet file, written in memory (or in a temporary file when it is large) instead of a file of yours.
         preprocessing: MLOpsPreprocessing, default=None
-            Class for preprocessing data.
+            Class for preprocessing data. The dataset it generates is given to the model by its hash, and it is only
+            downloaded and uploaded again, through a temporary folder, when the server does not inform the hash.
         group_token: str, default=None
             Token of the group
         wait_complete: bool, default=True
@@ -1027,6 +2016,7 @@ class AsyncModel(MLOpsModel):
             password=self.credentials[1],
             tenant=self.credentials[2],
             group_token=self.group_token,
+            parent=self,
         )
         run.get_status()
 
@@ -1034,10 +2024,12 @@ class AsyncModel(MLOpsModel):
         return run
 
 
-class ModelExecution:
+class ModelExecution(FutureExecutionMixin):
     """
     Class to manage new asynchronous model execution. For while, it is a temporary solution
 
+    The execution also works like a `concurrent.futures.Future`: `done`, `result`, `exception` and `add_done_callback` are resolved by a background poller, so no thread is blocked while it runs.
+
     Parameters
     ----------
     exec_id: int
@@ -1058,6 +2050,11 @@ class ModelExecution:
     def __repr__(self):
         return f"AsyncModel Execution - Execution ID: {self.exec_id}"
 
+    @property
+    def wait_policy(self) -> WaitPolicy:
+        """Wait policy of the model that runs this execution"""
+        return self.model.wait_policy
+
     def __str__(self):
         return f"AsyncModel Execution - Execution ID: {self.exec_id}"
 
@@ -1073,20 +2070,65 @@ class ModelExecution:
         status = self.model.execution_status(execution_id=self.exec_id)
         return status.name
 
-    def wait_ready(self):
+    async def aget_status(self):
+        """
+        Asyncio version of `get_status`. Requires the optional `httpx` dependency
+
+        Returns
+        -------
+        str
+            Status of the asynchronous model execution.
+        """
+        status = await self.model.aexecution_status(execution_id=self.exec_id)
+        return status.name
+
+    def wait_ready(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ):
         """
         Wait for the asynchronous model execution to finish.
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+        """
+        self.model.wait_run_ready(
+            execution_id=self.exec_id, timeout=timeout, cancel=cancel
+        )
+
+    async def await_ready(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ):
         """
-        self.model.wait_run_ready(execution_id=self.exec_id)
+        Asyncio version of `wait_ready`. Sleeps with `asyncio.sleep` between the checks
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[asyncio.Event, threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+        """
+        await self.model.await_run_ready(
+            execution_id=self.exec_id, timeout=timeout, cancel=cancel
+        )
 
     def download(
         self,
         name: Optional[str] = "predictions.zip",
         path: Optional[str] = "./",
         group_token: Optional[str] = None,
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+        parts: Optional[int] = None,
     ):
         """
-        Download the asynchronous model execution.
+        Download the asynchronous model execution. The file is streamed to disk and only appears at its path once it is complete.
 
         Parameters
         ----------
@@ -1096,32 +2138,104 @@ class ModelExecution:
             Path where to save the downloaded file.
         group_token: Optional[str], default=None
             Token of the group to download the preprocessing script execution.
+        chunk_size: int, optional
+            Number of bytes read at a time, which bounds the memory used. Default is 1 MB
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called after every chunk with the bytes received and the throughput
+        checksum: Optional[str], optional
+            Expected digest of the file, like 'sha256:ab12...'. Raises `DownloadError` when it does not match
+        parts: Optional[int], optional
+            Download with HTTP Range requests, fetching up to this many byte ranges in parallel. An interrupted download is resumed by calling this method again. Falls back to a single stream when the server does not support ranges. Default is None, which always uses a single stream
+        """
+        if parts:
+            destination = ranged_download(
+                self._download_request(group_token),
+                self._download_path(name, path),
+                parts=parts,
+                chunk_size=chunk_size,
+                progress=progress,
+                checksum=checksum,
+            )
+        else:
+            response = make_request(
+                **self._download_request(group_token), stream=True
+            )
+            destination = stream_to_file(
+                response,
+                self._download_path(name, path),
+                chunk_size=chunk_size,
+                progress=progress,
+                checksum=checksum,
+            )
+        logger.info(f"Downloaded model execution in {destination}")
+
+    async def adownload(
+        self,
+        name: Optional[str] = "predictions.zip",
+        path: Optional[str] = "./",
+        group_token: Optional[str] = None,
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+    ):
         """
-        url = f"{self.model.base_url}/model/async/result/{self.model.group}/{self.exec_id}"
+        Asyncio version of `download`. Requires the optional `httpx` dependency
+
+        Parameters
+        ----------
+        name: Optional[str], default="predictions.zip"
+            Name of the file to be downloaded
+        path: Optional[str], default="./"
+            Path where to save the downloaded file.
+        group_token: Optional[str], default=None
+            Token of the group to download the preprocessing script execution.
+        chunk_size: int, optional
+            Number of bytes read at a time, which bounds the memory used. Default is 1 MB
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called after every chunk with the bytes received and the throughput
+        checksum: Optional[str], optional
+            Expected digest of the file, like 'sha256:ab12...'. Raises `DownloadError` when it does not match
+        """
+        response = await async_make_request(
+            **self._download_request(group_token), stream=True
+        )
+        destination = await async_stream_to_file(
+            response,
+            self._download_path(name, path),
+            chunk_size=chunk_size,
+            progress=progress,
+            checksum=checksum,
+        )
+        logger.info(f"Downloaded model execution in {destination}")
+
+    def _download_request(self, group_token: Optional[str]) -> dict:
+        """Build the arguments of the request that downloads the execution result"""
         if group_token:
             self.model.set_token(group_token)
 
-        response = make_request(
-            url=url,
+        return dict(
+            url=f"{self.model.base_url}/model/async/result/{self.model.group}/{self.exec_id}",
             method="GET",
             success_code=200,
             headers={
                 "Authorization": f"Bearer {self.model.group_token}",
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.download.__qualname__,
+                "Accept-Encoding": ACCEPT_ENCODING,
             },
+            transport=self.model._transport,
         )
 
+    @staticmethod
+    def _download_path(name: str, path: str) -> str:
         if not name.endswith(".zip"):
             name = f"{name}.zip"
 
         if not path.endswith("/"):
             path = path + "/"
 
-        with open(path + name, "wb") as f:
-            f.write(response.content)
-
-        logger.info(f"Downloaded model execution in {path}{name}")
+        return path + name
 
     def execution_info(self):
         """
@@ -1131,6 +2245,87 @@ class ModelExecution:
         logger.info(f"Result:\n{parse_json_to_yaml(response)}")
 
 
+class ModelHandle:
+    """
+    Lightweight reference to a model found by `MLOpsModelClient.search_models`.
+
+    It only keeps the search data of the model. The full `SyncModel` or `AsyncModel` is
+    created on the first access to any other attribute or method, reusing the session of
+    the client that made the search.
+
+    Parameters
+    ----------
+    name: str
+        Name of the model
+    model_hash: str
+        Model id (hash)
+    group: str
+        Group the model is inserted
+    operation: str
+        Operation of the model. It can be 'Sync' or 'Async'
+    state: Optional[str]
+        State of the model when the search was made
+    client: MLOpsModelClient
+        Client that made the search
+
+    Example
+    -------
+    >>> for model in client.iter_models(group='ex_group'):
+    ...     if model.state == 'Deployed':
+    ...         model.predict(data)
+    """
+
+    __slots__ = ("name", "model_hash", "group", "operation", "state", "_client", "_model")
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        model_hash: str,
+        group: str,
+        operation: str,
+        state: Optional[str],
+        client: "MLOpsModelClient",
+    ) -> None:
+        self.name = name
+        self.model_hash = model_hash
+        self.group = group
+        self.operation = operation
+        self.state = state
+        self._client = client
+        self._model = None
+
+    def __repr__(self) -> str:
+        return f"ModelHandle(name={self.name}, model_hash={self.model_hash}, group={self.group}, operation={self.operation}, state={self.state})"
+
+    def model(self) -> Union["SyncModel", "AsyncModel"]:
+        """
+        Get the model this handle refers to. It is created only once.
+
+        Returns
+        -------
+        Union[SyncModel, AsyncModel]
+            The model instance
+        """
+        if self._model is None:
+            model_class = SyncModel if self.operation == "Sync" else AsyncModel
+            self._model = model_class(
+                name=self.name,
+                login=self._client.credentials[0],
+                password=self._client.credentials[1],
+                tenant=self._client.credentials[2],
+                model_hash=self.model_hash,
+                group=self.group,
+                parent=self._client,
+            )
+        return self._model
+
+    def __getattr__(self, item: str):
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.model(), item)
+
+
 class MLOpsModelClient(BaseMLOpsClient):
     """
     Class for client to access MLOps and manage models
@@ -1143,6 +2338,10 @@ class MLOpsModelClient(BaseMLOpsClient):
         Password for authenticating with the client. You can also use the env variable MLOPS_PASSWORD to set this
     url: str
         URL to MLOps Server. Default value is https://neomaril.datarisk.net, use it to test your deployment first before changing to production. You can also use the env variable MLOPS_URL to set this
+    transport: Optional[Transport], optional
+        Pooled HTTP transport shared by the client and every model and execution it returns. Use it to tune the connection pool
+    lazy_connect: bool, optional
+        Do not contact the server when the client is created. The user logs in on the first request instead
 
     Raises
     ------
@@ -1242,9 +2441,20 @@ class MLOpsModelClient(BaseMLOpsClient):
     """
 
     def __init__(
-        self, login: str, password: str, tenant: str
+        self,
+        login: str,
+        password: str,
+        tenant: str,
+        transport: Optional[Transport] = None,
+        lazy_connect: bool = False,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(
+            login=login,
+            password=password,
+            tenant=tenant,
+            transport=transport,
+            lazy_connect=lazy_connect,
+        )
 
     def __repr__(self) -> str:
         return f'API version {self.version} - MLOpsModelClient(url="{self.base_url}", Token="{self.user_token}")'
@@ -1274,7 +2484,9 @@ class MLOpsModelClient(BaseMLOpsClient):
             The model status and a message if the status is 'Failed'
         """
 
-        return _model_status(self.base_url, self.credentials, group, model_hash)
+        return _model_status(
+            self.base_url, self._token_manager, group, model_hash, self._transport
+        )
 
     def get_model(
         self, model_hash: str, group: str, group_token: Optional[str] = None
@@ -1310,12 +2522,14 @@ class MLOpsModelClient(BaseMLOpsClient):
         logger.info(f"Trying to get a model with hash {model_hash}")
 
         url = f"{self.base_url}/model/describe/{group}/{model_hash}"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         response = make_request(
             url=url,
             method="GET",
             success_code=200,
             headers={"Authorization": f"Bearer {token}"},
+            token_manager=self._token_manager,
+            transport=self._transport,
         ).json()["Description"]
 
         logger.info("Model has been founded")
@@ -1329,6 +2543,7 @@ class MLOpsModelClient(BaseMLOpsClient):
                 model_hash=model_hash,
                 group=group,
                 group_token=group_token,
+                parent=self,
             )
 
         return AsyncModel(
@@ -1339,6 +2554,7 @@ class MLOpsModelClient(BaseMLOpsClient):
             model_hash=model_hash,
             group=group,
             group_token=group_token,
+            parent=self,
         )
 
     def search_models(
@@ -1348,7 +2564,7 @@ class MLOpsModelClient(BaseMLOpsClient):
         state: Optional[str] = None,
         group: Optional[str] = None,
         only_deployed: bool = False,
-    ) -> list:
+    ) -> List[ModelHandle]:
         """
         Search for models using the name of the model
 
@@ -1370,14 +2586,61 @@ class MLOpsModelClient(BaseMLOpsClient):
 
         Returns
         -------
-        list
-            A list with the models data, it can works like a filter depending on the arguments values
+        List[ModelHandle]
+            A list with the models found, it can works like a filter depending on the arguments values.
+            Each model is only loaded when it is used
         Example
         -------
         >>> client.search_models(group='ex_group', only_deployed=True)
         """
+        models = list(
+            self.iter_models(
+                name=name, state=state, group=group, only_deployed=only_deployed
+            )
+        )
+
+        logger.info(f"Returning {len(models)} models")
+
+        return models
+
+    def iter_models(
+        self,
+        *,
+        name: Optional[str] = None,
+        state: Optional[str] = None,
+        group: Optional[str] = None,
+        only_deployed: bool = False,
+    ) -> Iterator[ModelHandle]:
+        """
+        Same as `search_models`, but yields the models one by one instead of building a list
+
+        Parameters
+        ----------
+        name: Optional[str], default=None
+            Text that it's expected to be on the model name. It runs similar to a LIKE query on SQL
+        state: Optional[str], default=None
+            Text that it's expected to be on the state. It runs similar to a LIKE query on SQL
+        group: Optional[str], default=None
+            Text that it's expected to be on the group name. It runs similar to a LIKE query on SQL
+        only_deployed: Optional[bool], default=False
+            If it's True, filter only models ready to be used (status == "Deployed").
+
+        Raises
+        ------
+        ServerError
+            Unexpected server error
+
+        Returns
+        -------
+        Iterator[ModelHandle]
+            The models found
+        Example
+        -------
+        >>> for model in client.iter_models(group='ex_group'):
+        ...     print(model.name, model.state)
+        """
         search_parameters = " | ".join(
-            [p for p in [name, state, group, only_deployed] if p is not None]
+            [str(p) for p in [name, state, group, only_deployed] if p is not None]
         )
         logger.info(
             f"Trying to search for models given: {search_parameters} parameters"
@@ -1399,7 +2662,7 @@ class MLOpsModelClient(BaseMLOpsClient):
         if only_deployed:
             query["state"] = "Deployed"
 
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         response = make_request(
             url=url,
             method="GET",
@@ -1410,37 +2673,21 @@ class MLOpsModelClient(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.search_models.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         ).json()
 
         logger.info(f"Found {response['Count']} models")
 
-        results = response["Results"]
-        models = []
-        for result in results:
-            if result["Operation"] == "Sync":
-                model = SyncModel(
-                    name=result["Name"],
-                    login=self.credentials[0],
-                    password=self.credentials[1],
-                    tenant=self.credentials[2],
-                    model_hash=result["ModelHash"],
-                    group=result["Group"],
-                )
-                models.append(model)
-            else:
-                model = AsyncModel(
-                    name=result["Name"],
-                    login=self.credentials[0],
-                    password=self.credentials[1],
-                    tenant=self.credentials[2],
-                    model_hash=result["ModelHash"],
-                    group=result["Group"],
-                )
-                models.append(model)
-
-        logger.info(f"Returning {len(models)} models")
-
-        return models
+        for result in response["Results"]:
+            yield ModelHandle(
+                name=result["Name"],
+                model_hash=result["ModelHash"],
+                group=result["Group"],
+                operation=result["Operation"],
+                state=result.get("State"),
+                client=self,
+            )
 
     def get_logs(
         self,
@@ -1480,7 +2727,6 @@ class MLOpsModelClient(BaseMLOpsClient):
         url = f"{self.base_url}/model/logs/{model_hash}"
         return self._logs(
             url=url,
-            credentials=self.credentials,
             start=start,
             end=end,
             routine=routine,
@@ -1502,6 +2748,7 @@ class MLOpsModelClient(BaseMLOpsClient):
         python_version: str = "3.10",
         operation: str = "Sync",
         input_type: str = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> str:
         """
         Upload the files to the server
@@ -1532,6 +2779,8 @@ class MLOpsModelClient(BaseMLOpsClient):
             Defines which kind of operation is being executed (Sync or Async). Default value is Sync
         input_type: str
             The type of the input file that should be 'json', 'csv', 'parquet', 'txt', 'xls', 'xlsx'
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called while the files are uploaded, with the bytes sent and the throughput
 
         Raises
         ------
@@ -1584,7 +2833,7 @@ class MLOpsModelClient(BaseMLOpsClient):
             "python_version": python_version,
         }
 
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         response = make_request(
             url=f"{self.base_url}/model/upload/{group}",
@@ -1597,6 +2846,9 @@ class MLOpsModelClient(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.__upload_model.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
+            progress=progress,
         ).json()
 
         model_hash = response["ModelHash"]
@@ -1621,6 +2873,7 @@ class MLOpsModelClient(BaseMLOpsClient):
         python_version: str = "3.10",
         operation: Optional[str] = "Sync",
         wait_for_ready: bool = True,
+        progress: Optional[ProgressCallback] = None,
     ) -> MLOpsModel:
         """
         Deploy a new model to MLOps.
@@ -1653,6 +2906,8 @@ class MLOpsModelClient(BaseMLOpsClient):
             The type of the input file that should be 'json', 'csv' or 'parquet'
         wait_for_ready: bool, optional
             Wait for model to be ready and returns a MLOpsModel instance with the new model
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called while the model files are uploaded, with the bytes sent and the throughput
 
         Raises
         ------
@@ -1688,6 +2943,7 @@ class MLOpsModelClient(BaseMLOpsClient):
             env=env,
             operation=operation,
             input_type=input_type,
+            progress=progress,
         )
 
         builder = SyncModel if operation == "Sync" else AsyncModel
@@ -1698,6 +2954,7 @@ class MLOpsModelClient(BaseMLOpsClient):
             tenant=self.credentials[2],
             model_hash=model_hash,
             group=group,
+            parent=self,
         )
 
         model.host(operation=operation)
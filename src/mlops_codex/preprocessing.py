@@ -1,13 +1,10 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import json
 import os
 from http import HTTPStatus
-from time import sleep
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import requests
 from pydantic import BaseModel, Field, PrivateAttr
 
 from mlops_codex.__model_states import ModelExecutionState, ModelState
@@ -22,13 +19,51 @@ from mlops_codex.exceptions import (
     PreprocessingError,
     ServerError,
 )
-from mlops_codex.http_request_handler import make_request, refresh_token
+from mlops_codex.http_request_handler import (
+    Transport,
+    async_make_request,
+    make_request,
+)
 from mlops_codex.logger_config import get_logger
+from mlops_codex.shared import json_codec
+from mlops_codex.shared.data_transmitter import (
+    DOWNLOAD_CHUNK_SIZE,
+    async_stream_to_file,
+    stream_to_file,
+)
+from mlops_codex.shared.execution_journal import (
+    PREPROCESSING,
+    find_submission,
+    get_execution_journal,
+    journaled_inputs,
+    record_state,
+    record_submission,
+)
+from mlops_codex.shared.progress import ProgressCallback
+from mlops_codex.shared.upload_index import find_upload, forget_upload, record_upload
+from mlops_codex.shared.waiter import (
+    CancelHook,
+    WaitPolicy,
+    async_wait_until,
+    wait_until,
+)
 from mlops_codex.validations import validate_group_existence, validate_python_version
+from mlops_codex.watcher import FutureExecutionMixin
 
 logger = get_logger()
 
 
+def _journal_inputs(data) -> list:
+    """Inputs of a preprocessing execution as digested by the journal: file paths, names and dataset hashes"""
+    if isinstance(data, MLOpsDataset):
+        return [data.hash]
+    if isinstance(data, tuple):
+        return list(data)
+    if isinstance(data, list):
+        return [value for item in data for value in _journal_inputs(item)]
+    return [data]
+
+
 class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
     """
     Class to operate actions in an asynchronous pre-processing.
@@ -39,12 +74,31 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         Login for authenticating with the client. You can also use the env variable MLOPS_USER to set this
     password: str
         Password for authenticating with the client. You can also use the env variable MLOPS_PASSWORD to set this
+    transport: Optional[Transport], optional
+        Pooled HTTP transport used by the client. Use it to tune the connection pool
+    parent: Optional[BaseMLOps], optional
+        Object that created this client. Its connections and user session are shared with the client
+    lazy_connect: bool, optional
+        Do not contact the server when the client is created. The user logs in on the first request instead
     """
 
     def __init__(
-        self, login: str, password: str, tenant: str
+        self,
+        login: str,
+        password: str,
+        tenant: str,
+        transport: Optional[Transport] = None,
+        parent: Optional[BaseMLOps] = None,
+        lazy_connect: bool = False,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(
+            login=login,
+            password=password,
+            tenant=tenant,
+            transport=transport,
+            parent=parent,
+            lazy_connect=lazy_connect,
+        )
         self.url = f"{self.base_url}/v2/preprocessing"
 
     def __register(self, payload: dict, token: str, group: str) -> str:
@@ -88,6 +142,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
         preprocessing_script_hash = response.json()["PreprocessHash"]
@@ -149,6 +205,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 headers={
                     "Authorization": f"Bearer {token}",
                 },
+                token_manager=self._token_manager,
+                transport=self._transport,
             )
         else:
             input_data = {"dataset_hash": schema_dataset}
@@ -165,6 +223,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 headers={
                     "Authorization": f"Bearer {token}",
                 },
+                token_manager=self._token_manager,
+                transport=self._transport,
             )
 
         output_dataset_hash = response.json()["DatasetHash"]
@@ -223,6 +283,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
     def __upload_requirements(
@@ -264,13 +326,15 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
     def __upload_extras(
         self, preprocessing_script_hash: str, extra_files: Tuple[str, str]
     ) -> None:
         url = f"{self.url}/{preprocessing_script_hash}/extra-file"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         file_path = extra_files[1]
         file_name = extra_files[0]
@@ -293,6 +357,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.create.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
         msg = response.json()["Message"]
         logger.debug(msg)
@@ -331,6 +397,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.create.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
     def host_status(self, preprocessing_script_hash: str):
@@ -357,7 +425,7 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             Raised if the server encounters an issue.
         """
         url = f"{self.url}/{preprocessing_script_hash}/status"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         response = make_request(
             url=url,
             method="GET",
@@ -369,6 +437,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
         status = ModelState[response.json()["Status"]]
@@ -377,9 +447,16 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             return status, dataset_hash, None
         return status, None, response.json()["Message"]
 
-    def wait(self, preprocessing_script_hash: str, token: str):
+    def wait(
+        self,
+        preprocessing_script_hash: str,
+        token: str,
+        *,
+        timeout: Optional[float] = None,
+        cancel: Optional[CancelHook] = None,
+    ):
         """
-        Check host status for a preprocessing script every 30 seconds.
+        Check host status for a preprocessing script until it is no longer building, as told by `wait_policy`.
 
         Parameters
         ----------
@@ -387,6 +464,10 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             Preprocessing script hash
         token: str
             Token to authenticate with the MLOps server
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
 
         Returns
         -------
@@ -402,13 +483,15 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         ServerError
             Raised if the server encounters an issue.
         """
-        status, dataset_hash, _ = self.host_status(preprocessing_script_hash)
-
         print("Waiting for preprocessing script to finish...", end="", flush=True)
-        while status == ModelState.Building or status == ModelState.Ready:
-            sleep(30)
-            status, dataset_hash, _ = self.host_status(preprocessing_script_hash)
-            print(".", end="", flush=True)
+        status, dataset_hash, _ = wait_until(
+            lambda: self.host_status(preprocessing_script_hash),
+            lambda result: result[0] not in [ModelState.Building, ModelState.Ready],
+            policy=self.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+            on_check=lambda _: print(".", end="", flush=True),
+        )
         print()
 
         if status == ModelState.Deployed:
@@ -485,7 +568,7 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         validate_group_existence(group, self)
         python_version = validate_python_version(python_version)
 
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         payload = {
             "Name": name,
@@ -564,6 +647,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 headers={
                     "Authorization": f"Bearer {token}",
                 },
+                token_manager=self._token_manager,
+                transport=self._transport,
             )
             logger.info("Environment file uploaded")
 
@@ -608,7 +693,7 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         """
         List preprocessing scripts
         """
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         response = make_request(
             url=self.url,
@@ -619,6 +704,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.list_preprocessing.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
         json_response = response.json()["Result"]
         print(parse_json_to_yaml(json_response))
@@ -647,7 +734,7 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             Raised if the server encounters an issue.
         """
         url = f"{self.url}/{preprocessing_script_hash}/execution"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         response = make_request(
             url=url,
@@ -662,6 +749,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.register_execution.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
         message = response.json()["Message"]
         logger.debug(
@@ -675,9 +764,12 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         preprocessing_script_hash: str,
         execution_id: int,
         data: Union[Tuple[str, str], str] = None,
+        progress: Optional[ProgressCallback] = None,
+        group: Optional[str] = None,
     ) -> str:
         """
-        Upload an input file for a preprocessing script execution
+        Upload an input file for a preprocessing script execution. The file is streamed while it is sent.
+        When the upload index is enabled and the same content was already uploaded to the group, its dataset hash is sent instead
 
         Parameters
         ----------
@@ -687,6 +779,10 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             Execution id of the preprocessing script.
         data: tuple[str, str] | str | None
             Input file path and file name. It must be a tuple of the form (input_file_name, input_file_path).
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called while the file is uploaded, with the bytes sent and the throughput
+        group: Optional[str], optional
+            Group of the preprocessing script, used to reuse the files already uploaded to it
 
         Returns
         -------
@@ -704,10 +800,22 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         """
 
         url = f"{self.url}/{preprocessing_script_hash}/execution/{execution_id}/input"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         if isinstance(data, tuple):
             name, file_path = data
+            dataset_hash = find_upload(self.base_url, self.credentials[2], group, file_path)
+            if dataset_hash:
+                try:
+                    return self.upload_input(
+                        preprocessing_script_hash, execution_id, dataset_hash
+                    )
+                except (InputError, PreprocessingError):
+                    logger.warning(
+                        f"Dataset {dataset_hash} was not accepted. Uploading {file_path} again"
+                    )
+                    forget_upload(self.base_url, self.credentials[2], group, dataset_hash)
+
             upload_data = {"input": open(file_path, "rb")}
             payload = {"dataset_name": name}
 
@@ -726,6 +834,9 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                     "Neomaril-Origin": "Codex",
                     "Neomaril-Method": self.upload_input.__qualname__,
                 },
+                token_manager=self._token_manager,
+                transport=self._transport,
+                progress=progress,
             )
 
         else:
@@ -745,9 +856,13 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                     "Neomaril-Origin": "Codex",
                     "Neomaril-Method": self.upload_input.__qualname__,
                 },
+                token_manager=self._token_manager,
+                transport=self._transport,
             )
 
         dataset_hash = response.json()["DatasetHash"]
+        if isinstance(data, tuple):
+            record_upload(self.base_url, self.credentials[2], group, data[1], dataset_hash)
         return dataset_hash
 
     def run(self, preprocessing_script_hash: str, execution_id: int):
@@ -771,7 +886,7 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             Raised if the server encounters an issue.
         """
         url = f"{self.url}/{preprocessing_script_hash}/execution/{execution_id}/run"
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         _ = make_request(
             url=url,
@@ -786,6 +901,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.run.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
     def execution_status(self, preprocessing_script_hash: str, execution_id: int):
@@ -813,10 +930,50 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         ServerError
             Raised if the server encounters an issue.
         """
-        url = f"{self.url}/{preprocessing_script_hash}/execution/{execution_id}/status"
-        token = refresh_token(*self.credentials, self.base_url)
-
+        token = self._token_manager.get_token()
         response = make_request(
+            **self._execution_status_request(
+                preprocessing_script_hash, execution_id, token
+            )
+        )
+        status, dataset_hash = self._parse_execution_status(response.json())
+        record_state(PREPROCESSING, preprocessing_script_hash, execution_id, status)
+        return status, dataset_hash
+
+    async def aexecution_status(
+        self, preprocessing_script_hash: str, execution_id: int
+    ):
+        """
+        Asyncio version of `execution_status`. Requires the optional `httpx` dependency
+
+        Parameters
+        ----------
+        preprocessing_script_hash: str
+            Preprocessing script hash
+        execution_id: int
+            Execution id of the preprocessing script.
+
+        Returns
+        -------
+        Tuple[ModelExecutionState, Union[str, None]]
+            Return the status of the execution. If the execution is successful, the output dataset hash is also returned.
+        """
+        token = await self._token_manager.aget_token()
+        response = await async_make_request(
+            **self._execution_status_request(
+                preprocessing_script_hash, execution_id, token
+            )
+        )
+        status, dataset_hash = self._parse_execution_status(response.json())
+        record_state(PREPROCESSING, preprocessing_script_hash, execution_id, status)
+        return status, dataset_hash
+
+    def _execution_status_request(
+        self, preprocessing_script_hash: str, execution_id: int, token: str
+    ) -> dict:
+        """Build the arguments of the request that fetches the status of an execution"""
+        url = f"{self.url}/{preprocessing_script_hash}/execution/{execution_id}/status"
+        return dict(
             url=url,
             method="GET",
             success_code=200,
@@ -827,11 +984,15 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             headers={
                 "Authorization": f"Bearer {token}",
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
-        status = ModelExecutionState[response.json()["Status"]]
+    @staticmethod
+    def _parse_execution_status(response: dict):
+        status = ModelExecutionState[response["Status"]]
         if status == ModelExecutionState.Succeeded:
-            dataset_hash: str = response.json()["OutputDatasetHash"]
+            dataset_hash: Optional[str] = response.get("OutputDatasetHash")
             return status, dataset_hash
         return status, None
 
@@ -840,9 +1001,13 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         preprocessing_script_hash: str,
         execution_id: int,
         path: Optional[str] = "./",
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
     ):
         """
-        Download preprocessing script execution
+        Download preprocessing script execution. The file is streamed to disk and only appears at its path once it is complete
 
         Parameters
         ----------
@@ -852,6 +1017,12 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
             Execution id of the preprocessing script.
         path: str
             Path to download the output of a preprocessing script execution.
+        chunk_size: int, optional
+            Number of bytes read at a time, which bounds the memory used. Default is 1 MB
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called after every chunk with the bytes received and the throughput
+        checksum: Optional[str], optional
+            Expected digest of the file, like 'sha256:ab12...'. Raises `DownloadError` when it does not match
 
         Raises
         ------
@@ -862,15 +1033,72 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         ServerError
             Raised if the server encounters an issue.
         """
-        if not path.endswith("/"):
-            path += "/"
-
         self.execution_status(preprocessing_script_hash, execution_id)
 
-        url = f"{self.url}/{preprocessing_script_hash}/execution/{execution_id}/result"
-        token = refresh_token(*self.credentials, self.base_url)
-
+        token = self._token_manager.get_token()
         response = make_request(
+            **self._download_request(preprocessing_script_hash, execution_id, token),
+            stream=True,
+        )
+        destination = stream_to_file(
+            response,
+            self._download_path(path),
+            chunk_size=chunk_size,
+            progress=progress,
+            checksum=checksum,
+        )
+        logger.debug(f"MLOps preprocessing downloaded to {destination}")
+
+    async def adownload(
+        self,
+        preprocessing_script_hash: str,
+        execution_id: int,
+        path: Optional[str] = "./",
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+    ):
+        """
+        Asyncio version of `download`. Requires the optional `httpx` dependency
+
+        Parameters
+        ----------
+        preprocessing_script_hash: str
+            Preprocessing script hash
+        execution_id: int
+            Execution id of the preprocessing script.
+        path: str
+            Path to download the output of a preprocessing script execution.
+        chunk_size: int, optional
+            Number of bytes read at a time, which bounds the memory used. Default is 1 MB
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called after every chunk with the bytes received and the throughput
+        checksum: Optional[str], optional
+            Expected digest of the file, like 'sha256:ab12...'. Raises `DownloadError` when it does not match
+        """
+        await self.aexecution_status(preprocessing_script_hash, execution_id)
+
+        token = await self._token_manager.aget_token()
+        response = await async_make_request(
+            **self._download_request(preprocessing_script_hash, execution_id, token),
+            stream=True,
+        )
+        destination = await async_stream_to_file(
+            response,
+            self._download_path(path),
+            chunk_size=chunk_size,
+            progress=progress,
+            checksum=checksum,
+        )
+        logger.debug(f"MLOps preprocessing downloaded to {destination}")
+
+    def _download_request(
+        self, preprocessing_script_hash: str, execution_id: int, token: str
+    ) -> dict:
+        """Build the arguments of the request that downloads an execution output"""
+        url = f"{self.url}/{preprocessing_script_hash}/execution/{execution_id}/result"
+        return dict(
             url=url,
             method="GET",
             success_code=200,
@@ -883,13 +1111,15 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.download.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
 
-        filename = "preprocessed_data.parquet"
-        with open(path + filename, "wb") as preprocessed_file:
-            preprocessed_file.write(response.content)
-
-        logger.debug(f"MLOps preprocessing downloaded to {path + filename}")
+    @staticmethod
+    def _download_path(path: str) -> str:
+        if not path.endswith("/"):
+            path += "/"
+        return path + "preprocessed_data.parquet"
 
     def search(
         self,
@@ -898,7 +1128,7 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
         start: Optional[str] = None,
         end: Optional[str] = None,
     ):
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         query = {}
 
@@ -923,11 +1153,13 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.search.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
         return response.json()["Result"]
 
     def describe(self, preprocessing_script_hash: str):
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         url = f"{self.url}/{preprocessing_script_hash}"
 
         response = make_request(
@@ -943,11 +1175,13 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.describe.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
         return response.json()
 
     def describe_execution(self, preprocessing_script_hash: str, execution_id: int):
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
         url = f"{self.url}/{preprocessing_script_hash}/execution/{execution_id}"
 
         response = make_request(
@@ -963,6 +1197,8 @@ class MLOpsPreprocessingAsyncV2Client(BaseMLOpsClient):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.describe.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
         return response.json()
 
@@ -1023,9 +1259,7 @@ class MLOpsPreprocessingAsyncV2(BaseModel):
             logger.debug(f"Skipping {self.name} because its {self.status} status")
             return
 
-        token = refresh_token(
-            *self._preprocessing_client.credentials, self._preprocessing_client.base_url
-        )
+        token = self._preprocessing_client._token_manager.get_token()
         self._preprocessing_client.host(self.preprocessing_hash, token)
 
         if wait_ready:
@@ -1040,7 +1274,7 @@ class MLOpsPreprocessingAsyncV2(BaseModel):
 
     def __wait_for_execution(self, execution_id: int):
         """
-        Check the execution status of the preprocessing script every 30 seconds.
+        Check the execution status of the preprocessing script until it is no longer running.
 
         Parameters
         ----------
@@ -1052,17 +1286,15 @@ class MLOpsPreprocessingAsyncV2(BaseModel):
         Tuple[ModelExecutionState, Union[str, None]]
             Status of the execution of the preprocessing script. If the execution is successful, the output dataset hash is also returned.
         """
-        status, dataset_hash = self._preprocessing_client.execution_status(
-            self.preprocessing_hash, execution_id
-        )
-
         print("Waiting for preprocessing script to finish", end="")
-        while status == ModelExecutionState.Running:
-            sleep(30)
-            status, dataset_hash = self._preprocessing_client.execution_status(
+        status, dataset_hash = wait_until(
+            lambda: self._preprocessing_client.execution_status(
                 self.preprocessing_hash, execution_id
-            )
-            print(".", end="")
+            ),
+            lambda result: result[0] != ModelExecutionState.Running,
+            policy=self._preprocessing_client.wait_policy,
+            on_check=lambda _: print(".", end=""),
+        )
 
         if status == ModelExecutionState.Succeeded:
             logger.debug("Preprocessing script finished successfully")
@@ -1120,6 +1352,7 @@ class MLOpsPreprocessingAsyncV2(BaseModel):
                     preprocessing_script_hash=self.preprocessing_hash,
                     execution_id=execution_id,
                     data=input_file,
+                    group=self.group,
                 )
                 logger.debug(
                     f"Uploaded input file {input_file} - Output Hash {output_dataset_hash}"
@@ -1129,6 +1362,7 @@ class MLOpsPreprocessingAsyncV2(BaseModel):
                 preprocessing_script_hash=self.preprocessing_hash,
                 execution_id=execution_id,
                 data=input_files,
+                group=self.group,
             )
             logger.debug(
                 f"Uploaded input file {input_files} - Output Hash {output_dataset_hash}"
@@ -1155,6 +1389,16 @@ class MLOpsPreprocessingAsyncV2(BaseModel):
         self._preprocessing_client.run(
             preprocessing_script_hash=self.preprocessing_hash, execution_id=execution_id
         )
+        record_submission(
+            PREPROCESSING,
+            self.preprocessing_hash,
+            self.group,
+            execution_id,
+            journaled_inputs(
+                self.preprocessing_hash,
+                *_journal_inputs(input_files if input_files is not None else dataset_hashes),
+            ),
+        )
         logger.debug(
             f"Started preprocessing script execution {execution_id} - Hash {self.preprocessing_hash}"
         )
@@ -1197,10 +1441,12 @@ class MLOpsPreprocessingAsyncV2(BaseModel):
         )
 
 
-class PreprocessExecution:
+class PreprocessExecution(FutureExecutionMixin):
     """
     Class to manage new processing script executions. For while, it is a temporary solution
 
+    The execution also works like a `concurrent.futures.Future`: `done`, `result`, `exception` and `add_done_callback` are resolved by a background poller, so no thread is blocked while it runs.
+
     Parameters
     ----------
     preprocess_hash: str
@@ -1214,6 +1460,8 @@ class PreprocessExecution:
     password: str
         Password for authenticating with the client. You can also use the env variable MLOPS_PASSWORD to set this
     url: str
+    parent: Optional[BaseMLOps], optional
+        Object that created this execution. Its connections and user session are shared with the execution
 
     Raises
     ------
@@ -1233,6 +1481,7 @@ class PreprocessExecution:
         login: str,
         password: str,
         tenant: str,
+        parent: Optional[BaseMLOps] = None,
     ) -> None:
         self.preprocessing_hash = preprocess_hash
         self.group = group
@@ -1241,8 +1490,14 @@ class PreprocessExecution:
             login=login,
             password=password,
             tenant=tenant,
+            parent=parent,
         )
 
+    @property
+    def wait_policy(self) -> WaitPolicy:
+        """Wait policy of the client that follows this execution"""
+        return self.__client.wait_policy
+
     def get_status(self):
         """
         Get the status of the preprocessing script execution.
@@ -1257,23 +1512,106 @@ class PreprocessExecution:
         )
         return status.name
 
-    def wait_ready(self):
+    async def aget_status(self):
         """
-        Wait for the preprocessing script execution to finish.
+        Asyncio version of `get_status`. Requires the optional `httpx` dependency
+
+        Returns
+        -------
+        str
+            Status of the preprocessing script execution.
         """
-        status, _ = self.__client.execution_status(
+        status, _ = await self.__client.aexecution_status(
             preprocessing_script_hash=self.preprocessing_hash, execution_id=self.exec_id
         )
-        while status in [ModelExecutionState.Running, ModelExecutionState.Requested]:
-            sleep(30)
-            status, _ = self.__client.execution_status(
+        return status.name
+
+    def get_output_dataset_hash(self) -> Optional[str]:
+        """
+        Get the hash of the dataset generated by the preprocessing script execution, so it can be used as the input
+        of a model without downloading it.
+
+        Returns
+        -------
+        Optional[str]
+            Dataset hash of the output, or None when the execution has not succeeded or the server did not inform it.
+        """
+        _, dataset_hash = self.__client.execution_status(
+            preprocessing_script_hash=self.preprocessing_hash, execution_id=self.exec_id
+        )
+        return dataset_hash
+
+    def wait_ready(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ):
+        """
+        Wait for the preprocessing script execution to finish.
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+        """
+        status, _ = wait_until(
+            lambda: self.__client.execution_status(
                 preprocessing_script_hash=self.preprocessing_hash,
                 execution_id=self.exec_id,
-            )
+            ),
+            lambda result: result[0]
+            not in [ModelExecutionState.Running, ModelExecutionState.Requested],
+            policy=self.__client.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+        )
+        logger.info(
+            f"Preprocessing script execution {self.preprocessing_hash} is {status.name}."
+        )
+
+    async def await_ready(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ):
+        """
+        Asyncio version of `wait_ready`. Sleeps with `asyncio.sleep` between the checks
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[asyncio.Event, threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+        """
+        status, _ = await async_wait_until(
+            lambda: self.__client.aexecution_status(
+                preprocessing_script_hash=self.preprocessing_hash,
+                execution_id=self.exec_id,
+            ),
+            lambda result: result[0]
+            not in [ModelExecutionState.Running, ModelExecutionState.Requested],
+            policy=self.__client.wait_policy,
+            timeout=timeout,
+            cancel=cancel,
+        )
         logger.info(
             f"Preprocessing script execution {self.preprocessing_hash} is {status.name}."
         )
 
+    async def adownload(self, path: Optional[str] = "./"):
+        """
+        Asyncio version of `download`. Requires the optional `httpx` dependency
+
+        Parameters
+        ----------
+        path: Optional[str]
+            Path where to save the downloaded file.
+        """
+        await self.__client.adownload(
+            preprocessing_script_hash=self.preprocessing_hash,
+            execution_id=self.exec_id,
+            path=path,
+        )
+
     def download(self, path: Optional[str] = "./"):
         """
         Download the preprocessing script execution.
@@ -1324,6 +1662,8 @@ class MLOpsPreprocessing(BaseMLOps):
         Group the model is inserted.
     base_url: str
         URL to MLOps Server. Default value is https://neomaril.datarisk.net/, use it to test your deployment first before changing to production. You can also use the env variable MLOPS_URL to set this
+    parent: Optional[BaseMLOps], optional
+        Object that created this preprocessing. Its connections and user session are shared with it
 
     Example
     --------
@@ -1351,13 +1691,14 @@ class MLOpsPreprocessing(BaseMLOps):
         tenant: str,
         group: Optional[str] = None,
         group_token: Optional[str] = None,
+        parent: Optional[BaseMLOps] = None,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(login=login, password=password, tenant=tenant, parent=parent)
         self.preprocessing_id = preprocessing_id
         self.group = group
         self.__token = group_token if group_token else os.getenv("MLOPS_GROUP_TOKEN")
         self.__new_preprocess_client = MLOpsPreprocessingAsyncV2Client(
-            login=login, password=password, tenant=tenant
+            login=login, password=password, tenant=tenant, parent=self
         )
 
         try:
@@ -1369,12 +1710,13 @@ class MLOpsPreprocessing(BaseMLOps):
             self.__preprocessing_ready = self.status == "Deployed"
         except Exception:
             url = f"{self.base_url}/preprocessing/describe/{group}/{preprocessing_id}"
-            response = requests.get(
+            response = self._transport.get(
                 url,
                 headers={
                     "Authorization": "Bearer "
-                    + refresh_token(*self.credentials, self.base_url)
+                    + self._token_manager.get_token()
                 },
+                token_manager=self._token_manager,
             )
             result = response.json()["Description"]
             self.operation = result.get("Operation").lower()
@@ -1396,19 +1738,31 @@ class MLOpsPreprocessing(BaseMLOps):
             f'MLOPS preprocessing (Group: {self.group}, Id: {self.preprocessing_id})"'
         )
 
-    def wait_ready(self):
+    def wait_ready(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ):
         """
         Waits the pre-processing to be with status 'Deployed'
 
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of `wait_policy`
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+
         Example
         -------
         >>> preprocessing.wait_ready()
         """
         if self.status in ["Ready", "Building"]:
-            self.status = self.__get_status()["Status"]
-            while self.status == "Building":
-                sleep(30)
-                self.status = self.__get_status()["Status"]
+            self.status = wait_until(
+                lambda: self.__get_status()["Status"],
+                lambda status: status != "Building",
+                policy=self.wait_policy,
+                timeout=timeout,
+                cancel=cancel,
+            )
 
     def get_logs(
         self,
@@ -1456,7 +1810,6 @@ class MLOpsPreprocessing(BaseMLOps):
         url = f"{self.base_url}/preprocessing/logs/{self.group}/{self.preprocessing_id}"
         return self._logs(
             url=url,
-            credentials=self.credentials,
             start=start,
             end=end,
             routine=routine,
@@ -1519,50 +1872,23 @@ class MLOpsPreprocessing(BaseMLOps):
             The return of the scoring function in the source file for Sync preprocessing or the execution class for Async preprocessing.
         """
         try:
-            execution_id = self.__new_preprocess_client.register_execution(
-                preprocessing_script_hash=self.preprocessing_id
-            )
-            logger.info(f"Registered Preprocessing for Execution ID: {execution_id}")
-
-            if isinstance(data, str) or isinstance(data, tuple):
-                self.__new_preprocess_client.upload_input(
-                    self.preprocessing_id, execution_id, data
-                )
-            elif isinstance(data, MLOpsDataset):
-                self.__new_preprocess_client.upload_input(
-                    self.preprocessing_id, execution_id, data.hash
+            digest = journaled_inputs(self.preprocessing_id, *_journal_inputs(data))
+            execution_id = self.__journaled_execution(digest)
+            if execution_id is None:
+                execution_id = self.__submit_execution(data)
+                record_submission(
+                    PREPROCESSING, self.preprocessing_id, self.group, execution_id, digest
                 )
-            else:
-                if isinstance(data[0], MLOpsDataset):
-                    data = [d.hash for d in data]
-                for d in data:
-                    output_dataset_hash = self.__new_preprocess_client.upload_input(
-                        preprocessing_script_hash=self.preprocessing_id,
-                        execution_id=execution_id,
-                        data=d,
-                    )
-                    logger.info(
-                        f"Uploaded input file {d} - Output Hash {output_dataset_hash}"
-                    )
-
-            self.__new_preprocess_client.run(
-                preprocessing_script_hash=self.preprocessing_id,
-                execution_id=execution_id,
-            )
-            logger.info(f"Preprocessing has started. Execution ID: {execution_id}")
             if wait_complete:
-                status, _ = self.__new_preprocess_client.execution_status(
-                    self.preprocessing_id, execution_id
-                )
                 print("Waiting for preprocessing script to finish...", end="")
-                while status == ModelExecutionState.Running:
-                    sleep(10)
-                    status, dataset_hash = (
-                        self.__new_preprocess_client.execution_status(
-                            self.preprocessing_id, execution_id
-                        )
-                    )
-                    print(".", end="")
+                status, _ = wait_until(
+                    lambda: self.__new_preprocess_client.execution_status(
+                        self.preprocessing_id, execution_id
+                    ),
+                    lambda result: result[0] != ModelExecutionState.Running,
+                    policy=self.wait_policy,
+                    on_check=lambda _: print(".", end=""),
+                )
                 print()
 
                 logger.info(
@@ -1575,6 +1901,7 @@ class MLOpsPreprocessing(BaseMLOps):
                 login=self.credentials[0],
                 password=self.credentials[1],
                 tenant=self.credentials[2],
+                parent=self,
             )
             return run
         except:  # noqa: E722
@@ -1588,9 +1915,9 @@ class MLOpsPreprocessing(BaseMLOps):
                     if self.operation == "sync":
                         preprocessing_input = {"Input": data}
 
-                        req = requests.post(
+                        req = self._transport.post(
                             url,
-                            data=json.dumps(preprocessing_input),
+                            data=json_codec.dumps(preprocessing_input),
                             headers={
                                 "Authorization": "Bearer " + group_token,
                                 "Neomaril-Origin": "Codex",
@@ -1605,7 +1932,7 @@ class MLOpsPreprocessing(BaseMLOps):
                             "dataset": open(data, "rb"),
                         }
 
-                        req = requests.post(
+                        req = self._transport.post(
                             url,
                             files=files,
                             headers={
@@ -1629,16 +1956,20 @@ class MLOpsPreprocessing(BaseMLOps):
                                 tenant=self.credentials[2],
                                 group=self.group,
                                 group_token=group_token,
+                                parent=self,
                             )
                             response = run.get_status()
                             status = response["Status"]
                             if wait_complete:
                                 print("Waiting the training run.", end="")
-                                while status in ["Running", "Requested"]:
-                                    sleep(30)
-                                    print(".", end="", flush=True)
-                                    response = run.get_status()
-                                    status = response["Status"]
+                                response = wait_until(
+                                    run.get_status,
+                                    lambda response: response["Status"]
+                                    not in ["Running", "Requested"],
+                                    policy=self.wait_policy,
+                                    on_check=lambda _: print(".", end="", flush=True),
+                                )
+                                status = response["Status"]
                             if status == "Failed":
                                 formatted_msg = parse_json_to_yaml(response.json())
                                 logger.error(
@@ -1656,6 +1987,90 @@ class MLOpsPreprocessing(BaseMLOps):
 
             return run  # This is a potential error
 
+    def __submit_execution(self, data) -> int:
+        """Register an execution, upload its inputs and start it"""
+        execution_id = self.__new_preprocess_client.register_execution(
+            preprocessing_script_hash=self.preprocessing_id
+        )
+        logger.info(f"Registered Preprocessing for Execution ID: {execution_id}")
+
+        if isinstance(data, str) or isinstance(data, tuple):
+            self.__new_preprocess_client.upload_input(
+                self.preprocessing_id, execution_id, data, group=self.group
+            )
+        elif isinstance(data, MLOpsDataset):
+            self.__new_preprocess_client.upload_input(
+                self.preprocessing_id, execution_id, data.hash
+            )
+        else:
+            if isinstance(data[0], MLOpsDataset):
+                data = [d.hash for d in data]
+            for d in data:
+                output_dataset_hash = self.__new_preprocess_client.upload_input(
+                    preprocessing_script_hash=self.preprocessing_id,
+                    execution_id=execution_id,
+                    data=d,
+                    group=self.group,
+                )
+                logger.info(
+                    f"Uploaded input file {d} - Output Hash {output_dataset_hash}"
+                )
+
+        self.__new_preprocess_client.run(
+            preprocessing_script_hash=self.preprocessing_id,
+            execution_id=execution_id,
+        )
+        logger.info(f"Preprocessing has started. Execution ID: {execution_id}")
+        return execution_id
+
+    def __journaled_execution(self, digest: Optional[str]) -> Optional[int]:
+        """Execution of the same inputs in the journal, when it succeeded or is still running"""
+        entry = find_submission(PREPROCESSING, self.preprocessing_id, self.group, digest)
+        if entry is None:
+            return None
+        if not entry.finished:
+            status, _ = self.__new_preprocess_client.execution_status(
+                self.preprocessing_id, int(entry.execution_id)
+            )
+            if status == ModelExecutionState.Failed:
+                return None
+        logger.info(
+            f"These inputs were already submitted as execution {entry.execution_id} ({entry.state}). Re-attaching to it"
+        )
+        return int(entry.execution_id)
+
+    def resume_executions(self, *, pending_only: bool = True) -> List["PreprocessExecution"]:
+        """
+        Re-attach to the executions of this preprocessing found in the execution journal, like after a restart of the
+        process
+
+        Parameters
+        ----------
+        pending_only: bool, optional
+            Only the executions that did not succeed or fail yet. Default is True
+
+        Raises
+        ------
+        InputError
+            When the execution journal is not enabled
+
+        Returns
+        -------
+        List[PreprocessExecution]
+            Handles of the executions, in the order they were submitted
+        """
+        journal = get_execution_journal()
+        if journal is None:
+            raise InputError(
+                "The execution journal is not enabled. Use set_execution_journal or the env variable MLOPS_EXECUTION_JOURNAL"
+            )
+        filters = dict(kind=PREPROCESSING, parent_hash=self.preprocessing_id, group=self.group)
+        entries = journal.pending(**filters) if pending_only else journal.entries(**filters)
+        logger.info(
+            f"Re-attaching to {len(entries)} executions of preprocessing {self.preprocessing_id}"
+        )
+        return [self.get_preprocessing_execution(entry.execution_id) for entry in entries]
+
     def get_preprocessing_execution(self, exec_id: str):
         """
         Get an execution instance for that preprocessing.
@@ -1687,6 +2102,7 @@ class MLOpsPreprocessing(BaseMLOps):
                 login=self.credentials[0],
                 password=self.credentials[1],
                 tenant=self.credentials[2],
+                parent=self,
             )
         raise PreprocessingError("Sync pre processing don't have executions")
 
@@ -1712,12 +2128,13 @@ class MLOpsPreprocessing(BaseMLOps):
             return {"Status": status.name, "Message": message}
         except:  # noqa: E722
             url = f"{self.base_url}/preprocessing/status/{self.group}/{self.preprocessing_id}"
-            response = requests.get(
+            response = self._transport.get(
                 url,
                 headers={
                     "Authorization": "Bearer "
-                    + refresh_token(*self.credentials, self.base_url)
+                    + self._token_manager.get_token()
                 },
+                token_manager=self._token_manager,
             )
             if response.status_code == 200:
                 return response.json()
@@ -1727,7 +2144,7 @@ class MLOpsPreprocessing(BaseMLOps):
             raise PreprocessingError("Preprocessing has failed")
 
     def get_datasets(self):
-        token = refresh_token(*self.credentials, self.base_url)
+        token = self._token_manager.get_token()
 
         response = make_request(
             url=f"{self.base_url}/v2/preprocessing",
@@ -1738,6 +2155,8 @@ class MLOpsPreprocessing(BaseMLOps):
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.get_datasets.__qualname__,
             },
+            token_manager=self._token_manager,
+            transport=self._transport,
         )
         results = response.json()["Result"]
         datasets = [
@@ -1749,6 +2168,8 @@ class MLOpsPreprocessing(BaseMLOps):
                 hash=dataset["DatasetHash"],
                 dataset_name=dataset["DatasetName"],
                 group=result["ScriptGroupName"],
+                transport=self._transport,
+                token_manager=self._token_manager,
             )
             for result in results
             for dataset in result["UploadedDatasets"] + result["GeneratedDatasets"]
@@ -1769,6 +2190,10 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
         Password for authenticating with the client. You can also use the env variable MLOPS_PASSWORD to set this
     url: str
         URL to MLOps Server. Default value is https://neomaril.datarisk.net/, use it to test your deployment first before changing to production. You can also use the env variable MLOPS_URL to set this
+    transport: Optional[Transport], optional
+        Pooled HTTP transport shared by the client and every preprocessing and execution it returns. Use it to tune the connection pool
+    lazy_connect: bool, optional
+        Do not contact the server when the client is created. The user logs in on the first request instead
 
     Raises
     ------
@@ -1879,10 +2304,18 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
         login: str,
         password: str,
         tenant: str,
+        transport: Optional[Transport] = None,
+        lazy_connect: bool = False,
     ):
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(
+            login=login,
+            password=password,
+            tenant=tenant,
+            transport=transport,
+            lazy_connect=lazy_connect,
+        )
         self.__new_preprocessing_client = MLOpsPreprocessingAsyncV2Client(
-            login=login, password=password, tenant=tenant
+            login=login, password=password, tenant=tenant, parent=self
         )
 
     def __get_preprocessing_status(self, *, preprocessing_id: str, group: str) -> dict:
@@ -1913,13 +2346,14 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
             return {"Status": status.name, "Message": message}
         except:  # noqa: E722
             url = f"{self.base_url}/preprocessing/status/{group}/{preprocessing_id}"
-            response = requests.get(
+            response = self._transport.get(
                 url=url,
                 headers={
                     "Authorization": "Bearer "
-                    + refresh_token(*self.credentials, self.base_url)
+                    + self._token_manager.get_token()
                 },
                 timeout=60,
+                token_manager=self._token_manager,
             )
 
             if response.status_code not in [200, 410]:
@@ -1977,13 +2411,15 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
         if status == "Building":
             if wait_complete:
                 print("Waiting for deploy to be ready.", end="")
-                while status == "Building":
-                    response = self.__get_preprocessing_status(
+                response = wait_until(
+                    lambda: self.__get_preprocessing_status(
                         preprocessing_id=preprocessing_id, group=group
-                    )
-                    status = response["Status"]
-                    print(".", end="", flush=True)
-                    sleep(10)
+                    ),
+                    lambda response: response["Status"] != "Building",
+                    policy=self.wait_policy,
+                    on_check=lambda _: print(".", end="", flush=True),
+                )
+                status = response["Status"]
                 print()
             else:
                 logger.info("Returning preprocessing, but preprocessing is not ready.")
@@ -1994,6 +2430,7 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
                     group=group,
                     tenant=self.credentials[2],
                     group_token=group_token,
+                    parent=self,
                 )
 
         if status in ["Disabled", "Ready"]:
@@ -2016,6 +2453,7 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
                 group=group,
                 tenant=self.credentials[2],
                 group_token=group_token,
+                parent=self,
             )
         else:
             raise ServerError("Unknown preprocessing status: ", status)
@@ -2090,15 +2528,16 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
             if end:
                 query["end"] = end
 
-            response = requests.get(
+            response = self._transport.get(
                 url,
                 params=query,
                 headers={
                     "Authorization": "Bearer "
-                    + refresh_token(*self.credentials, self.base_url),
+                    + self._token_manager.get_token(),
                     "Neomaril-Origin": "Codex",
                     "Neomaril-Method": self.search_preprocessing.__qualname__,
                 },
+                token_manager=self._token_manager,
             )
 
             if response.status_code == 200:
@@ -2169,7 +2608,6 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
         url = f"{self.base_url}/preprocessing/logs/{preprocessing_id}"
         return self._logs(
             url=url,
-            credentials=self.credentials,
             start=start,
             end=end,
             routine=routine,
@@ -2245,7 +2683,7 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
             if isinstance(schema, str):
                 schema_file = open(schema, "rb")
             elif isinstance(schema, dict):
-                schema_file = json.dumps(schema)
+                schema_file = json_codec.dumps(schema)
             upload_data.append(("schema", (schema.split("/")[-1], schema_file)))
         else:
             raise InputError(
@@ -2269,14 +2707,15 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
             "python_version": "Python" + python_version.replace(".", ""),
         }
 
-        response = requests.post(
+        response = self._transport.post(
             url,
             data=form_data,
             files=upload_data,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url)
+                + self._token_manager.get_token()
             },
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 201:
@@ -2327,14 +2766,15 @@ class MLOpsPreprocessingClient(BaseMLOpsClient):
             f"{self.base_url}/preprocessing/{operation}/host/{group}/{preprocessing_id}"
         )
 
-        response = requests.get(
+        response = self._transport.get(
             url,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
+                + self._token_manager.get_token(),
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.create.__qualname__,
             },
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 202:
@@ -0,0 +1,339 @@
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from mlops_codex.exceptions import CircuitOpenError
+from mlops_codex.logger_config import get_logger
+
+logger = get_logger()
+
+ENDPOINT_FAMILIES: Dict[str, str] = {
+    "login": r"/login/?$",
+    "model_sync_run": r"/model/sync/run/([^/]+)/([^/]+)",
+    "model_async_run": r"/model/async/run/([^/]+)/([^/]+)",
+    "status": r"/status(?:/|$)",
+}
+"""
+Regular expressions that group the URLs of the API in endpoint families. The values captured
+by the groups of an expression, like the group and hash of a model, get a breaker of their own
+"""
+
+
+class CircuitState(str, Enum):
+    """
+    State of a circuit breaker.
+
+    closed: requests are sent
+    open: requests fail right away, without contacting the server
+    half_open: a few requests are sent to check if the server recovered
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitBreakerMetrics:
+    """
+    Snapshot of a circuit breaker.
+
+    Parameters
+    ----------
+    name: str
+        Endpoint family of the breaker
+    state: CircuitState
+        Current state
+    calls: int
+        Number of calls in the rolling window
+    failures: int
+        Calls of the window that failed or were slow
+    slow_calls: int
+        Calls of the window that took longer than `slow_call_duration`
+    rejected: int
+        Calls refused while the circuit was open, since the breaker was created
+    times_opened: int
+        Number of times the circuit opened, since the breaker was created
+    retry_at: Optional[float]
+        `time.monotonic()` at which an open circuit lets a probe through
+    """
+
+    name: str
+    state: CircuitState
+    calls: int
+    failures: int
+    slow_calls: int
+    rejected: int
+    times_opened: int
+    retry_at: Optional[float]
+
+    @property
+    def failure_rate(self) -> float:
+        """Fraction of the calls of the window that failed"""
+        return self.failures / self.calls if self.calls else 0.0
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to an endpoint that keeps failing, so callers fail fast instead of
+    waiting for timeouts.
+
+    The outcome of the last `window_size` calls is kept. A call fails when it raises a connection
+    error or a timeout, gets a 429 or 5xx answer, or takes longer than `slow_call_duration`. Once
+    the window has `minimum_calls` calls and the fraction of failures reaches `failure_rate`, the
+    circuit opens and every call raises `CircuitOpenError`. After `reset_timeout` seconds it is half
+    open: up to `half_open_calls` probes are sent, and the circuit closes if they succeed or opens
+    again if any of them fails.
+
+    Parameters
+    ----------
+    name: str
+        Name of the breaker, used in logs and metrics
+    window_size: int, optional
+        Number of recent calls considered. Default is 20
+    minimum_calls: int, optional
+        Calls needed in the window before the circuit can open. Default is 10
+    failure_rate: float, optional
+        Fraction of failed calls that opens the circuit. Default is 0.5
+    slow_call_duration: Optional[float], optional
+        Seconds after which a successful call counts as a failure. Default is None, which never
+        counts slow calls as failures
+    reset_timeout: float, optional
+        Seconds the circuit stays open before probing the server. Default is 30
+    half_open_calls: int, optional
+        Number of probes sent while the circuit is half open. Default is 1
+    on_state_change: Optional[Callable[[str, CircuitState, CircuitState], None]], optional
+        Function called with the name, the old and the new state whenever the state changes
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        reset_timeout: float = 30,
+        half_open_calls: int = 1,
+        on_state_change: Optional[
+            Callable[[str, CircuitState, CircuitState], None]
+        ] = None,
+    ) -> None:
+        self.name = name
+        self.minimum_calls = minimum_calls
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.on_state_change = on_state_change
+
+        self.__lock = threading.Lock()
+        self.__window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self.__state = CircuitState.CLOSED
+        self.__retry_at: Optional[float] = None
+        self.__probes = 0
+        self.__probe_results = 0
+        self.__rejected = 0
+        self.__times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving an open circuit to half open once its timeout is over"""
+        with self.__lock:
+            self.__refresh()
+            return self.__state
+
+    def __refresh(self) -> None:
+        if (
+            self.__state == CircuitState.OPEN
+            and time.monotonic() >= self.__retry_at
+        ):
+            self.__change(CircuitState.HALF_OPEN)
+
+    def __change(self, state: CircuitState) -> None:
+        old, self.__state = self.__state, state
+        if state == CircuitState.OPEN:
+            self.__times_opened += 1
+            self.__retry_at = time.monotonic() + self.reset_timeout
+            logger.warning(
+                f"Circuit '{self.name}' opened. Requests fail fast for {self.reset_timeout}s"
+            )
+        elif state == CircuitState.HALF_OPEN:
+            self.__probes = 0
+            self.__probe_results = 0
+        else:
+            self.__window.clear()
+            self.__retry_at = None
+            logger.info(f"Circuit '{self.name}' closed")
+        if self.on_state_change is not None:
+            self.on_state_change(self.name, old, state)
+
+    def before_call(self) -> None:
+        """
+        Reserve a call, or refuse it when the circuit is open
+
+        Raises
+        ------
+        CircuitOpenError
+            When the circuit is open, or half open with all its probes already sent
+        """
+        with self.__lock:
+            self.__refresh()
+            if self.__state == CircuitState.CLOSED:
+                return
+            if (
+                self.__state == CircuitState.HALF_OPEN
+                and self.__probes < self.half_open_calls
+            ):
+                self.__probes += 1
+                return
+            self.__rejected += 1
+            retry_in = max(0.0, (self.__retry_at or time.monotonic()) - time.monotonic())
+        raise CircuitOpenError(
+            f"The '{self.name}' endpoints are failing. Requests are blocked for {retry_in:.0f}s more"
+        )
+
+    def record(self, success: bool, duration: float) -> None:
+        """
+        Record the outcome of a call allowed by `before_call`
+
+        Parameters
+        ----------
+        success: bool
+            Whether the server answered without a connection error, a timeout, a 429 or a 5xx
+        duration: float
+            Seconds the call took
+        """
+        slow = self.slow_call_duration is not None and duration > self.slow_call_duration
+        failed = not success or slow
+        with self.__lock:
+            if self.__state == CircuitState.HALF_OPEN:
+                if failed:
+                    self.__change(CircuitState.OPEN)
+                else:
+                    self.__probe_results += 1
+                    if self.__probe_results >= self.half_open_calls:
+                        self.__change(CircuitState.CLOSED)
+                return
+            if self.__state == CircuitState.OPEN:
+                return
+
+            self.__window.append((failed, slow))
+            calls = len(self.__window)
+            failures = sum(failed for failed, _ in self.__window)
+            if calls >= self.minimum_calls and failures / calls >= self.failure_rate:
+                self.__change(CircuitState.OPEN)
+
+    def reset(self) -> None:
+        """Close the circuit and forget the recorded calls"""
+        with self.__lock:
+            if self.__state != CircuitState.CLOSED:
+                self.__change(CircuitState.CLOSED)
+            self.__window.clear()
+
+    def metrics(self) -> CircuitBreakerMetrics:
+        """
+        Take a snapshot of the breaker
+
+        Returns
+        -------
+        CircuitBreakerMetrics
+            State and counters of the breaker
+        """
+        with self.__lock:
+            self.__refresh()
+            return CircuitBreakerMetrics(
+                name=self.name,
+                state=self.__state,
+                calls=len(self.__window),
+                failures=sum(failed for failed, _ in self.__window),
+                slow_calls=sum(slow for _, slow in self.__window),
+                rejected=self.__rejected,
+                times_opened=self.__times_opened,
+                retry_at=self.__retry_at,
+            )
+
+
+class EndpointCircuitBreakers:
+    """
+    One `CircuitBreaker` for each endpoint family of the API, shared by every request of a
+    transport. URLs that do not belong to any family are never blocked.
+
+    Families whose expression has capturing groups get one breaker for each value captured,
+    named like `model_sync_run/<group>/<model_hash>`. So the runs of each model have their own
+    breaker, and a model that keeps failing does not block the other models of the transport.
+
+    Parameters
+    ----------
+    families: Optional[Dict[str, str]], optional
+        Family names and the regular expressions that match their URLs. Default is
+        `ENDPOINT_FAMILIES`: login, status, and model_sync_run and model_async_run for each
+        model. Pass `{}` to disable the breakers
+    **options
+        Arguments given to every `CircuitBreaker`, like `failure_rate` or `reset_timeout`
+    """
+
+    def __init__(self, families: Optional[Dict[str, str]] = None, **options) -> None:
+        families = ENDPOINT_FAMILIES if families is None else families
+        self.__options = options
+        self.__lock = threading.Lock()
+        self.__patterns = [
+            (name, re.compile(pattern)) for name, pattern in families.items()
+        ]
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(name, **options)
+            for name, pattern in self.__patterns
+            if not pattern.groups
+        }
+
+    def breaker_for(self, url: str) -> Optional[CircuitBreaker]:
+        """
+        Find the breaker of the family a URL belongs to. The breaker of a model is created on
+        its first request
+
+        Parameters
+        ----------
+        url: str
+            URL of the request
+
+        Returns
+        -------
+        Optional[CircuitBreaker]
+            The breaker, or None when the URL is not in any family
+        """
+        path = url.split("?", 1)[0]
+        for family, pattern in self.__patterns:
+            match = pattern.search(path)
+            if match is None:
+                continue
+            name = "/".join((family, *filter(None, match.groups())))
+            breaker = self.breakers.get(name)
+            if breaker is None:
+                with self.__lock:
+                    breaker = self.breakers.get(name)
+                    if breaker is None:
+                        breaker = CircuitBreaker(name, **self.__options)
+                        self.breakers[name] = breaker
+            return breaker
+        return None
+
+    def __getitem__(self, name: str) -> CircuitBreaker:
+        return self.breakers[name]
+
+    def metrics(self) -> Dict[str, CircuitBreakerMetrics]:
+        """
+        Take a snapshot of every breaker
+
+        Returns
+        -------
+        Dict[str, CircuitBreakerMetrics]
+            Metrics of each endpoint family, and of each model for the run families
+        """
+        with self.__lock:
+            breakers = list(self.breakers.items())
+        return {name: breaker.metrics() for name, breaker in breakers}
@@ -0,0 +1,156 @@
+import io
+import os
+import zlib
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+from lazy_imports import try_import
+
+from mlops_codex.shared.multipart import STREAM_BLOCK_SIZE, MultipartEncoder
+
+with try_import() as _zstd_import:
+    import zstandard
+
+ENCODINGS = ("gzip", "zstd")
+
+ACCEPT_ENCODING = (
+    "zstd, gzip, deflate" if _zstd_import.is_successful() else "gzip, deflate"
+)
+"""`Accept-Encoding` sent by downloads. zstd is only accepted when `zstandard` is installed"""
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """
+    Tells when and how request bodies are compressed, with a `Content-Encoding` header.
+
+    JSON bodies and multipart uploads of at least `min_size` bytes are compressed. Uploads are
+    compressed while they are streamed, so they are sent with `Transfer-Encoding: chunked`
+    instead of a `Content-Length`. Only use it with servers that accept compressed requests.
+
+    Parameters
+    ----------
+    encoding: str, optional
+        "gzip" or "zstd". zstd requires the optional `zstandard` dependency
+        (`pip install datarisk-mlops-codex[zstd]`). Default is "gzip"
+    min_size: int, optional
+        Bodies smaller than this number of bytes are sent as they are. Default is 16 KB
+    level: Optional[int], optional
+        Compression level. Default is 6 for gzip and 3 for zstd
+    uploads: bool, optional
+        Compress multipart uploads too. Turn it off when the uploaded files are already
+        compressed, like Parquet or zip files. Default is True
+    """
+
+    encoding: str = "gzip"
+    min_size: int = 16 * 1024
+    level: Optional[int] = None
+    uploads: bool = True
+
+    def __post_init__(self) -> None:
+        if self.encoding not in ENCODINGS:
+            raise ValueError(
+                f"Unknown encoding '{self.encoding}'. Use one of {', '.join(ENCODINGS)}"
+            )
+        if self.encoding == "zstd":
+            _zstd_import.check()
+
+    def compressor(self):
+        """New streaming compressor, with `compress(data)` and `flush()` methods"""
+        if self.encoding == "zstd":
+            level = 3 if self.level is None else self.level
+            return zstandard.ZstdCompressor(level=level).compressobj()
+        level = 6 if self.level is None else self.level
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: Union[str, bytes]) -> bytes:
+        """Compress a whole body"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        compressor = self.compressor()
+        return compressor.compress(data) + compressor.flush()
+
+    def encode(self, body, headers: Optional[dict]):
+        """
+        Compress a request body when the policy applies to it
+
+        Parameters
+        ----------
+        body: Any
+            Body of the request, as given to `requests`
+        headers: Optional[dict]
+            Headers of the request
+
+        Returns
+        -------
+        Tuple[Any, Optional[dict]]
+            The body and the headers to send
+        """
+        headers = headers or {}
+        if any(key.lower() == "content-encoding" for key in headers):
+            return body, headers
+        if isinstance(body, (str, bytes)):
+            size = len(body) if isinstance(body, bytes) else len(body.encode("utf-8"))
+            if size < self.min_size:
+                return body, headers
+            body = self.compress(body)
+        elif isinstance(body, MultipartEncoder):
+            if not self.uploads or len(body) < self.min_size:
+                return body, headers
+            body = CompressedBody(body, self)
+        else:
+            return body, headers
+        return body, {**headers, "Content-Encoding": self.encoding}
+
+
+class CompressedBody:
+    """
+    Request body compressed while it is read from another body. It has no known size, so it is
+    sent with `Transfer-Encoding: chunked`, and it can be rewound to send the request again.
+
+    Parameters
+    ----------
+    source: MultipartEncoder
+        Body to compress. It must support `read` and `seek(0)`
+    policy: CompressionPolicy
+        Encoding and level used
+    """
+
+    def __init__(self, source: MultipartEncoder, policy: CompressionPolicy) -> None:
+        self.source = source
+        self.policy = policy
+        self.content_type = source.content_type
+        self.__compressor = policy.compressor()
+        self.__buffer = b""
+        self.__done = False
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to `size` compressed bytes, or all of the rest when `size` is negative"""
+        while not self.__done and (size < 0 or len(self.__buffer) < size):
+            chunk = self.source.read(STREAM_BLOCK_SIZE)
+            if chunk:
+                self.__buffer += self.__compressor.compress(chunk)
+            else:
+                self.__buffer += self.__compressor.flush()
+                self.__done = True
+        if size < 0:
+            out, self.__buffer = self.__buffer, b""
+        else:
+            out, self.__buffer = self.__buffer[:size], self.__buffer[size:]
+        return out
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(STREAM_BLOCK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> None:
+        """Go back to the beginning of the body, so the request can be sent again"""
+        if offset != 0 or whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("The body can only be rewound")
+        self.source.seek(0)
+        self.__compressor = self.policy.compressor()
+        self.__buffer = b""
+        self.__done = False
@@ -1,10 +1,42 @@
-from mlops_codex.http_request_handler import make_request
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from mlops_codex.exceptions import DownloadError
+from mlops_codex.http_request_handler import (
+    _check_response,
+    get_default_transport,
+    make_request,
+)
 from mlops_codex.logger_config import get_logger
+from mlops_codex.shared.multipart import STREAM_BLOCK_SIZE, _Part
+from mlops_codex.shared.progress import (
+    ProgressCallback,
+    ProgressMeter,
+    TransferProgress,
+    format_size,
+)
+from mlops_codex.shared.retry import RetryPolicy
 
 logger = get_logger()
 
 
-def send_file(url, token, neomaril_method, input_data=None, upload_data=None):
+def send_file(
+    url,
+    token,
+    neomaril_method,
+    input_data=None,
+    upload_data=None,
+    part_size=None,
+    transport=None,
+    token_manager=None,
+):
     """
     Sends the file to the API.
 
@@ -20,20 +52,38 @@ def send_file(url, token, neomaril_method, input_data=None, upload_data=None):
         Dictionary containing the file data
     neomaril_method : str
         Method name for the Neomaril header
+    part_size : int, optional
+        When informed, a single file opened from disk is sent in parts of this many bytes
+        with `chunked_upload`, so a failure does not restart the whole upload
+    transport : Transport, optional
+        Pooled transport of the caller. Default is the shared transport
+    token_manager : TokenManager, optional
+        Token manager of the caller, used to log in again when the token expires
     """
 
-    response = make_request(
+    request = dict(
         url=url,
         method="PATCH",
         success_code=201,
         data=input_data,
-        files=upload_data,
         headers={
             "Authorization": f"Bearer {token}",
             "Neomaril-Origin": "Codex",
             "Neomaril-Method": neomaril_method,
         },
-    ).json()
+        transport=transport,
+        token_manager=token_manager,
+    )
+
+    path = None
+    if part_size and upload_data and len(upload_data) == 1:
+        [(field, file_obj)] = upload_data.items()
+        path = getattr(file_obj, "name", None)
+
+    if isinstance(path, str) and os.path.isfile(path):
+        response = chunked_upload(request, field, path, part_size=part_size).json()
+    else:
+        response = make_request(**request, files=upload_data).json()
 
     msg = response["Message"]
 
@@ -46,7 +96,9 @@ def send_file(url, token, neomaril_method, input_data=None, upload_data=None):
         )
 
 
-def send_json(url, token, payload, neomaril_method):
+def send_json(
+    url, token, payload, neomaril_method, transport=None, token_manager=None
+):
     """
     Sends the JSON payload to the API.
 
@@ -60,6 +112,10 @@ def send_json(url, token, payload, neomaril_method):
         Dictionary containing the payload data
     neomaril_method : str
         Method name for the Neomaril header
+    transport : Transport, optional
+        Pooled transport of the caller. Default is the shared transport
+    token_manager : TokenManager, optional
+        Token manager of the caller, used to log in again when the token expires
     """
 
     response = make_request(
@@ -72,8 +128,723 @@ def send_json(url, token, payload, neomaril_method):
             "Neomaril-Origin": "Codex",
             "Neomaril-Method": neomaril_method,
         },
+        transport=transport,
+        token_manager=token_manager,
     ).json()
 
     msg = response["Message"]
 
     logger.info({msg})
+
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+MIN_RANGE_SIZE = 8 * 1024 * 1024
+
+
+def _parse_checksum(checksum: str):
+    """Split a checksum like 'sha256:ab12...' into a hash object and the expected digest"""
+    algorithm, _, digest = checksum.rpartition(":")
+    return hashlib.new(algorithm or "sha256"), digest.lower()
+
+
+class _DownloadSink:
+    """
+    Writes a download to a temporary file next to its destination, so a failed or
+    partial download never replaces the file. The checksum is computed while the
+    chunks are written, so the file is not read again.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        total: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+    ) -> None:
+        os.makedirs(directory or ".", exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(
+            dir=directory or ".", prefix=".mlops-", suffix=".part"
+        )
+        self.file = os.fdopen(fd, "wb")
+        self.total = total
+        self.progress = progress
+        self.hasher, self.expected_digest = (
+            _parse_checksum(checksum) if checksum else (None, None)
+        )
+        self.head = b""
+        self.transferred = 0
+        self.started = time.monotonic()
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        if len(self.head) < 8:
+            self.head += chunk[: 8 - len(self.head)]
+        self.file.write(chunk)
+        if self.hasher is not None:
+            self.hasher.update(chunk)
+        self.transferred += len(chunk)
+        if self.progress is not None:
+            self.progress(
+                TransferProgress(
+                    self.transferred, self.total, time.monotonic() - self.started
+                )
+            )
+
+    def commit(
+        self, destination: str, suffix: Optional[Callable[[bytes], str]] = None
+    ) -> str:
+        self.file.close()
+        if self.total is not None and self.transferred != self.total:
+            raise DownloadError(
+                f"Download interrupted: got {self.transferred} of {self.total} bytes"
+            )
+        if self.hasher is not None and self.hasher.hexdigest() != self.expected_digest:
+            raise DownloadError(
+                f"Checksum mismatch: expected {self.expected_digest}, got {self.hasher.hexdigest()}"
+            )
+
+        if suffix is not None:
+            destination += suffix(self.head)
+        os.replace(self.temp_path, destination)
+
+        elapsed = time.monotonic() - self.started
+        speed = self.transferred / elapsed if elapsed > 0 else 0
+        logger.debug(
+            f"Downloaded {format_size(self.transferred)} in {elapsed:.1f}s ({format_size(speed)}/s)"
+        )
+        return destination
+
+    def abort(self) -> None:
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def _content_length(headers) -> Optional[int]:
+    """Size of the body, when it is informed and not changed by a content encoding"""
+    length = headers.get("Content-Length")
+    if length is None or headers.get("Content-Encoding"):
+        return None
+    return int(length)
+
+
+def stream_to_file(
+    response,
+    destination: str,
+    *,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    checksum: Optional[str] = None,
+    suffix: Optional[Callable[[bytes], str]] = None,
+) -> str:
+    """
+    Write the body of a streamed response to a file, one chunk at a time.
+
+    The body is written to a temporary file in the same folder, which is renamed to
+    `destination` only when the whole body was received, so memory use stays bounded
+    by `chunk_size` and a failed download never leaves a truncated file behind.
+
+    Parameters
+    ----------
+    response: requests.Response
+        Response of a request made with `stream=True`
+    destination: str
+        Path of the file
+    chunk_size: int, optional
+        Number of bytes read at a time. Default is 1 MB
+    progress: Optional[Callable[[TransferProgress], None]], optional
+        Function called after every chunk
+    checksum: Optional[str], optional
+        Expected digest of the body, like 'sha256:ab12...'. The algorithm prefix is optional and defaults to sha256
+    suffix: Optional[Callable[[bytes], str]], optional
+        Function that receives the first bytes of the body and returns an extension added to `destination`
+
+    Raises
+    ------
+    DownloadError
+        The body is incomplete or does not match `checksum`
+
+    Returns
+    -------
+    str
+        Path of the written file
+    """
+    sink = _DownloadSink(
+        os.path.dirname(destination),
+        total=_content_length(response.headers),
+        progress=progress,
+        checksum=checksum,
+    )
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            sink.write(chunk)
+        return sink.commit(destination, suffix)
+    finally:
+        sink.abort()
+        response.close()
+
+
+async def async_stream_to_file(
+    response,
+    destination: str,
+    *,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    checksum: Optional[str] = None,
+    suffix: Optional[Callable[[bytes], str]] = None,
+) -> str:
+    """
+    Asyncio version of `stream_to_file`, for `httpx.Response` objects sent with `stream=True`.
+
+    Parameters
+    ----------
+    response: httpx.Response
+        Streamed response
+    destination: str
+        Path of the file
+    chunk_size: int, optional
+        Number of bytes read at a time. Default is 1 MB
+    progress: Optional[Callable[[TransferProgress], None]], optional
+        Function called after every chunk
+    checksum: Optional[str], optional
+        Expected digest of the body, like 'sha256:ab12...'
+    suffix: Optional[Callable[[bytes], str]], optional
+        Function that receives the first bytes of the body and returns an extension added to `destination`
+
+    Raises
+    ------
+    DownloadError
+        The body is incomplete or does not match `checksum`
+
+    Returns
+    -------
+    str
+        Path of the written file
+    """
+    sink = _DownloadSink(
+        os.path.dirname(destination),
+        total=_content_length(response.headers),
+        progress=progress,
+        checksum=checksum,
+    )
+    try:
+        async for chunk in response.aiter_bytes(chunk_size):
+            sink.write(chunk)
+        return sink.commit(destination, suffix)
+    finally:
+        sink.abort()
+        await response.aclose()
+
+
+def _send_download(request: dict, byte_range: Optional[str] = None, if_range=None):
+    """
+    Send a download request built for `make_request`, asking only for `byte_range`.
+    Ranges are asked without a content encoding, since they count the bytes of the file.
+    Any status other than 200 and 206 is handled like `make_request` does.
+    """
+    request = dict(request)
+    transport = request.pop("transport", None) or get_default_transport()
+    headers = dict(request.pop("headers", None) or {})
+    if byte_range is not None:
+        headers["Range"] = f"bytes={byte_range}"
+        headers["Accept-Encoding"] = "identity"
+        if if_range:
+            headers["If-Range"] = if_range
+
+    response = transport.request(
+        request.pop("method", "GET"),
+        request.pop("url"),
+        headers=headers,
+        params=request.pop("params", None),
+        timeout=request.pop("timeout", 60),
+        token_manager=request.pop("token_manager", None),
+        stream=True,
+    )
+    if response.status_code not in (200, 206):
+        _check_response(
+            response,
+            request.get("success_code", 200),
+            request.get("custom_exception"),
+            request.get("custom_exception_message"),
+            request.get("specific_error_code"),
+            request.get("logger_msg"),
+        )
+    return response
+
+
+def _total_size(response) -> Optional[int]:
+    """Read the full size of the file from a `Content-Range: bytes 0-0/12345` header"""
+    content_range = response.headers.get("Content-Range", "")
+    _, _, total = content_range.rpartition("/")
+    return int(total) if total.isdigit() else None
+
+
+class _RangedState:
+    """
+    Byte ranges of a ranged download and how much of each one is already on disk.
+    It is saved next to the partial file, so an interrupted download can be resumed.
+    """
+
+    def __init__(self, path: str, size: int, validator: Optional[str], ranges):
+        self.path = path
+        self.size = size
+        self.validator = validator
+        self.ranges: List[List[int]] = ranges
+        self.lock = threading.Lock()
+        self.saved_at = 0.0
+
+    @classmethod
+    def load(cls, path: str) -> Optional["_RangedState"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(path, data["size"], data["validator"], data["ranges"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def create(cls, path: str, size: int, validator: Optional[str], parts: int):
+        parts = max(1, min(parts, math.ceil(size / MIN_RANGE_SIZE)))
+        length = math.ceil(size / parts)
+        ranges = [
+            [start, min(start + length, size) - 1, 0]
+            for start in range(0, size, length)
+        ]
+        return cls(path, size, validator, ranges)
+
+    @property
+    def transferred(self) -> int:
+        return sum(written for _, _, written in self.ranges)
+
+    def save(self, force: bool = False) -> None:
+        with self.lock:
+            if not force and time.monotonic() - self.saved_at < 1:
+                return
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "size": self.size,
+                        "validator": self.validator,
+                        "ranges": self.ranges,
+                    },
+                    f,
+                )
+            self.saved_at = time.monotonic()
+
+
+def _finish_file(
+    part_path: str,
+    destination: str,
+    checksum: Optional[str],
+    suffix: Optional[Callable[[bytes], str]],
+) -> str:
+    """Check a fully downloaded partial file and move it to its destination"""
+    with open(part_path, "rb") as f:
+        head = f.read(8)
+        if checksum:
+            hasher, expected = _parse_checksum(checksum)
+            f.seek(0)
+            for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                hasher.update(block)
+            if hasher.hexdigest() != expected:
+                raise DownloadError(
+                    f"Checksum mismatch: expected {expected}, got {hasher.hexdigest()}"
+                )
+    if suffix is not None:
+        destination += suffix(head)
+    os.replace(part_path, destination)
+    return destination
+
+
+def ranged_download(
+    request: dict,
+    destination: str,
+    *,
+    parts: int = 4,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    checksum: Optional[str] = None,
+    suffix: Optional[Callable[[bytes], str]] = None,
+) -> str:
+    """
+    Download a file with HTTP Range requests, fetching up to `parts` byte ranges in parallel.
+
+    The ranges are written to a preallocated `<destination>.part` file, and the progress of each
+    one is kept in `<destination>.part.json`. When a download is interrupted, calling this function
+    again only fetches the missing bytes, as long as the server still has the same file (checked
+    with its `ETag` or `Last-Modified` header). When the server does not support ranges, the file
+    is downloaded in a single stream, like `stream_to_file` does.
+
+    Parameters
+    ----------
+    request: dict
+        Arguments of the download request, as given to `make_request`
+    destination: str
+        Path of the file
+    parts: int, optional
+        Maximum number of ranges downloaded at the same time. Default is 4
+    chunk_size: int, optional
+        Number of bytes read at a time by each range. Default is 1 MB
+    progress: Optional[Callable[[TransferProgress], None]], optional
+        Function called after every chunk. It may be called from several threads
+    checksum: Optional[str], optional
+        Expected digest of the file, like 'sha256:ab12...'. It is checked once the whole file is on disk
+    suffix: Optional[Callable[[bytes], str]], optional
+        Function that receives the first bytes of the file and returns an extension added to `destination`
+
+    Raises
+    ------
+    DownloadError
+        The server stopped serving ranges in the middle of the download, or the file does not match `checksum`
+
+    Returns
+    -------
+    str
+        Path of the written file
+    """
+    part_path = destination + ".part"
+    state_path = part_path + ".json"
+    state = _RangedState.load(state_path) if os.path.exists(part_path) else None
+
+    probe = _send_download(
+        request, "0-0", if_range=state.validator if state is not None else None
+    )
+    size = _total_size(probe) if probe.status_code == 206 else None
+    if size is None:
+        logger.debug("Server does not support ranges. Downloading in a single stream")
+        for stale in (part_path, state_path):
+            if os.path.exists(stale):
+                os.remove(stale)
+        return stream_to_file(
+            probe,
+            destination,
+            chunk_size=chunk_size,
+            progress=progress,
+            checksum=checksum,
+            suffix=suffix,
+        )
+    probe.close()
+
+    validator = probe.headers.get("ETag") or probe.headers.get("Last-Modified")
+    if state is None or state.size != size or state.validator != validator:
+        state = _RangedState.create(state_path, size, validator, parts)
+        with open(part_path, "wb") as f:
+            f.truncate(size)
+    elif state.transferred:
+        logger.info(f"Resuming download of {destination} from byte {state.transferred}")
+    state.save(force=True)
+
+    started = time.monotonic()
+    resumed_from = state.transferred
+
+    def fetch(byte_range: List[int]) -> None:
+        start, end, _ = byte_range
+        if start + byte_range[2] > end:
+            return
+        response = _send_download(
+            request, f"{start + byte_range[2]}-{end}", if_range=validator
+        )
+        try:
+            if response.status_code != 206:
+                raise DownloadError("The server stopped serving byte ranges")
+            with open(part_path, "r+b") as f:
+                f.seek(start + byte_range[2])
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    with state.lock:
+                        byte_range[2] += len(chunk)
+                    state.save()
+                    if progress is not None:
+                        progress(
+                            TransferProgress(
+                                state.transferred - resumed_from,
+                                size - resumed_from,
+                                time.monotonic() - started,
+                            )
+                        )
+        finally:
+            response.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(state.ranges)) as pool:
+            list(pool.map(fetch, state.ranges))
+    finally:
+        state.save(force=True)
+
+    if state.transferred != size:
+        raise DownloadError(
+            f"Download interrupted: got {state.transferred} of {size} bytes"
+        )
+
+    try:
+        destination = _finish_file(part_path, destination, checksum, suffix)
+    finally:
+        for leftover in (part_path, state_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    elapsed = time.monotonic() - started
+    speed = (size - resumed_from) / elapsed if elapsed > 0 else 0
+    logger.debug(
+        f"Downloaded {format_size(size - resumed_from)} in {elapsed:.1f}s ({format_size(speed)}/s) using {len(state.ranges)} ranges"
+    )
+    return destination
+
+
+UPLOAD_PART_SIZE = 16 * 1024 * 1024
+_CHUNKED_UNSUPPORTED = (404, 405, 501)
+
+
+class _PartBody:
+    """
+    Slice of a file sent as the body of a part upload. It is read in blocks while the
+    request is sent, and hashed on the way so the file is not read twice.
+    """
+
+    def __init__(self, file_obj, start: int, length: int, meter, lock) -> None:
+        file_obj.seek(start)
+        self.part = _Part(file_obj, length)
+        self.len = length
+        self.meter = meter
+        self.lock = lock
+        self.sent = 0
+        self.sha256 = hashlib.sha256()
+
+    def __len__(self) -> int:
+        return self.len
+
+    def __iter__(self):
+        return iter(lambda: self.read(STREAM_BLOCK_SIZE), b"")
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.part.read(self.part.remaining if size is None or size < 0 else size)
+        self.sha256.update(chunk)
+        self.sent += len(chunk)
+        with self.lock:
+            self.meter.add(len(chunk))
+        return chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Rewind the part, so it can be sent again. Only `seek(0)` is supported"""
+        if offset != 0 or whence != os.SEEK_SET:
+            raise OSError("A part can only be rewound to its beginning")
+        self.part.rewind()
+        self.sha256 = hashlib.sha256()
+        with self.lock:
+            self.meter.add(-self.sent)
+        self.sent = 0
+        return 0
+
+
+class _UploadState:
+    """
+    Upload id and digests of the parts already accepted by the server. It is kept in
+    the temporary directory, keyed by the upload URL and the file, so calling
+    `chunked_upload` again after a failure only sends the missing parts.
+    """
+
+    def __init__(self, path: str, upload_id: Optional[str] = None, digests=None):
+        self.path = path
+        self.upload_id = upload_id
+        self.digests = digests or {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, url: str, file_path: str, part_size: int) -> "_UploadState":
+        stat = os.stat(file_path)
+        key = hashlib.sha1(
+            f"{url}|{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{part_size}".encode()
+        ).hexdigest()
+        path = os.path.join(tempfile.gettempdir(), "mlops_codex_uploads", f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(path, data["upload_id"], data["digests"])
+        except (OSError, ValueError, KeyError):
+            return cls(path)
+
+    def save(self) -> None:
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"upload_id": self.upload_id, "digests": self.digests}, f)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _send_upload(request: dict, method: str, url: str, success_codes, **kwargs):
+    """
+    Send one request of the chunked protocol with the headers and credentials of the
+    upload request. Any status outside `success_codes` is handled like `make_request` does.
+    """
+    transport = request.get("transport") or get_default_transport()
+    response = transport.request(
+        method,
+        url,
+        headers={**(request.get("headers") or {}), **kwargs.pop("headers", {})},
+        timeout=request.get("timeout", 60),
+        token_manager=request.get("token_manager"),
+        **kwargs,
+    )
+    if response.status_code not in success_codes:
+        _check_response(
+            response,
+            success_codes[0],
+            request.get("custom_exception"),
+            request.get("custom_exception_message"),
+            request.get("specific_error_code"),
+            request.get("logger_msg"),
+        )
+    return response
+
+
+def chunked_upload(
+    request: dict,
+    field: str,
+    path: str,
+    *,
+    filename: Optional[str] = None,
+    part_size: int = UPLOAD_PART_SIZE,
+    workers: int = 4,
+    retries: int = 3,
+    progress: Optional[ProgressCallback] = None,
+):
+    """
+    Upload a file in fixed-size parts, sending up to `workers` parts at the same time.
+
+    The protocol uses the URL of the single-request upload, `<url>` below:
+
+    1. `POST <url>/chunks` with a JSON body holding `Field`, `FileName`, `Size`, `PartSize`,
+       `Parts` and the form fields of the request in `Fields`. Answers 201 with an `UploadId`.
+    2. `PUT <url>/chunks/<UploadId>/<n>` with the bytes of part `n` (starting at 1) and a
+       `Content-Range` header. Parts that fail with a connection error or a transient status
+       are sent again, up to `retries` times, as told by `RetryPolicy`.
+    3. `POST <url>/chunks/<UploadId>/complete` with the SHA-256 of every part, as
+       `{"Parts": [{"Part": 1, "Sha256": "..."}]}`. The server answers it like it answers the
+       single-request upload.
+
+    When the upload fails, calling this function again asks the server which parts it already
+    has (`GET <url>/chunks/<UploadId>`, answering `{"Parts": [1, 2]}`) and only sends the others.
+    When the server does not know the `/chunks` endpoint (404, 405 or 501), the file is sent in
+    a single request, like `make_request` does.
+
+    Parameters
+    ----------
+    request: dict
+        Arguments of the single-request upload, as given to `make_request`, without `files`
+    field: str
+        Name of the form field that holds the file
+    path: str
+        Path of the file
+    filename: Optional[str], optional
+        Name of the file sent to the server. Default is the name of `path`
+    part_size: int, optional
+        Size of each part in bytes. Default is 16 MB
+    workers: int, optional
+        Maximum number of parts sent at the same time. Default is 4
+    retries: int, optional
+        Number of times a part is sent again after a transient failure. Default is 3
+    progress: Optional[Callable[[TransferProgress], None]], optional
+        Function called while the parts are sent, with the bytes sent and the throughput
+
+    Returns
+    -------
+    requests.Response
+        Response of the request that completes the upload
+    """
+    filename = filename or os.path.basename(path)
+    size = os.path.getsize(path)
+    parts = max(1, math.ceil(size / part_size))
+    url = request["url"].rstrip("/") + "/chunks"
+    state = _UploadState.load(url, path, part_size)
+
+    received = set()
+    if state.upload_id is not None:
+        response = _send_upload(
+            request, "GET", f"{url}/{state.upload_id}", (200, 404)
+        )
+        if response.status_code == 200:
+            received = {int(n) for n in response.json().get("Parts", [])}
+            received &= {int(n) for n in state.digests}
+            logger.info(
+                f"Resuming upload of {filename}: {len(received)} of {parts} parts already sent"
+            )
+        else:
+            state = _UploadState(state.path)
+
+    if state.upload_id is None:
+        response = _send_upload(
+            request,
+            "POST",
+            url,
+            (201, 200) + _CHUNKED_UNSUPPORTED,
+            json={
+                "Field": field,
+                "FileName": filename,
+                "Size": size,
+                "PartSize": part_size,
+                "Parts": parts,
+                "Fields": request.get("data") or {},
+            },
+        )
+        if response.status_code in _CHUNKED_UNSUPPORTED:
+            logger.debug("Server does not support chunked uploads. Sending a single request")
+            with open(path, "rb") as f:
+                return make_request(
+                    **request,
+                    files=[(field, (filename, f))],
+                    progress=progress,
+                )
+        state.upload_id = str(response.json()["UploadId"])
+        state.digests = {}
+        state.save()
+
+    upload_url = f"{url}/{state.upload_id}"
+    missing = [n for n in range(1, parts + 1) if n not in received]
+    meter = ProgressMeter(size, progress)
+    lock = threading.Lock()
+    part_retry = RetryPolicy(max_attempts=retries + 1, max_backoff=8)
+    meter.add(sum(min(part_size, size - (n - 1) * part_size) for n in received))
+
+    def send_part(number: int) -> None:
+        start = (number - 1) * part_size
+        length = min(part_size, size - start)
+        with open(path, "rb") as f:
+            body = _PartBody(f, start, length, meter, lock)
+            _send_upload(
+                request,
+                "PUT",
+                f"{upload_url}/{number}",
+                (200, 201, 204),
+                data=body,
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "Content-Range": f"bytes {start}-{start + length - 1}/{size}",
+                },
+                retry=part_retry,
+            ).close()
+        state.digests[str(number)] = body.sha256.hexdigest()
+        state.save()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as pool:
+        list(pool.map(send_part, missing))
+
+    response = _send_upload(
+        request,
+        "POST",
+        f"{upload_url}/complete",
+        (request.get("success_code", 200),),
+        json={
+            "Parts": [
+                {"Part": n, "Sha256": state.digests[str(n)]}
+                for n in range(1, parts + 1)
+            ]
+        },
+    )
+    state.clear()
+    logger.debug(f"Uploaded {filename} in {parts} parts: {meter.summary()}")
+    return response
@@ -0,0 +1,379 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional
+
+from mlops_codex.logger_config import get_logger
+from mlops_codex.shared import json_codec
+from mlops_codex.shared.upload_index import file_digest, stream_digest
+from mlops_codex.shared.utils import LazySingleton
+
+logger = get_logger()
+
+ASYNC_MODEL = "AsyncModel"
+PREPROCESSING = "Preprocessing"
+TRAINING = "Training"
+
+FINISHED_STATES = ("Succeeded", "Failed")
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """
+    Latest state of a journaled execution.
+
+    Parameters
+    ----------
+    kind: str
+        "AsyncModel", "Preprocessing" or "Training"
+    parent_hash: str
+        Hash of the model, preprocessing script or training experiment that runs the execution
+    group: str
+        Group of the execution
+    execution_id: str
+        Execution id given by the server
+    input_digest: Optional[str]
+        Digest of the inputs, or None when they could not be digested
+    state: str
+        Last state seen, "Requested" right after the submission
+    submitted_at: float
+        Time of the submission, in seconds since the epoch
+    updated_at: float
+        Time the state was last recorded, in seconds since the epoch
+    """
+
+    kind: str
+    parent_hash: str
+    group: str
+    execution_id: str
+    input_digest: Optional[str]
+    state: str
+    submitted_at: float
+    updated_at: float
+
+    @property
+    def finished(self) -> bool:
+        """Tell if the execution succeeded or failed"""
+        return self.state in FINISHED_STATES
+
+
+class ExecutionJournal:
+    """
+    Append-only journal of the executions submitted by this machine, so a process that restarts can
+    re-attach to the executions still running and skip the inputs that already succeeded.
+
+    Every submission and every change of state adds a row to a SQLite file, which can be shared by
+    several processes of the same machine. The latest row of an execution tells its state.
+
+    Parameters
+    ----------
+    path: Optional[str], optional
+        Path of the database. Default is `~/.cache/mlops_codex/executions.sqlite3`
+    skip_succeeded: bool, optional
+        Submitting inputs that already have a succeeded or running execution re-attaches to that execution
+        instead of starting a new one. Default is True
+    """
+
+    def __init__(self, path: Optional[str] = None, skip_succeeded: bool = True):
+        self.path = path or os.path.join(
+            os.path.expanduser("~"), ".cache", "mlops_codex", "executions.sqlite3"
+        )
+        self.skip_succeeded = skip_succeeded
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT, parent_hash TEXT, grp TEXT, "
+            "execution_id TEXT, input_digest TEXT, state TEXT, recorded_at REAL)"
+        )
+        self.__db.execute(
+            "CREATE INDEX IF NOT EXISTS journal_execution "
+            "ON journal (kind, parent_hash, execution_id)"
+        )
+
+    def record_submission(
+        self,
+        kind: str,
+        parent_hash: str,
+        group: str,
+        execution_id: Any,
+        input_digest: Optional[str] = None,
+    ) -> None:
+        """
+        Add a submitted execution, in the "Requested" state
+
+        Parameters
+        ----------
+        kind: str
+            "AsyncModel", "Preprocessing" or "Training"
+        parent_hash: str
+            Hash of the model, preprocessing script or training experiment
+        group: str
+            Group of the execution
+        execution_id: Any
+            Execution id given by the server
+        input_digest: Optional[str], optional
+            Digest of the inputs, as given by `input_digest`
+        """
+        with self.__lock:
+            self.__db.execute(
+                "INSERT INTO journal (kind, parent_hash, grp, execution_id, input_digest, state, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, parent_hash, group, str(execution_id), input_digest, "Requested", time.time()),
+            )
+
+    def record_state(self, kind: str, parent_hash: str, execution_id: Any, state: str) -> None:
+        """
+        Add the state of a journaled execution, when it changed. Executions that were not submitted
+        through the journal are ignored
+
+        Parameters
+        ----------
+        kind: str
+            "AsyncModel", "Preprocessing" or "Training"
+        parent_hash: str
+            Hash of the model, preprocessing script or training experiment
+        execution_id: Any
+            Execution id given by the server
+        state: str
+            State of the execution
+        """
+        state = getattr(state, "name", state)
+        with self.__lock:
+            self.__db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.__db.execute(
+                    "SELECT grp, input_digest, state FROM journal "
+                    "WHERE kind = ? AND parent_hash = ? AND execution_id = ? ORDER BY id DESC LIMIT 1",
+                    (kind, parent_hash, str(execution_id)),
+                ).fetchone()
+                if row is not None and row[2] != state:
+                    self.__db.execute(
+                        "INSERT INTO journal (kind, parent_hash, grp, execution_id, input_digest, state, recorded_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (kind, parent_hash, row[0], str(execution_id), row[1], state, time.time()),
+                    )
+                self.__db.execute("COMMIT")
+            except BaseException:
+                self.__db.execute("ROLLBACK")
+                raise
+
+    def entries(
+        self,
+        *,
+        kind: Optional[str] = None,
+        parent_hash: Optional[str] = None,
+        group: Optional[str] = None,
+        states: Optional[Iterable[str]] = None,
+    ) -> List[JournalEntry]:
+        """
+        Latest state of the journaled executions, in the order they were submitted
+
+        Parameters
+        ----------
+        kind: Optional[str], optional
+            Only the executions of this kind
+        parent_hash: Optional[str], optional
+            Only the executions of this model, preprocessing script or training experiment
+        group: Optional[str], optional
+            Only the executions of this group
+        states: Optional[Iterable[str]], optional
+            Only the executions in one of these states
+
+        Returns
+        -------
+        List[JournalEntry]
+            The executions
+        """
+        filters, params = [], []
+        for column, value in (("kind", kind), ("parent_hash", parent_hash), ("grp", group)):
+            if value is not None:
+                filters.append(f"j.{column} = ?")
+                params.append(value)
+        if states is not None:
+            states = [getattr(state, "name", state) for state in states]
+            filters.append(f"j.state IN ({', '.join('?' * len(states))})")
+            params.extend(states)
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT j.kind, j.parent_hash, j.grp, j.execution_id, j.input_digest, j.state, "
+                "last.submitted_at, j.recorded_at FROM journal j JOIN ("
+                "SELECT MAX(id) AS id, MIN(recorded_at) AS submitted_at FROM journal "
+                "GROUP BY kind, parent_hash, execution_id) last ON j.id = last.id "
+                f"{where} ORDER BY last.submitted_at",
+                params,
+            ).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def pending(self, **filters) -> List[JournalEntry]:
+        """
+        Journaled executions that did not finish yet, with the same filters as `entries`
+
+        Returns
+        -------
+        List[JournalEntry]
+            The executions
+        """
+        return [entry for entry in self.entries(**filters) if not entry.finished]
+
+    def find(
+        self, kind: str, parent_hash: str, group: str, input_digest: Optional[str]
+    ) -> Optional[JournalEntry]:
+        """
+        Latest execution of the same inputs that did not fail, or None
+
+        Parameters
+        ----------
+        kind: str
+            "AsyncModel", "Preprocessing" or "Training"
+        parent_hash: str
+            Hash of the model, preprocessing script or training experiment
+        group: str
+            Group of the execution
+        input_digest: Optional[str]
+            Digest of the inputs
+
+        Returns
+        -------
+        Optional[JournalEntry]
+            The execution
+        """
+        if input_digest is None:
+            return None
+        found = [
+            entry
+            for entry in self.entries(kind=kind, parent_hash=parent_hash, group=group)
+            if entry.input_digest == input_digest and entry.state != "Failed"
+        ]
+        return found[-1] if found else None
+
+    def clear(self) -> None:
+        """Remove every execution of the journal"""
+        with self.__lock:
+            self.__db.execute("DELETE FROM journal")
+
+
+def input_digest(*inputs: Any) -> Optional[str]:
+    """
+    Digest of the inputs of an execution. Paths of files and open binary files are digested by
+    their content, and other values by their JSON, so the same inputs give the same digest in
+    another process
+
+    Parameters
+    ----------
+    inputs: Any
+        Files and values given to the execution
+
+    Returns
+    -------
+    Optional[str]
+        Hex digest, or None when an input can't be digested, like a DataFrame
+    """
+    sha256 = hashlib.sha256()
+    try:
+        for value in inputs:
+            if isinstance(value, str) and os.path.isfile(value):
+                sha256.update(b"file:" + file_digest(value).encode())
+            elif hasattr(value, "read") and hasattr(value, "seek"):
+                sha256.update(b"file:" + stream_digest(value).encode())
+            else:
+                sha256.update(json_codec.dumps(value, sort_keys=True))
+            sha256.update(b"\0")
+    except (OSError, TypeError, ValueError):
+        return None
+    return sha256.hexdigest()
+
+
+def _journal_from_env() -> Optional[ExecutionJournal]:
+    """Journal set by the env variable MLOPS_EXECUTION_JOURNAL, if any"""
+    path = os.getenv("MLOPS_EXECUTION_JOURNAL", "")
+    if path.lower() in ("", "0", "false", "no"):
+        return None
+    return ExecutionJournal(None if path.lower() in ("1", "true", "yes") else path)
+
+
+_journal: LazySingleton[Optional[ExecutionJournal]] = LazySingleton(_journal_from_env)
+
+
+def get_execution_journal() -> Optional[ExecutionJournal]:
+    """
+    Journal used by the SDK. It is None unless it was set with `set_execution_journal` or the env
+    variable MLOPS_EXECUTION_JOURNAL, which holds the path of the journal or 'true' for the default path
+
+    Returns
+    -------
+    Optional[ExecutionJournal]
+        The journal
+    """
+    return _journal.get()
+
+
+def set_execution_journal(journal: Optional[ExecutionJournal]) -> None:
+    """
+    Replace the journal used by the SDK
+
+    Parameters
+    ----------
+    journal: Optional[ExecutionJournal]
+        Journal used from now on. None stops journaling the executions
+    """
+    _journal.set(journal)
+
+
+def record_submission(
+    kind: str,
+    parent_hash: str,
+    group: str,
+    execution_id: Any,
+    digest: Optional[str] = None,
+) -> None:
+    """Journal a submitted execution, when the journal is enabled. Never fails the submission"""
+    try:
+        journal = get_execution_journal()
+        if journal is not None:
+            journal.record_submission(kind, parent_hash, group, execution_id, digest)
+    except (OSError, sqlite3.Error) as error:
+        logger.warning(f"Could not journal execution {execution_id}: {error}")
+
+
+def record_state(kind: str, parent_hash: str, execution_id: Any, state: Any) -> None:
+    """Journal the state of an execution, when the journal is enabled"""
+    try:
+        journal = get_execution_journal()
+        if journal is not None:
+            journal.record_state(kind, parent_hash, execution_id, state)
+    except (OSError, sqlite3.Error) as error:
+        logger.debug(f"Could not journal the state of execution {execution_id}: {error}")
+
+
+def find_submission(
+    kind: str, parent_hash: str, group: str, digest: Optional[str]
+) -> Optional[JournalEntry]:
+    """Execution of the same inputs that did not fail, when the journal skips them"""
+    try:
+        journal = get_execution_journal()
+        if journal is None or not journal.skip_succeeded:
+            return None
+        return journal.find(kind, parent_hash, group, digest)
+    except (OSError, sqlite3.Error) as error:
+        logger.debug(f"Execution journal is not available: {error}")
+        return None
+
+
+def journaled_inputs(*inputs: Any) -> Optional[str]:
+    """Digest of the inputs of an execution, only computed when the journal is enabled"""
+    try:
+        if get_execution_journal() is None:
+            return None
+    except (OSError, sqlite3.Error) as error:
+        logger.warning(f"Execution journal is not available: {error}")
+        return None
+    return input_digest(*inputs)
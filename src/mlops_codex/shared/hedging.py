@@ -0,0 +1,171 @@
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Generic, TypeVar
+
+from mlops_codex.logger_config import get_logger
+from mlops_codex.shared.latency import LatencyHistogram
+
+logger = get_logger()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class HedgeMetrics:
+    """
+    Counters of a `Hedger`, over its recent calls.
+
+    Parameters
+    ----------
+    calls: int
+        Calls in the window
+    hedged: int
+        Calls of the window that sent a second request
+    hedge_wins: int
+        Hedged calls answered by the second request, since the hedger was created
+    """
+
+    calls: int
+    hedged: int
+    hedge_wins: int
+
+    @property
+    def hedge_rate(self) -> float:
+        """Fraction of the calls that sent a second request"""
+        return self.hedged / self.calls if self.calls else 0.0
+
+
+class Hedger(Generic[T, R]):
+    """
+    Sends a second copy of a request when the first one is slower than most recent requests, and
+    keeps whichever answers first.
+
+    The second request is sent once the first has taken longer than the `percentile` of the
+    latencies in `latency`. Nothing is hedged until `min_samples` latencies were recorded, and at
+    most a `max_hedge_rate` fraction of the last `window` calls are hedged, so hedging cannot double
+    the load on the server. The request that loses the race is cancelled when it has not started
+    yet, and its answer is discarded otherwise.
+
+    Parameters
+    ----------
+    send: Callable[[T], R]
+        Function that sends a request and returns its result. It may return an exception instead
+        of raising it, and is expected to record its latency in `latency`
+    latency: LatencyHistogram
+        Recent latencies of the requests
+    percentile: float, optional
+        Percentile of the recent latencies after which a request is hedged. Default is 95
+    max_hedge_rate: float, optional
+        Maximum fraction of the calls that are hedged. Default is 0.05
+    min_samples: int, optional
+        Latencies needed before hedging starts. Default is 20
+    window: int, optional
+        Number of recent calls considered by `max_hedge_rate`. Default is 1000
+    max_workers: int, optional
+        Maximum number of requests in flight. Default is 64
+    """
+
+    def __init__(
+        self,
+        send: Callable[[T], R],
+        latency: LatencyHistogram,
+        *,
+        percentile: float = 95,
+        max_hedge_rate: float = 0.05,
+        min_samples: int = 20,
+        window: int = 1000,
+        max_workers: int = 64,
+    ) -> None:
+        self.send = send
+        self.latency = latency
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self.__pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mlops-codex-hedge"
+        )
+        self.__calls: Deque[bool] = deque(maxlen=window)
+        self.__wins = 0
+        self.__lock = threading.Lock()
+
+    def __record(self, hedged: bool) -> None:
+        with self.__lock:
+            self.__calls.append(hedged)
+
+    def __reserve_hedge(self) -> bool:
+        """Count a call, and tell if it may be hedged without going over the hedge rate"""
+        with self.__lock:
+            hedged = sum(self.__calls)
+            allowed = hedged + 1 <= self.max_hedge_rate * (len(self.__calls) + 1)
+            self.__calls.append(allowed)
+            return allowed
+
+    def __call__(self, item: T) -> R:
+        """
+        Send a request, hedging it when it is slow
+
+        Parameters
+        ----------
+        item: T
+            Argument given to `send`
+
+        Returns
+        -------
+        R
+            Result of the first request to answer without an error, or the error of the first one
+        """
+        delay = (
+            self.latency.percentile(self.percentile)
+            if len(self.latency) >= self.min_samples
+            else None
+        )
+        first = self.__pool.submit(self.send, item)
+        if delay is None:
+            self.__record(False)
+            return first.result()
+
+        done, _ = wait([first], timeout=delay)
+        if done:
+            self.__record(False)
+            return first.result()
+        if not self.__reserve_hedge():
+            return first.result()
+
+        logger.debug(f"No answer after {delay * 1000:.0f}ms. Sending a hedged request")
+        second = self.__pool.submit(self.send, item)
+        done, pending = wait([first, second], return_when=FIRST_COMPLETED)
+        winner = first if first in done else second
+        result = winner.result()
+        if isinstance(result, BaseException):
+            other = second if winner is first else first
+            other_result = other.result()
+            if not isinstance(other_result, BaseException):
+                winner, result = other, other_result
+        else:
+            for future in pending:
+                future.cancel()
+        if winner is second:
+            with self.__lock:
+                self.__wins += 1
+        return result
+
+    def metrics(self) -> HedgeMetrics:
+        """
+        Take a snapshot of the hedging counters
+
+        Returns
+        -------
+        HedgeMetrics
+            Calls, hedged calls and hedges that answered first
+        """
+        with self.__lock:
+            return HedgeMetrics(
+                calls=len(self.__calls), hedged=sum(self.__calls), hedge_wins=self.__wins
+            )
+
+    def close(self) -> None:
+        """Wait for the requests in flight and stop the worker threads"""
+        self.__pool.shutdown(wait=True)
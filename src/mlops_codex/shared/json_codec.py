@@ -0,0 +1,165 @@
+import json
+import uuid
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Any, Union
+
+from lazy_imports import try_import
+
+from mlops_codex.shared.utils import LazySingleton
+
+with try_import() as _orjson_import:
+    import orjson
+
+JSONInput = Union[bytes, bytearray, memoryview, str]
+
+
+def _convert(obj: Any, decimal) -> Any:
+    """
+    Turn a value the encoders don't know into one they do, without importing NumPy or pandas:
+    arrays and scalars are recognized by `tolist`, timestamps by `isoformat`
+    """
+    if isinstance(obj, Decimal):
+        return decimal(obj) if obj.is_finite() else None
+    if hasattr(obj, "isoformat"):
+        text = obj.isoformat()
+        return None if text == "NaT" else text
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONCodec(ABC):
+    """
+    Encodes values to JSON and decodes them back. Every JSON body sent or read by the SDK goes
+    through the codec returned by `get_json_codec`. Subclasses implement the encoding.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def dumps(self, obj: Any, *, sort_keys: bool = False) -> bytes:
+        """Encode a value to UTF-8 JSON"""
+
+    @abstractmethod
+    def loads(self, data: JSONInput) -> Any:
+        """Decode a JSON document"""
+
+
+class StdlibJSONCodec(JSONCodec):
+    """
+    Codec built on the `json` module of the standard library. NumPy values are converted to
+    lists and numbers, timestamps to ISO 8601 strings and decimals to floats.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any, *, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            obj,
+            sort_keys=sort_keys,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=lambda value: _convert(value, float),
+        ).encode("utf-8")
+
+    def loads(self, data: JSONInput) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec built on `orjson`. NumPy arrays and scalars, datetimes and UUIDs are encoded
+    natively, and decimals are written with their exact digits.
+    Requires the optional `orjson` dependency (`pip install datarisk-mlops-codex[fast-json]`).
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        _orjson_import.check()
+        self.__options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    @staticmethod
+    def __default(obj: Any) -> Any:
+        return _convert(obj, lambda value: orjson.Fragment(str(value)))
+
+    def dumps(self, obj: Any, *, sort_keys: bool = False) -> bytes:
+        options = self.__options | orjson.OPT_SORT_KEYS if sort_keys else self.__options
+        return orjson.dumps(obj, default=self.__default, option=options)
+
+    def loads(self, data: JSONInput) -> Any:
+        return orjson.loads(data)
+
+
+_codec: LazySingleton[JSONCodec] = LazySingleton(
+    lambda: OrjsonCodec() if _orjson_import.is_successful() else StdlibJSONCodec()
+)
+
+
+def get_json_codec() -> JSONCodec:
+    """
+    Codec used by the SDK. It is an `OrjsonCodec` when `orjson` is installed, and a
+    `StdlibJSONCodec` otherwise
+
+    Returns
+    -------
+    JSONCodec
+        The codec
+    """
+    return _codec.get()
+
+
+def set_json_codec(codec: JSONCodec) -> None:
+    """
+    Replace the codec used by the SDK
+
+    Parameters
+    ----------
+    codec: JSONCodec
+        Codec used to encode and decode every JSON body from now on
+    """
+    _codec.set(codec)
+
+
+def dumps(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """
+    Encode a value to UTF-8 JSON with the codec of the SDK
+
+    Parameters
+    ----------
+    obj: Any
+        Value to encode. NumPy arrays and scalars, pandas timestamps, datetimes and decimals
+        are accepted
+    sort_keys: bool, optional
+        Sort the keys of the objects, to get the same document for equal values
+
+    Returns
+    -------
+    bytes
+        The JSON document
+    """
+    return _codec.get().dumps(obj, sort_keys=sort_keys)
+
+
+def loads(data: JSONInput) -> Any:
+    """
+    Decode a JSON document with the codec of the SDK
+
+    Parameters
+    ----------
+    data: Union[bytes, bytearray, memoryview, str]
+        The JSON document
+
+    Returns
+    -------
+    Any
+        The decoded value
+    """
+    return _codec.get().loads(data)
@@ -0,0 +1,138 @@
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Iterable, List, Optional
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    """
+    Latency percentiles of a group of calls, in seconds.
+
+    Parameters
+    ----------
+    count: int
+        Number of calls
+    mean: float
+        Average latency
+    p50: float
+        Median latency
+    p90: float
+        90th percentile
+    p95: float
+        95th percentile
+    p99: float
+        99th percentile
+    max: float
+        Slowest call
+    """
+
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    max: float
+
+    def __str__(self) -> str:
+        return (
+            f"p50={self.p50 * 1000:.0f}ms p90={self.p90 * 1000:.0f}ms "
+            f"p95={self.p95 * 1000:.0f}ms p99={self.p99 * 1000:.0f}ms "
+            f"max={self.max * 1000:.0f}ms"
+        )
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Percentile `q` (0 to 100) of sorted values, interpolating between the closest ones"""
+    position = (len(ordered) - 1) * q / 100
+    low, high = math.floor(position), math.ceil(position)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(latencies: Iterable[float]) -> Optional[LatencySummary]:
+    """
+    Compute the percentiles of a group of latencies
+
+    Parameters
+    ----------
+    latencies: Iterable[float]
+        Latencies in seconds
+
+    Returns
+    -------
+    Optional[LatencySummary]
+        The percentiles, or None when there are no latencies
+    """
+    ordered = sorted(latencies)
+    if not ordered:
+        return None
+    return LatencySummary(
+        count=len(ordered),
+        mean=sum(ordered) / len(ordered),
+        p50=_percentile(ordered, 50),
+        p90=_percentile(ordered, 90),
+        p95=_percentile(ordered, 95),
+        p99=_percentile(ordered, 99),
+        max=ordered[-1],
+    )
+
+
+class LatencyHistogram:
+    """
+    Thread-safe record of the latencies of the most recent calls.
+
+    Parameters
+    ----------
+    size: int, optional
+        Number of recent latencies kept. Default is 1024
+    """
+
+    def __init__(self, size: int = 1024) -> None:
+        self.__values: Deque[float] = deque(maxlen=size)
+        self.__ordered: Optional[List[float]] = None
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def record(self, seconds: float) -> None:
+        """Add the latency of a call"""
+        with self.__lock:
+            self.__values.append(seconds)
+            self.__ordered = None
+
+    def __sorted(self) -> List[float]:
+        with self.__lock:
+            if self.__ordered is None:
+                self.__ordered = sorted(self.__values)
+            return self.__ordered
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Percentile of the recent latencies
+
+        Parameters
+        ----------
+        q: float
+            Percentile, from 0 to 100
+
+        Returns
+        -------
+        Optional[float]
+            Latency in seconds, or None when nothing was recorded yet
+        """
+        ordered = self.__sorted()
+        return _percentile(ordered, q) if ordered else None
+
+    def summary(self) -> Optional[LatencySummary]:
+        """
+        Percentiles of the recent latencies
+
+        Returns
+        -------
+        Optional[LatencySummary]
+            The percentiles, or None when nothing was recorded yet
+        """
+        return summarize(self.__sorted())
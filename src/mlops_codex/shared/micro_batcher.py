@@ -0,0 +1,148 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from mlops_codex.logger_config import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_STOP = object()
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects items submitted from many threads and hands them to `dispatch` in batches.
+
+    A batch is sent as soon as it has `max_batch` items, or `max_wait` seconds after its first item
+    arrived, whichever comes first. Up to `max_in_flight` batches are dispatched at the same time,
+    so a slow batch does not hold the next ones back.
+
+    Parameters
+    ----------
+    dispatch: Callable[[List[T]], Sequence[Union[R, BaseException]]]
+        Function that processes a batch and returns one result per item, in the same order. An
+        exception in the results is raised to the caller of that item only. When `dispatch`
+        itself raises, every item of the batch gets the error
+    max_wait: float, optional
+        Seconds a batch waits for more items. Default is 0.005
+    max_batch: int, optional
+        Maximum number of items in a batch. Default is 32
+    max_in_flight: int, optional
+        Maximum number of batches dispatched at the same time. Default is 4
+    name: str, optional
+        Name of the thread that collects the items
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[List[T]], Sequence[Any]],
+        *,
+        max_wait: float = 0.005,
+        max_batch: int = 32,
+        max_in_flight: int = 4,
+        name: str = "mlops-codex-batcher",
+    ) -> None:
+        self.dispatch = dispatch
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.name = name
+        self.__queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.__pool = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix=f"{name}-dispatch"
+        )
+        self.__lock = threading.Lock()
+        self.__thread: Optional[threading.Thread] = None
+        self.__closed = False
+
+    def submit(self, item: T) -> "Future[R]":
+        """
+        Add an item to the next batch
+
+        Parameters
+        ----------
+        item: T
+            Item to process
+
+        Raises
+        ------
+        RuntimeError
+            When the batcher was closed
+
+        Returns
+        -------
+        Future[R]
+            Future resolved with the result of the item
+        """
+        future: "Future[R]" = Future()
+        with self.__lock:
+            if self.__closed:
+                raise RuntimeError("The batcher was closed")
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self.__collect, name=self.name, daemon=True
+                )
+                self.__thread.start()
+            self.__queue.put((item, future))
+        return future
+
+    def __call__(self, item: T) -> R:
+        """Submit an item and wait for its result"""
+        return self.submit(item).result()
+
+    def close(self) -> None:
+        """Dispatch the items already submitted and stop the batcher"""
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            thread = self.__thread
+            self.__queue.put(_STOP)
+        if thread is not None:
+            thread.join()
+        self.__pool.shutdown(wait=True)
+
+    def __collect(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self.__queue.get()
+            if first is _STOP:
+                return
+            batch: List[Tuple[T, Future]] = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self.__queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self.__pool.submit(self.__dispatch, batch)
+
+    def __dispatch(self, batch: List[Tuple[T, Future]]) -> None:
+        futures = [future for _, future in batch]
+        try:
+            results = self.dispatch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"The batch returned {len(results)} results for {len(batch)} items"
+                )
+        except BaseException as e:
+            logger.debug(f"Batch of {len(batch)} items failed: {e}")
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,183 @@
+import io
+import os
+import tempfile
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from requests.utils import guess_filename
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+
+from mlops_codex.logger_config import get_logger
+from mlops_codex.shared.progress import ProgressCallback, ProgressMeter
+
+logger = get_logger()
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class _Part:
+    """Piece of a multipart body: a bytes buffer or a slice of an open file"""
+
+    def __init__(self, source: Union[bytes, BinaryIO], length: int) -> None:
+        self.source = io.BytesIO(source) if isinstance(source, bytes) else source
+        self.length = length
+        self.start = self.source.tell()
+        self.remaining = length
+
+    def read(self, size: int) -> bytes:
+        chunk = self.source.read(min(size, self.remaining))
+        self.remaining -= len(chunk)
+        return chunk
+
+    def rewind(self) -> None:
+        self.source.seek(self.start)
+        self.remaining = self.length
+
+
+def _file_part(file_obj: Any) -> _Part:
+    """Wrap an open file, reading it in memory only when its size can't be known"""
+    if isinstance(file_obj, io.TextIOBase):
+        return _bytes_part(file_obj.read())
+    try:
+        position = file_obj.tell()
+        # fileno() would move a spooled file to disk
+        if hasattr(file_obj, "fileno") and not isinstance(
+            file_obj, tempfile.SpooledTemporaryFile
+        ):
+            try:
+                size = os.fstat(file_obj.fileno()).st_size
+                return _Part(file_obj, size - position)
+            except (OSError, io.UnsupportedOperation):
+                pass
+        size = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(position)
+        return _Part(file_obj, size - position)
+    except (OSError, AttributeError, io.UnsupportedOperation):
+        return _bytes_part(file_obj.read())
+
+
+def _bytes_part(data: Union[str, bytes, bytearray]) -> _Part:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return _Part(bytes(data), len(data))
+
+
+def _field_values(data) -> Iterator[Tuple[str, Any]]:
+    """Yield the form fields the same way `requests` encodes them"""
+    items = data.items() if hasattr(data, "items") else (data or [])
+    for name, value in items:
+        values = (
+            [value]
+            if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__")
+            else value
+        )
+        for item in values:
+            if item is not None:
+                yield name, item if isinstance(item, bytes) else str(item)
+
+
+class MultipartEncoder:
+    """
+    Multipart form body that is read from the files while it is sent.
+
+    Accepts the same `data` and `files` arguments as `requests`, and gives the same
+    body, but files are only read in blocks as the connection sends them, so memory
+    use does not grow with the file sizes. The total size is computed up front, so
+    the request is sent with a `Content-Length`.
+
+    Parameters
+    ----------
+    data: Optional[Union[dict, list]], optional
+        Form fields
+    files: Union[dict, list]
+        Files, like `{"name": file}` or `[("name", ("file.csv", file, "text/csv"))]`
+    progress: Optional[Callable[[TransferProgress], None]], optional
+        Function called while the body is sent, with the bytes sent and the throughput
+    """
+
+    def __init__(
+        self,
+        data=None,
+        files=None,
+        *,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        self.boundary = choose_boundary()
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.parts: List[_Part] = []
+
+        for name, value in _field_values(data):
+            self.__add(name, None, _bytes_part(value))
+
+        items = files.items() if hasattr(files, "items") else (files or [])
+        for name, value in items:
+            filename, file_obj, content_type, headers = name, value, None, None
+            if isinstance(value, (tuple, list)):
+                filename, file_obj, *extra = value
+                content_type = extra[0] if extra else None
+                headers = extra[1] if len(extra) > 1 else None
+            else:
+                filename = guess_filename(value) or name
+
+            if file_obj is None:
+                continue
+            if isinstance(file_obj, (str, bytes, bytearray)):
+                part = _bytes_part(file_obj)
+            else:
+                part = _file_part(file_obj)
+            self.__add(name, filename, part, content_type, headers)
+
+        self.parts.append(_bytes_part(f"--{self.boundary}--\r\n"))
+        self.len = sum(part.length for part in self.parts)
+        self.__meter = ProgressMeter(self.len, progress)
+        self.__index = 0
+
+    def __add(
+        self,
+        name: str,
+        filename: Optional[str],
+        part: _Part,
+        content_type: Optional[str] = None,
+        headers: Optional[dict] = None,
+    ) -> None:
+        field = RequestField(name=name, data=b"", filename=filename, headers=headers)
+        field.make_multipart(content_type=content_type)
+        self.parts.append(_bytes_part(f"--{self.boundary}\r\n"))
+        self.parts.append(_bytes_part(field.render_headers()))
+        self.parts.append(part)
+        self.parts.append(_bytes_part("\r\n"))
+
+    def __len__(self) -> int:
+        return self.len
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to `size` bytes of the body, or all of the rest when `size` is negative"""
+        out = bytearray()
+        while self.__index < len(self.parts) and (size < 0 or len(out) < size):
+            want = STREAM_BLOCK_SIZE if size < 0 else size - len(out)
+            chunk = self.parts[self.__index].read(want)
+            if chunk:
+                out += chunk
+            else:
+                self.__index += 1
+
+        self.__meter.add(len(out))
+        if out and self.__meter.transferred == self.len:
+            logger.debug(f"Uploaded {self.__meter.summary()}")
+        return bytes(out)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(STREAM_BLOCK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> None:
+        """Go back to the beginning of the body, so the request can be sent again"""
+        if offset != 0 or whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("The body can only be rewound")
+        for part in self.parts:
+            part.rewind()
+        self.__index = 0
+        self.__meter = ProgressMeter(self.len, self.__meter.progress)
@@ -0,0 +1,70 @@
+import tempfile
+from typing import Any
+
+import pandas as pd
+from lazy_imports import try_import
+
+from mlops_codex.logger_config import get_logger
+from mlops_codex.shared.progress import format_size
+
+logger = get_logger()
+
+with try_import() as _pyarrow_import:
+    import pyarrow
+    import pyarrow.parquet
+
+PARQUET_SPOOL_SIZE = 64 * 1024 * 1024
+PARQUET_COMPRESSION = "snappy"
+
+
+def is_table(data: Any) -> bool:
+    """Tell if the data is a pandas DataFrame or a pyarrow Table"""
+    if isinstance(data, pd.DataFrame):
+        return True
+    return _pyarrow_import.is_successful() and isinstance(data, pyarrow.Table)
+
+
+def to_parquet_buffer(
+    data: Any,
+    *,
+    compression: str = PARQUET_COMPRESSION,
+    spool_size: int = PARQUET_SPOOL_SIZE,
+) -> tempfile.SpooledTemporaryFile:
+    """
+    Write a table as a compressed Parquet file in a buffer, ready to be uploaded.
+
+    The buffer is kept in memory up to `spool_size` bytes and moves to a temporary file on disk
+    beyond that, which is removed when the buffer is closed.
+
+    Parameters
+    ----------
+    data: Union[pd.DataFrame, pyarrow.Table]
+        Table to write. DataFrames need a Parquet engine, like `pyarrow`
+    compression: str, optional
+        Parquet compression codec. Default is "snappy"
+    spool_size: int, optional
+        Bytes kept in memory before the buffer moves to disk. Default is 64 MB
+
+    Returns
+    -------
+    tempfile.SpooledTemporaryFile
+        Buffer with the Parquet file, positioned at its beginning
+    """
+    buffer = tempfile.SpooledTemporaryFile(
+        max_size=spool_size, prefix=".mlops-", suffix=".parquet"
+    )
+    try:
+        if isinstance(data, pd.DataFrame):
+            data.to_parquet(buffer, compression=compression)
+        else:
+            pyarrow.parquet.write_table(data, buffer, compression=compression)
+    except BaseException:
+        buffer.close()
+        raise
+    size = buffer.tell()
+    buffer.seek(0)
+    logger.debug(
+        f"Wrote {len(data)} rows as {format_size(size)} of Parquet"
+        f"{' on disk' if size > spool_size else ''}"
+    )
+    return buffer
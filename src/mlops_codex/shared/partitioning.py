@@ -0,0 +1,258 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from lazy_imports import try_import
+
+from mlops_codex.exceptions import InputError
+from mlops_codex.shared.multipart import STREAM_BLOCK_SIZE
+from mlops_codex.shared.parquet_buffer import PARQUET_SPOOL_SIZE, to_parquet_buffer
+
+with try_import() as _pyarrow_import:
+    import pyarrow.parquet
+
+Shard = Tuple[str, BinaryIO]
+
+
+def _read_record(f: BinaryIO) -> bytes:
+    """Read a CSV record, which spans several lines when a quoted field has line breaks"""
+    record = f.readline()
+    quotes = record.count(b'"')
+    while quotes % 2:
+        line = f.readline()
+        if not line:
+            break
+        record += line
+        quotes += line.count(b'"')
+    return record
+
+
+def iter_csv_shards(
+    path: str, partition_rows: int, *, spool_size: int = PARQUET_SPOOL_SIZE
+) -> Iterator[tempfile.SpooledTemporaryFile]:
+    """
+    Split a CSV file in shards of `partition_rows` records, each one starting with the header.
+
+    The records are copied byte for byte, without parsing their values, and only one shard is
+    read at a time.
+
+    Parameters
+    ----------
+    path: str
+        Path of the CSV file
+    partition_rows: int
+        Records in each shard
+    spool_size: int, optional
+        Bytes of a shard kept in memory before it moves to a temporary file. Default is 64 MB
+
+    Returns
+    -------
+    Iterator[tempfile.SpooledTemporaryFile]
+        The shards, positioned at their beginning
+    """
+    with open(path, "rb") as f:
+        header = _read_record(f)
+        shard, rows = None, 0
+        while True:
+            record = _read_record(f)
+            if not record:
+                break
+            if not record.strip():
+                continue
+            if not record.endswith(b"\n"):
+                record += b"\n"
+            if shard is None:
+                shard = tempfile.SpooledTemporaryFile(
+                    max_size=spool_size, prefix=".mlops-", suffix=".csv"
+                )
+                shard.write(header)
+            shard.write(record)
+            rows += 1
+            if rows == partition_rows:
+                shard.seek(0)
+                yield shard
+                shard, rows = None, 0
+        if shard is not None:
+            shard.seek(0)
+            yield shard
+
+
+def iter_parquet_shards(
+    path: str, partition_rows: int
+) -> Iterator[tempfile.SpooledTemporaryFile]:
+    """
+    Split a Parquet file in shards of whole row groups, with at least `partition_rows` rows each
+    except the last one. A row group is never split, so a shard may be larger than asked.
+
+    Parameters
+    ----------
+    path: str
+        Path of the Parquet file
+    partition_rows: int
+        Rows in each shard
+
+    Returns
+    -------
+    Iterator[tempfile.SpooledTemporaryFile]
+        The shards, as Parquet files positioned at their beginning
+    """
+    _pyarrow_import.check()
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    groups, rows = [], 0
+    for index in range(parquet_file.num_row_groups):
+        groups.append(index)
+        rows += parquet_file.metadata.row_group(index).num_rows
+        if rows >= partition_rows:
+            yield to_parquet_buffer(parquet_file.read_row_groups(groups))
+            groups, rows = [], 0
+    if groups:
+        yield to_parquet_buffer(parquet_file.read_row_groups(groups))
+
+
+def iter_shards(path: str, partition_rows: int) -> Iterator[Shard]:
+    """
+    Split a CSV or Parquet file in shards
+
+    Parameters
+    ----------
+    path: str
+        Path of the file
+    partition_rows: int
+        Rows in each shard
+
+    Raises
+    ------
+    InputError
+        When the file is not a CSV or Parquet file
+
+    Returns
+    -------
+    Iterator[Tuple[str, BinaryIO]]
+        File name and content of each shard
+    """
+    if partition_rows < 1:
+        raise InputError("partition_rows must be at least 1")
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        shards = iter_csv_shards(path, partition_rows)
+    elif extension == ".parquet":
+        shards = iter_parquet_shards(path, partition_rows)
+    else:
+        raise InputError("Only CSV and Parquet files can be partitioned")
+    for index, shard in enumerate(shards):
+        yield f"part-{index:05d}{extension}", shard
+
+
+def _members(archive: str, workdir: str) -> Iterator[Tuple[str, str]]:
+    """Extract the files of a downloaded result, which is a zip file or a single file"""
+    if not zipfile.is_zipfile(archive):
+        with open(archive, "rb") as f:
+            head = f.read(4)
+        yield "predictions.parquet" if head == b"PAR1" else "predictions.csv", archive
+        return
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            if not info.is_dir():
+                yield info.filename, zf.extract(info, workdir)
+
+
+class _CsvAppender:
+    """Appends CSV files to one output, keeping the header of the first one only"""
+
+    def __init__(self, destination: str) -> None:
+        self.file = open(destination, "wb")
+        self.first = True
+
+    def append(self, path: str) -> None:
+        with open(path, "rb") as source:
+            if not self.first:
+                _read_record(source)
+            self.first = False
+            ends_with_newline = True
+            for block in iter(lambda: source.read(STREAM_BLOCK_SIZE), b""):
+                self.file.write(block)
+                ends_with_newline = block.endswith(b"\n")
+            if not ends_with_newline:
+                self.file.write(b"\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _ParquetAppender:
+    """Appends the row groups of Parquet files to one output, with the schema of the first one"""
+
+    def __init__(self, destination: str) -> None:
+        _pyarrow_import.check()
+        self.destination = destination
+        self.writer: Optional["pyarrow.parquet.ParquetWriter"] = None
+
+    def append(self, path: str) -> None:
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        if self.writer is None:
+            self.writer = pyarrow.parquet.ParquetWriter(
+                self.destination, parquet_file.schema_arrow
+            )
+        for index in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(index)
+            if not table.schema.equals(self.writer.schema):
+                table = table.cast(self.writer.schema)
+            self.writer.write_table(table)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def concatenate_outputs(archives: List[str], destination: str) -> List[str]:
+    """
+    Join the results of the shards of a partitioned prediction, in the order of the shards.
+
+    Every file of the results is joined with the files of the same name of the other shards:
+    CSV files keep the header of the first shard only, and Parquet files get the row groups of
+    every shard. Other files can't be joined, and are written once per shard, like
+    `name-00001.ext`.
+
+    Parameters
+    ----------
+    archives: List[str]
+        Downloaded result of each shard, in order
+    destination: str
+        Folder where the joined files are written
+
+    Returns
+    -------
+    List[str]
+        Paths of the written files
+    """
+    os.makedirs(destination, exist_ok=True)
+    appenders: Dict[str, Union[_CsvAppender, _ParquetAppender]] = {}
+    written: List[str] = []
+    workdir = tempfile.mkdtemp(dir=destination, prefix=".mlops-")
+    try:
+        for index, archive in enumerate(archives):
+            for name, path in _members(archive, os.path.join(workdir, str(index))):
+                stem, extension = os.path.splitext(os.path.basename(name))
+                if extension.lower() not in (".csv", ".parquet"):
+                    target = os.path.join(
+                        destination, f"{stem}-{index + 1:05d}{extension}"
+                    )
+                    shutil.copyfile(path, target)
+                    written.append(target)
+                    continue
+                if name not in appenders:
+                    target = os.path.join(destination, os.path.basename(name))
+                    appenders[name] = (
+                        _CsvAppender(target)
+                        if extension.lower() == ".csv"
+                        else _ParquetAppender(target)
+                    )
+                    written.append(target)
+                appenders[name].append(path)
+    finally:
+        for appender in appenders.values():
+            appender.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return written
@@ -0,0 +1,315 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from mlops_codex.shared import json_codec
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheMetrics:
+    """
+    Counters of a prediction cache.
+
+    Parameters
+    ----------
+    hits: int
+        Lookups answered by the cache
+    misses: int
+        Lookups that went to the server
+    evictions: int
+        Entries removed to respect the size limit
+    entries: int
+        Entries currently stored
+    size_bytes: int
+        Bytes currently stored
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the lookups answered by the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheBackend(ABC):
+    """
+    Storage of a `PredictionCache`. Values are bytes, and every entry has an expiry time
+    (`time.time()`) after which it must not be returned. Subclasses implement the storage.
+    """
+
+    evictions = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value of a key that has not expired, or None"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        """Store a value, evicting the least recently used entries when full"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry"""
+
+    @abstractmethod
+    def usage(self) -> Tuple[int, int]:
+        """Number of entries and bytes stored"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU storage, bounded by the total size of its values.
+
+    Parameters
+    ----------
+    max_bytes: int, optional
+        Maximum number of bytes stored. Default is 64 MB
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.__entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                self.__remove(key)
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = (value, expires_at)
+            self.__size += len(value)
+            while self.__size > self.max_bytes:
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+
+    def __remove(self, key: str) -> None:
+        value, _ = self.__entries.pop(key)
+        self.__size -= len(value)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def usage(self) -> Tuple[int, int]:
+        with self.__lock:
+            return len(self.__entries), self.__size
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    LRU storage in a SQLite file, bounded by the total size of its values. The file can be
+    shared by several processes of the same machine, and placed in `/dev/shm` to keep it in
+    shared memory.
+
+    Parameters
+    ----------
+    path: Optional[str], optional
+        Path of the database. Default is `~/.cache/mlops_codex/predictions.sqlite3`
+    max_bytes: int, optional
+        Maximum number of bytes stored. Default is 256 MB
+    touch_interval: float, optional
+        Seconds between two updates of the last use of an entry. Reading an entry used more
+        recently does not write to the file, so readers of a shared file don't wait for each
+        other. The order of eviction is only as precise as this interval. Default is 10
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        touch_interval: float = 10,
+    ):
+        self.path = path or os.path.join(
+            os.path.expanduser("~"), ".cache", "mlops_codex", "predictions.sqlite3"
+        )
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.evictions = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "key TEXT PRIMARY KEY, value BLOB, size INTEGER, expires_at REAL, used_at REAL)"
+        )
+        self.__db.execute(
+            "CREATE INDEX IF NOT EXISTS predictions_used_at ON predictions (used_at)"
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self.__lock:
+            row = self.__db.execute(
+                "SELECT value, expires_at, used_at FROM predictions WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self.__db.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                return None
+            if now - row[2] >= self.touch_interval:
+                self.__db.execute(
+                    "UPDATE predictions SET used_at = ? WHERE key = ?", (now, key)
+                )
+            return row[0]
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self.__lock:
+            self.__db.execute("BEGIN IMMEDIATE")
+            try:
+                self.__db.execute(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), expires_at, time.time()),
+                )
+                self.__db.execute(
+                    "DELETE FROM predictions WHERE expires_at <= ?", (time.time(),)
+                )
+                size = self.__db.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM predictions"
+                ).fetchone()[0]
+                while size > self.max_bytes:
+                    oldest = self.__db.execute(
+                        "SELECT key, size FROM predictions ORDER BY used_at LIMIT 64"
+                    ).fetchall()
+                    for old_key, old_size in oldest:
+                        if size <= self.max_bytes:
+                            break
+                        self.__db.execute(
+                            "DELETE FROM predictions WHERE key = ?", (old_key,)
+                        )
+                        size -= old_size
+                        self.evictions += 1
+                self.__db.execute("COMMIT")
+            except BaseException:
+                self.__db.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__db.execute("DELETE FROM predictions")
+
+    def usage(self) -> Tuple[int, int]:
+        with self.__lock:
+            entries, size = self.__db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM predictions"
+            ).fetchone()
+            return entries, size
+
+
+class PredictionCache:
+    """
+    Cache of prediction results, keyed by the model hash, the preprocessing `ScriptHash` and a
+    hash of the canonical JSON of the input. Only use it for models whose predictions are
+    deterministic.
+
+    Parameters
+    ----------
+    ttl: float, optional
+        Seconds a prediction stays valid. Default is 60
+    backend: Optional[CacheBackend], optional
+        Storage of the predictions. Default is a `MemoryCacheBackend`
+    """
+
+    MISSING = _MISSING
+
+    def __init__(self, ttl: float = 60, backend: Optional[CacheBackend] = None):
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def key(model_hash: str, script_hash: Optional[str], payload: Any) -> str:
+        """
+        Build the cache key of a prediction
+
+        Parameters
+        ----------
+        model_hash: str
+            Hash of the model
+        script_hash: Optional[str]
+            Hash of the preprocessing script, if any
+        payload: Any
+            Input of the model
+
+        Returns
+        -------
+        str
+            The key
+        """
+        canonical = json_codec.dumps(payload, sort_keys=True)
+        digest = hashlib.sha256(canonical).hexdigest()
+        return f"{model_hash}:{script_hash or '-'}:{digest}"
+
+    def get(self, key: str) -> Any:
+        """Return the cached prediction of a key, or `PredictionCache.MISSING`"""
+        value = self.backend.get(key)
+        with self.__lock:
+            if value is None:
+                self.__misses += 1
+                return self.MISSING
+            self.__hits += 1
+        return json_codec.loads(value)
+
+    def set(self, key: str, prediction: Any) -> None:
+        """Store a prediction"""
+        self.backend.set(key, json_codec.dumps(prediction), time.time() + self.ttl)
+
+    def clear(self) -> None:
+        """Remove every cached prediction"""
+        self.backend.clear()
+
+    def metrics(self) -> CacheMetrics:
+        """
+        Take a snapshot of the cache counters
+
+        Returns
+        -------
+        CacheMetrics
+            Hits, misses, evictions and usage of the cache
+        """
+        entries, size = self.backend.usage()
+        return CacheMetrics(
+            hits=self.__hits,
+            misses=self.__misses,
+            evictions=self.backend.evictions,
+            entries=entries,
+            size_bytes=size,
+        )
@@ -0,0 +1,92 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class TransferProgress:
+    """
+    Progress of a file transfer, given to the progress callbacks.
+
+    Parameters
+    ----------
+    transferred: int
+        Number of bytes transferred so far
+    total: Optional[int]
+        Total number of bytes, when it is known
+    elapsed: float
+        Seconds since the transfer started
+    """
+
+    transferred: int
+    total: Optional[int]
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """Average speed of the transfer, in bytes per second"""
+        return self.transferred / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Fraction of the transfer already done, when the total is known"""
+        if not self.total:
+            return None
+        return self.transferred / self.total
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
+def format_size(size: float) -> str:
+    """Format a number of bytes for humans, like '12.3 MB'"""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+class ProgressMeter:
+    """
+    Counts the bytes of a transfer and reports them to a progress callback.
+
+    Reports are sent at most once every `report_every` bytes, plus one when the
+    transfer ends, so callbacks stay cheap even when the bytes arrive in small pieces.
+    """
+
+    def __init__(
+        self,
+        total: Optional[int],
+        progress: Optional[ProgressCallback] = None,
+        *,
+        report_every: int = 1024 * 1024,
+    ) -> None:
+        self.total = total
+        self.progress = progress
+        self.report_every = report_every
+        self.transferred = 0
+        self.started = time.monotonic()
+        self.__reported = 0
+
+    def add(self, size: int) -> None:
+        self.transferred += size
+        if self.progress is None:
+            return
+        finished = self.total is not None and self.transferred >= self.total
+        if finished or self.transferred - self.__reported >= self.report_every:
+            self.__reported = self.transferred
+            self.progress(self.snapshot())
+
+    def snapshot(self) -> TransferProgress:
+        return TransferProgress(
+            self.transferred, self.total, time.monotonic() - self.started
+        )
+
+    def summary(self) -> str:
+        """Text with the size, duration and throughput of the transfer"""
+        progress = self.snapshot()
+        return (
+            f"{format_size(progress.transferred)} in {progress.elapsed:.1f}s "
+            f"({format_size(progress.throughput)}/s)"
+        )
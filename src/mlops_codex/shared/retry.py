@@ -0,0 +1,137 @@
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Mapping, Optional
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Read the `Retry-After` header of a response, given in seconds or as an HTTP date
+
+    Parameters
+    ----------
+    headers: Mapping[str, str]
+        Headers of the response
+
+    Returns
+    -------
+    Optional[float]
+        Seconds to wait, or None when the header is missing or invalid
+    """
+    value = (headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how often a failed HTTP request is sent again.
+
+    A request is retried after a connection error or a timeout, or when the server answers
+    with one of `retry_statuses`. The delay before the attempt `n` (starting at 1 for the
+    first retry) is `initial_backoff * backoff ** (n - 1)`, up to `max_backoff`, randomly
+    changed by up to `jitter` (a fraction of it). When the response has a `Retry-After`
+    header, it is used instead, as long as it is not longer than `max_retry_after`.
+
+    Methods that are not idempotent (`POST` and `PATCH`) are only retried when the server
+    surely did not process the request: the connection could not be opened, or the server
+    answered 429, or 503 with a `Retry-After` header. Requests with an `Idempotency-Key`
+    header are retried like idempotent ones.
+
+    Parameters
+    ----------
+    max_attempts: int, optional
+        Maximum number of times the request is sent, counting the first one. Default is 3
+    initial_backoff: float, optional
+        Seconds before the first retry. Default is 0.5
+    max_backoff: float, optional
+        Maximum number of seconds between two attempts. Default is 30
+    backoff: float, optional
+        Factor applied to the delay after each retry. Default is 2
+    jitter: float, optional
+        Fraction of the delay that is randomly added or removed. Default is 0.2
+    retry_statuses: FrozenSet[int], optional
+        Statuses that are retried. Default is 408, 429, 500, 502, 503 and 504
+    max_retry_after: float, optional
+        Longest `Retry-After` that is honored. Longer ones are not retried. Default is 120
+    retry_non_idempotent: bool, optional
+        Retry `POST` and `PATCH` requests like idempotent ones. Default is False
+    """
+
+    max_attempts: int = 3
+    initial_backoff: float = 0.5
+    max_backoff: float = 30
+    backoff: float = 2
+    jitter: float = 0.2
+    retry_statuses: FrozenSet[int] = frozenset({408, 429, 500, 502, 503, 504})
+    max_retry_after: float = 120
+    retry_non_idempotent: bool = False
+
+    def delay(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        """
+        Seconds to wait before the retry number `attempt`
+
+        Parameters
+        ----------
+        attempt: int
+            Number of the retry, starting at 1
+        headers: Optional[Mapping[str, str]], optional
+            Headers of the failed response, checked for `Retry-After`
+
+        Returns
+        -------
+        float
+            Delay in seconds
+        """
+        retry_after = retry_after_seconds(headers) if headers is not None else None
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.initial_backoff * self.backoff ** (attempt - 1), self.max_backoff)
+        return max(0.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def _is_idempotent(self, method: str, request_headers) -> bool:
+        return (
+            self.retry_non_idempotent
+            or method.upper() in IDEMPOTENT_METHODS
+            or "Idempotency-Key" in (request_headers or {})
+        )
+
+    def retry_status(
+        self,
+        method: str,
+        request_headers: Optional[Mapping[str, str]],
+        status: int,
+        response_headers: Mapping[str, str],
+    ) -> bool:
+        """Tell if a request that got the answer `status` can be sent again"""
+        if status not in self.retry_statuses:
+            return False
+        retry_after = retry_after_seconds(response_headers)
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return False
+        if self._is_idempotent(method, request_headers):
+            return True
+        return status == 429 or (status == 503 and retry_after is not None)
+
+    def retry_error(
+        self, method: str, request_headers: Optional[Mapping[str, str]], sent: bool
+    ) -> bool:
+        """
+        Tell if a request that failed with a connection error or a timeout can be sent again.
+        `sent` tells if the request may have reached the server
+        """
+        return not sent or self._is_idempotent(method, request_headers)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+"""Policy that never sends a request twice"""
@@ -0,0 +1,304 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import BinaryIO, Optional
+
+from mlops_codex.logger_config import get_logger
+from mlops_codex.shared.utils import LazySingleton
+
+logger = get_logger()
+
+DIGEST_BLOCK_SIZE = 1024 * 1024
+
+
+def stream_digest(file_obj: BinaryIO) -> str:
+    """SHA-256 of an open binary file, read in blocks from its beginning"""
+    file_obj.seek(0)
+    sha256 = hashlib.sha256()
+    for block in iter(lambda: file_obj.read(DIGEST_BLOCK_SIZE), b""):
+        sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _sha256_file(path: str) -> str:
+    """SHA-256 of a file, read in blocks"""
+    with open(path, "rb") as f:
+        return stream_digest(f)
+
+
+class UploadIndex:
+    """
+    Local index of the files already uploaded, mapping the SHA-256 of their content to the
+    dataset hash the server gave them, per server, tenant and group. When a known file is
+    submitted again, the dataset hash is sent instead of its bytes.
+
+    The digest of a file is computed in a single streaming pass, and kept with the size,
+    modification time and inode of the file, so it is only read again after it changes. The
+    index is a SQLite file that can be shared by several processes of the same machine.
+
+    Parameters
+    ----------
+    path: Optional[str], optional
+        Path of the database. Default is `~/.cache/mlops_codex/uploads.sqlite3`
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(
+            os.path.expanduser("~"), ".cache", "mlops_codex", "uploads.sqlite3"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, digest TEXT)"
+        )
+        columns = {row[1] for row in self.__db.execute("PRAGMA table_info(uploads)")}
+        if columns and "base_url" not in columns:
+            self.__db.execute("DROP TABLE uploads")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS uploads ("
+            "base_url TEXT, tenant TEXT, grp TEXT, digest TEXT, dataset_hash TEXT, "
+            "uploaded_at REAL, PRIMARY KEY (base_url, tenant, grp, digest))"
+        )
+
+    def digest(self, file_path: str) -> str:
+        """
+        SHA-256 of the content of a file. It is only computed when the size, modification time
+        or inode of the file changed since the last time
+
+        Parameters
+        ----------
+        file_path: str
+            Path of the file
+
+        Returns
+        -------
+        str
+            Hex digest of the file
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        with self.__lock:
+            row = self.__db.execute(
+                "SELECT size, mtime_ns, inode, digest FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        if row is not None and tuple(row[:3]) == signature:
+            return row[3]
+
+        started = time.monotonic()
+        digest = _sha256_file(path)
+        logger.debug(
+            f"Computed the digest of {file_path} in {time.monotonic() - started:.2f}s"
+        )
+
+        stat = os.stat(path)
+        if (stat.st_size, stat.st_mtime_ns, stat.st_ino) == signature:
+            with self.__lock:
+                self.__db.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                    (path, *signature, digest),
+                )
+        return digest
+
+    def lookup(
+        self, base_url: str, tenant: str, group: str, file_path: str
+    ) -> Optional[str]:
+        """
+        Dataset hash of a file already uploaded to a group
+
+        Parameters
+        ----------
+        base_url: str
+            URL of the MLOps server
+        tenant: str
+            Tenant of the user
+        group: str
+            Group where the file is used
+        file_path: str
+            Path of the file
+
+        Returns
+        -------
+        Optional[str]
+            The dataset hash, or None when the content of the file was never uploaded to the group
+        """
+        digest = self.digest(file_path)
+        with self.__lock:
+            row = self.__db.execute(
+                "SELECT dataset_hash FROM uploads "
+                "WHERE base_url = ? AND tenant = ? AND grp = ? AND digest = ?",
+                (base_url, tenant, group, digest),
+            ).fetchone()
+        return row[0] if row else None
+
+    def record(
+        self, base_url: str, tenant: str, group: str, file_path: str, dataset_hash: str
+    ) -> None:
+        """
+        Remember the dataset hash the server gave to an uploaded file
+
+        Parameters
+        ----------
+        base_url: str
+            URL of the MLOps server
+        tenant: str
+            Tenant of the user
+        group: str
+            Group where the file was uploaded
+        file_path: str
+            Path of the file
+        dataset_hash: str
+            Dataset hash of the file
+        """
+        digest = self.digest(file_path)
+        with self.__lock:
+            self.__db.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                (base_url, tenant, group, digest, dataset_hash, time.time()),
+            )
+
+    def forget(self, base_url: str, tenant: str, group: str, dataset_hash: str) -> None:
+        """
+        Remove a dataset hash, so its file is uploaded again the next time
+
+        Parameters
+        ----------
+        base_url: str
+            URL of the MLOps server
+        tenant: str
+            Tenant of the user
+        group: str
+            Group of the dataset
+        dataset_hash: str
+            Dataset hash to remove
+        """
+        with self.__lock:
+            self.__db.execute(
+                "DELETE FROM uploads "
+                "WHERE base_url = ? AND tenant = ? AND grp = ? AND dataset_hash = ?",
+                (base_url, tenant, group, dataset_hash),
+            )
+
+    def clear(self) -> None:
+        """Remove every file and dataset hash of the index"""
+        with self.__lock:
+            self.__db.execute("DELETE FROM files")
+            self.__db.execute("DELETE FROM uploads")
+
+
+def _index_from_env() -> Optional[UploadIndex]:
+    """Index set by the env variable MLOPS_UPLOAD_INDEX, if any"""
+    path = os.getenv("MLOPS_UPLOAD_INDEX", "")
+    if path.lower() in ("", "0", "false", "no"):
+        return None
+    return UploadIndex(None if path.lower() in ("1", "true", "yes") else path)
+
+
+_index: LazySingleton[Optional[UploadIndex]] = LazySingleton(_index_from_env)
+
+
+def get_upload_index() -> Optional[UploadIndex]:
+    """
+    Index used by the SDK. It is None unless it was set with `set_upload_index` or the env
+    variable MLOPS_UPLOAD_INDEX, which holds the path of the index or 'true' for the default path
+
+    Returns
+    -------
+    Optional[UploadIndex]
+        The index
+    """
+    return _index.get()
+
+
+def set_upload_index(index: Optional[UploadIndex]) -> None:
+    """
+    Replace the index used by the SDK
+
+    Parameters
+    ----------
+    index: Optional[UploadIndex]
+        Index used from now on. None stops reusing uploads, and every file is sent again
+    """
+    _index.set(index)
+
+
+def file_digest(file_path: str) -> str:
+    """
+    SHA-256 of the content of a file. The digest cached by the upload index is used when the
+    index is enabled and the file did not change
+
+    Parameters
+    ----------
+    file_path: str
+        Path of the file
+
+    Returns
+    -------
+    str
+        Hex digest of the file
+    """
+    try:
+        index = get_upload_index()
+        if index is not None:
+            return index.digest(file_path)
+    except (OSError, sqlite3.Error) as error:
+        logger.debug(f"Upload index is not available: {error}")
+    return _sha256_file(file_path)
+
+
+def find_upload(
+    base_url: str, tenant: str, group: Optional[str], file_path: str
+) -> Optional[str]:
+    """Dataset hash of a file already uploaded to a group, or None. Never fails the upload"""
+    if not group:
+        return None
+    try:
+        index = get_upload_index()
+        dataset_hash = (
+            index.lookup(base_url, tenant, group, file_path) if index else None
+        )
+    except (OSError, sqlite3.Error) as error:
+        logger.debug(f"Upload index is not available: {error}")
+        return None
+    if dataset_hash is not None:
+        logger.info(f"{file_path} was already uploaded. Using the dataset {dataset_hash}")
+    return dataset_hash
+
+
+def record_upload(
+    base_url: str,
+    tenant: str,
+    group: Optional[str],
+    file_path: str,
+    dataset_hash: Optional[str],
+) -> None:
+    """Remember the dataset hash of an uploaded file, when the server informed it"""
+    if not group or not dataset_hash:
+        return
+    try:
+        index = get_upload_index()
+        if index is not None:
+            index.record(base_url, tenant, group, file_path, dataset_hash)
+    except (OSError, sqlite3.Error) as error:
+        logger.debug(f"Upload index is not available: {error}")
+
+
+def forget_upload(
+    base_url: str, tenant: str, group: Optional[str], dataset_hash: str
+) -> None:
+    """Remove a dataset hash that the server no longer has from the index"""
+    if not group:
+        return
+    try:
+        index = get_upload_index()
+        if index is not None:
+            index.forget(base_url, tenant, group, dataset_hash)
+    except (OSError, sqlite3.Error) as error:
+        logger.debug(f"Upload index is not available: {error}")
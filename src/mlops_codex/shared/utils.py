@@ -1,10 +1,63 @@
-from typing import BinaryIO, Dict, Optional, Tuple
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Generic, Optional, Tuple, TypeVar
 
 import requests
 
 from mlops_codex.exceptions import InputError
 from mlops_codex.shared.constants import CODEX_VERSION
 
+T = TypeVar("T")
+
+
+class LazySingleton(Generic[T]):
+    """
+    Value shared by the whole process, created on first use. Module-level state of the SDK
+    is kept in one of these instead of module globals, so it can be replaced from any thread.
+
+    Parameters
+    ----------
+    factory: Callable[[], T]
+        Function that creates the value. It is called once, unless a value is set before
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self.__factory = factory
+        self.__lock = threading.Lock()
+        self.__created = False
+        self.__value: Optional[T] = None
+
+    def get(self) -> T:
+        """
+        Return the value, creating it on the first call
+
+        Returns
+        -------
+        T
+            The value
+        """
+        if not self.__created:
+            with self.__lock:
+                if not self.__created:
+                    self.__value = self.__factory()
+                    self.__created = True
+        return self.__value
+
+    def set(self, value: T) -> None:
+        """
+        Replace the value
+
+        Parameters
+        ----------
+        value: T
+            Value returned from now on
+        """
+        with self.__lock:
+            self.__value, self.__created = value, True
+
 
 def parse_data(
     file_path: Optional[str] = None,
@@ -63,19 +116,92 @@ def parse_data(
     raise InputError("You must provide either a file path or a dataset hash.")
 
 
-def check_lib_version():
-    response = requests.get(
-        "https://pypi.org/pypi/datarisk-mlops-codex/json", timeout=60
+PYPI_URL = "https://pypi.org/pypi/datarisk-mlops-codex/json"
+VERSION_CHECK_TTL = 24 * 60 * 60
+
+_version_check_started = threading.Event()
+_version_check_lock = threading.Lock()
+
+
+def _version_cache_path() -> Path:
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
     )
+    return Path(cache_home) / "mlops_codex" / "latest_version.json"
+
+
+def _latest_version(ttl: float, timeout: float) -> Optional[str]:
+    """
+    Get the latest published version of the library, using the on disk cache while it is fresh.
+
+    Parameters
+    ----------
+    ttl : float
+        Seconds during which the cached version is trusted
+    timeout : float
+        Timeout in seconds of the PyPI request
+
+    Returns
+    -------
+    str or None
+        Latest version, or None if PyPI did not answer it
+    """
+    cache_path = _version_cache_path()
+    try:
+        cached = json.loads(cache_path.read_text())
+        if time.time() - cached["checked_at"] < ttl:
+            return cached["version"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
 
+    response = requests.get(PYPI_URL, timeout=timeout)
     if response.status_code != 200:
-        return
+        return None
+    version = response.json()["info"]["version"]
 
-    json_data = response.json()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"version": version, "checked_at": time.time()}))
+    except OSError:
+        pass
+    return version
 
-    info = json_data["info"]
-    major_version = info["version"]
-    if major_version != CODEX_VERSION:
+
+def check_lib_version(ttl: float = VERSION_CHECK_TTL, timeout: float = 5) -> None:
+    """
+    Warn when the installed version is not the latest one published on PyPI.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        Seconds during which the version found on PyPI is cached on disk. Default is one day
+    timeout : float, optional
+        Timeout in seconds of the PyPI request. Default is 5
+    """
+    try:
+        latest_version = _latest_version(ttl, timeout)
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        return
+
+    if latest_version and latest_version != CODEX_VERSION:
         print(
-            f"You are using {CODEX_VERSION}, but version {major_version} is recommended."
+            f"You are using {CODEX_VERSION}, but version {latest_version} is recommended."
         )
+
+
+def check_lib_version_in_background() -> None:
+    """
+    Run `check_lib_version` once per process in a daemon thread, so it never delays the caller.
+    It can be disabled by setting the env variable MLOPS_VERSION_CHECK to 'false'.
+    """
+    if os.getenv("MLOPS_VERSION_CHECK", "true").lower() in ("0", "false", "no"):
+        return
+
+    with _version_check_lock:
+        if _version_check_started.is_set():
+            return
+        _version_check_started.set()
+
+    threading.Thread(
+        target=check_lib_version, name="mlops-codex-version-check", daemon=True
+    ).start()
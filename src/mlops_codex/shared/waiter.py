@@ -0,0 +1,209 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar, Union
+
+from mlops_codex.exceptions import WaitCancelledError, WaitTimeoutError
+
+T = TypeVar("T")
+
+CancelHook = Union[threading.Event, asyncio.Event, Callable[[], bool]]
+
+
+@dataclass(frozen=True)
+class WaitPolicy:
+    """
+    How often a status is checked while waiting for something to finish.
+
+    The first check is made right away. The interval between checks starts at
+    `initial_interval` and is multiplied by `backoff` after every check, up to
+    `max_interval`. Every interval is randomly changed by up to `jitter` (a fraction of
+    it), so many waits started together do not hit the server at the same time.
+
+    Parameters
+    ----------
+    initial_interval: float, optional
+        Seconds before the second check. Default is 1
+    max_interval: float, optional
+        Maximum number of seconds between two checks. Default is 30
+    backoff: float, optional
+        Factor applied to the interval after each check. Default is 2
+    jitter: float, optional
+        Fraction of the interval that is randomly added or removed. Default is 0.1
+    timeout: Optional[float], optional
+        Maximum number of seconds to wait. Default is None, which waits forever
+    """
+
+    initial_interval: float = 1
+    max_interval: float = 30
+    backoff: float = 2
+    jitter: float = 0.1
+    timeout: Optional[float] = None
+
+    def intervals(self) -> Iterator[float]:
+        """
+        Yield the number of seconds to sleep before each new check
+
+        Returns
+        -------
+        Iterator[float]
+            Infinite sequence of intervals
+        """
+        interval = self.initial_interval
+        while True:
+            delay = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            yield max(0.0, min(delay, self.max_interval))
+            interval = min(interval * self.backoff, self.max_interval)
+
+
+def is_cancelled(cancel: Optional[CancelHook]) -> bool:
+    """Tell if a cancellation hook was triggered"""
+    if cancel is None:
+        return False
+    if isinstance(cancel, (threading.Event, asyncio.Event)):
+        return cancel.is_set()
+    return bool(cancel())
+
+
+def sleep_unless_cancelled(delay: float, cancel: Optional[CancelHook]) -> None:
+    """Sleep for `delay` seconds, waking up early if the hook is an event that gets set"""
+    if isinstance(cancel, threading.Event):
+        cancel.wait(delay)
+    else:
+        time.sleep(delay)
+
+
+def wait_until(
+    check: Callable[[], T],
+    is_done: Callable[[T], bool],
+    *,
+    policy: Optional[WaitPolicy] = None,
+    timeout: Optional[float] = None,
+    cancel: Optional[CancelHook] = None,
+    on_check: Optional[Callable[[T], None]] = None,
+) -> T:
+    """
+    Call `check` until `is_done` accepts its result, sleeping between the calls as told by `policy`.
+
+    Parameters
+    ----------
+    check: Callable[[], T]
+        Function that fetches the current status
+    is_done: Callable[[T], bool]
+        Function that tells if a status is final
+    policy: Optional[WaitPolicy], optional
+        Intervals between the checks. Default is `WaitPolicy()`
+    timeout: Optional[float], optional
+        Maximum number of seconds to wait. Overrides the timeout of the policy
+    cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+        Cancellation hook. The wait stops as soon as the event is set or the callable returns True
+    on_check: Optional[Callable[[T], None]], optional
+        Function called with every status that is not final
+
+    Raises
+    ------
+    WaitTimeoutError
+        When the status is still not final after `timeout` seconds
+    WaitCancelledError
+        When the cancellation hook is triggered
+
+    Returns
+    -------
+    T
+        The final status
+    """
+    policy = policy or WaitPolicy()
+    timeout = timeout if timeout is not None else policy.timeout
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    for interval in policy.intervals():
+        if is_cancelled(cancel):
+            raise WaitCancelledError("Wait cancelled")
+
+        result = check()
+        if is_done(result):
+            return result
+
+        if on_check:
+            on_check(result)
+
+        delay = interval
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WaitTimeoutError(f"Still waiting after {timeout} seconds")
+            delay = min(interval, remaining)
+
+        sleep_unless_cancelled(delay, cancel)
+
+
+async def async_wait_until(
+    check: Callable[[], Awaitable[T]],
+    is_done: Callable[[T], bool],
+    *,
+    policy: Optional[WaitPolicy] = None,
+    timeout: Optional[float] = None,
+    cancel: Optional[CancelHook] = None,
+    on_check: Optional[Callable[[T], None]] = None,
+) -> T:
+    """
+    Asyncio version of `wait_until`. Awaits `check` and sleeps with `asyncio.sleep`, so the event loop is never blocked.
+
+    Parameters
+    ----------
+    check: Callable[[], Awaitable[T]]
+        Coroutine function that fetches the current status
+    is_done: Callable[[T], bool]
+        Function that tells if a status is final
+    policy: Optional[WaitPolicy], optional
+        Intervals between the checks. Default is `WaitPolicy()`
+    timeout: Optional[float], optional
+        Maximum number of seconds to wait. Overrides the timeout of the policy
+    cancel: Optional[Union[asyncio.Event, threading.Event, Callable[[], bool]]], optional
+        Cancellation hook. The wait stops as soon as the event is set or the callable returns True
+    on_check: Optional[Callable[[T], None]], optional
+        Function called with every status that is not final
+
+    Raises
+    ------
+    WaitTimeoutError
+        When the status is still not final after `timeout` seconds
+    WaitCancelledError
+        When the cancellation hook is triggered
+
+    Returns
+    -------
+    T
+        The final status
+    """
+    policy = policy or WaitPolicy()
+    timeout = timeout if timeout is not None else policy.timeout
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    for interval in policy.intervals():
+        if is_cancelled(cancel):
+            raise WaitCancelledError("Wait cancelled")
+
+        result = await check()
+        if is_done(result):
+            return result
+
+        if on_check:
+            on_check(result)
+
+        delay = interval
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WaitTimeoutError(f"Still waiting after {timeout} seconds")
+            delay = min(interval, remaining)
+
+        if isinstance(cancel, asyncio.Event):
+            try:
+                await asyncio.wait_for(cancel.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(delay)
@@ -7,13 +7,11 @@ import re
 import sys
 from contextlib import contextmanager
 from http import HTTPStatus
-from time import sleep
 from typing import Any, List, Optional, Union
 
 import cloudpickle
 import numpy as np
 import pandas as pd
-import requests
 from lazy_imports import try_import
 
 from mlops_codex.__utils import parse_dict_or_file, parse_json_to_yaml
@@ -27,9 +25,20 @@ from mlops_codex.exceptions import (
     ServerError,
     TrainingError,
 )
-from mlops_codex.http_request_handler import refresh_token
+from mlops_codex.http_request_handler import Transport
 from mlops_codex.logger_config import get_logger
 from mlops_codex.model import AsyncModel, SyncModel
+from mlops_codex.shared.execution_journal import (
+    TRAINING,
+    find_submission,
+    get_execution_journal,
+    journaled_inputs,
+    record_state,
+    record_submission,
+)
+from mlops_codex.shared.progress import ProgressCallback
+from mlops_codex.shared.upload_index import find_upload, forget_upload, record_upload
+from mlops_codex.shared.waiter import wait_until
 from mlops_codex.validations import validate_group_existence
 
 patt = re.compile(r"(\d+)")
@@ -413,6 +422,8 @@ class MLOpsTrainingExecution(MLOpsExecution):
         Environment of MLOps you are using.
     run_data: dict
         Metadata from the execution.
+    parent: Optional[BaseMLOps], optional
+        Object that created this execution. Its connections and user session are shared with the execution
 
     Raises
     ------
@@ -452,7 +463,8 @@ class MLOpsTrainingExecution(MLOpsExecution):
         exec_id: str,
         login: str,
         password: str,
-        tenant: str
+        tenant: str,
+        parent: Optional[BaseMLOps] = None,
     ) -> None:
         super().__init__(
             parent_id=training_id,
@@ -462,6 +474,7 @@ class MLOpsTrainingExecution(MLOpsExecution):
             password=password,
             tenant=tenant,
             group=group,
+            parent=parent,
         )
 
         self.training_id = training_id
@@ -565,14 +578,15 @@ class MLOpsTrainingExecution(MLOpsExecution):
 
         form_data["input_type"] = input_type
 
-        response = requests.post(
+        response = self._transport.post(
             url,
             data=form_data,
             files=upload_data,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url)
+                + self._token_manager.get_token()
             },
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 201:
@@ -602,14 +616,15 @@ class MLOpsTrainingExecution(MLOpsExecution):
 
         url = f"{self.base_url}/training/status/{self.group}/{self.exec_id}"
 
-        response = requests.get(
+        response = self._transport.get(
             url,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
+                + self._token_manager.get_token(),
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.get_status.__qualname__,
             },
+            token_manager=self._token_manager,
         )
         if response.status_code not in [200, 410]:
             formatted_msg = parse_json_to_yaml(response.json())
@@ -619,17 +634,19 @@ class MLOpsTrainingExecution(MLOpsExecution):
         result = response.json()
 
         self.status = result["Status"]
+        record_state(TRAINING, self.training_id, self.exec_id, self.status)
         self.execution_data["ExecutionState"] = result["Status"]
         if self.status == "Succeeded":
             url = f"{self.base_url}/training/describe/{self.group}/{self.training_id}/{self.exec_id}"
-            response = requests.get(
+            response = self._transport.get(
                 url,
                 headers={
                     "Authorization": "Bearer "
-                    + refresh_token(*self.credentials, self.base_url),
+                    + self._token_manager.get_token(),
                     "Neomaril-Origin": "Codex",
                     "Neomaril-Method": self.get_status.__qualname__,
                 },
+                token_manager=self._token_manager,
             )
             self.execution_data = response.json()["Description"]
             self.run_data = self.execution_data["RunData"]
@@ -768,7 +785,8 @@ class MLOpsTrainingExperiment(BaseMLOps):
         Flag that choose which environment of MLOps you are using. Test your deployment first before changing to production. Default is True
     executions: List[int]
         Ids for the executions in that training
-
+    parent: Optional[BaseMLOps], optional
+        Object that created this experiment. Its connections and user session are shared with the experiment
 
     Raises
     ------
@@ -806,19 +824,21 @@ class MLOpsTrainingExperiment(BaseMLOps):
         password: str,
         tenant: str,
         group: str = "datarisk",
+        parent: Optional[BaseMLOps] = None,
     ) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+        super().__init__(login=login, password=password, tenant=tenant, parent=parent)
 
         self.training_id = training_id
         self.group = group
 
         url = f"{self.base_url}/training/describe/{self.group}/{self.training_id}"
-        response = requests.get(
+        response = self._transport.get(
             url,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url)
+                + self._token_manager.get_token()
             },
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 404:
@@ -877,6 +897,7 @@ class MLOpsTrainingExperiment(BaseMLOps):
         model_params: Optional[Union[str, dict]] = None,
         model_hash: Optional[str] = None,
         extra_files: Optional[list] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> str:
         """
         Upload the files to the server
@@ -917,6 +938,8 @@ class MLOpsTrainingExperiment(BaseMLOps):
             The path to a JSON file with the model metrics or a dictionary with the metrics.
         model_params: Optional[Union[str, dict]], optional
             The path to a JSON file with the model parameters or a dictionary with the parameters.
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called while the files are uploaded, with the bytes sent and the throughput
 
         Raises
         ------
@@ -933,15 +956,23 @@ class MLOpsTrainingExperiment(BaseMLOps):
 
         upload_data = []
         form_data = {"run_name": run_name, "training_type": training_type}
+        reused_hash = None
 
         if description:
             form_data["description"] = description
 
         if training_type != "External":
             if train_data:
-                upload_data.append(
-                    ("train_data", (train_data.split("/")[-1], open(train_data, "rb")))
-                )
+                reused_hash = find_upload(self.base_url, self.credentials[2], self.group, train_data)
+                if reused_hash:
+                    form_data["dataset_hash"] = reused_hash
+                else:
+                    upload_data.append(
+                        (
+                            "train_data",
+                            (train_data.split("/")[-1], open(train_data, "rb")),
+                        )
+                    )
             elif dataset:
                 dataset_hash = (
                     dataset if isinstance(dataset, str) else dataset.dataset_hash
@@ -1027,19 +1058,45 @@ class MLOpsTrainingExperiment(BaseMLOps):
             if env:
                 upload_data.append(("env", (".env", open(env, "r"))))
 
-        token = refresh_token(*self.credentials, self.base_url)
-        response = requests.post(
-            url,
-            data=form_data,
-            files=upload_data,
-            headers={"Authorization": "Bearer " + token},
-        )
+        def send():
+            token = self._token_manager.get_token()
+            return self._transport.post(
+                url,
+                data=form_data,
+                files=upload_data,
+                headers={"Authorization": "Bearer " + token},
+                token_manager=self._token_manager,
+                progress=progress,
+            )
+
+        response = send()
+        if reused_hash and response.status_code in (400, 404):
+            logger.warning(
+                f"Dataset {reused_hash} was not accepted. Uploading {train_data} again"
+            )
+            forget_upload(self.base_url, self.credentials[2], self.group, reused_hash)
+            del form_data["dataset_hash"]
+            for _, value in upload_data:
+                (value[1] if isinstance(value, tuple) else value).seek(0)
+            upload_data.insert(
+                0, ("train_data", (train_data.split("/")[-1], open(train_data, "rb")))
+            )
+            reused_hash = None
+            response = send()
 
         message = parse_json_to_yaml(response.json())
         raw_response = response.text
 
         if response.status_code == 201:
             logger.info(f"Result\n{message}")
+            if train_data and not reused_hash and training_type != "External":
+                record_upload(
+                    self.base_url,
+                    self.credentials[2],
+                    self.group,
+                    train_data,
+                    response.json().get("DatasetHash"),
+                )
             return re.search(patt, raw_response).group(1)
 
         if response.status_code == 401:
@@ -1071,14 +1128,15 @@ class MLOpsTrainingExperiment(BaseMLOps):
         """
 
         url = f"{self.base_url}/training/execute/{self.group}/{self.training_id}/{exec_id}"
-        response = requests.get(
+        response = self._transport.get(
             url,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
+                + self._token_manager.get_token(),
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.run_training.__qualname__,
             },
+            token_manager=self._token_manager,
         )
         if response.status_code == 200:
             logger.info(f"Model training starting - Hash: {self.training_id}")
@@ -1101,12 +1159,13 @@ class MLOpsTrainingExperiment(BaseMLOps):
 
     def __refresh_execution_list(self):
         url = f"{self.base_url}/training/describe/{self.group}/{self.training_id}"
-        response = requests.get(
+        response = self._transport.get(
             url,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url)
+                + self._token_manager.get_token()
             },
+            token_manager=self._token_manager,
         )
 
         if response.status_code == 404:
@@ -1154,6 +1213,7 @@ class MLOpsTrainingExperiment(BaseMLOps):
         model_params: Optional[Union[str, dict]] = None,
         model_hash: Optional[str] = None,
         wait_complete: Optional[bool] = False,
+        progress: Optional[ProgressCallback] = None,
     ) -> Union[dict, MLOpsExecution]:
         """
         Runs a prediction from the current model.
@@ -1184,6 +1244,8 @@ class MLOpsTrainingExperiment(BaseMLOps):
             A optional list with additional files paths that should be uploaded. If the scoring function refer to this file they will be on the same folder as the source file. Just used when training_type is Custom
         wait_complete: Optional[bool], optional
             Boolean that informs if a model training is completed (True) or not (False). Default value is False
+        progress: Optional[Callable[[TransferProgress], None]], optional
+            Function called while the training files are uploaded, with the bytes sent and the throughput
 
         Raises
         ------
@@ -1253,7 +1315,33 @@ class MLOpsTrainingExperiment(BaseMLOps):
                 f"Invalid training_type {training_type}. Should be one of the following: Custom, AutoML or External"
             )
 
-        if training_type == "Custom":
+        digest = journaled_inputs(
+            run_name,
+            training_type,
+            description,
+            train_data,
+            getattr(dataset, "dataset_hash", dataset),
+            training_reference,
+            python_version,
+            conf_dict,
+            source_file,
+            requirements_file,
+            env,
+            X_train,
+            y_train,
+            model_outputs,
+            model_file,
+            model_metrics,
+            model_params,
+            model_hash,
+            *(extra_files or []),
+        )
+        previous = self.__journaled_execution(digest)
+
+        if previous is not None:
+            exec_id = previous
+
+        elif training_type == "Custom":
             exec_id = self.__upload_training(
                 run_name=run_name,
                 training_type=training_type,
@@ -1266,6 +1354,7 @@ class MLOpsTrainingExperiment(BaseMLOps):
                 env=env,
                 requirements_file=requirements_file,
                 extra_files=extra_files,
+                progress=progress,
             )
 
         elif training_type == "AutoML":
@@ -1276,6 +1365,7 @@ class MLOpsTrainingExperiment(BaseMLOps):
                 train_data=train_data,
                 dataset=dataset,
                 conf_dict=conf_dict,
+                progress=progress,
             )
 
         elif training_type == "External":
@@ -1293,13 +1383,16 @@ class MLOpsTrainingExperiment(BaseMLOps):
                 model_metrics=model_metrics,
                 model_params=model_params,
                 model_hash=model_hash,
+                progress=progress,
             )
 
         else:
             raise InputError("Invalid training type")
 
         if exec_id:
-            self.__execute_training(exec_id)
+            if previous is None:
+                self.__execute_training(exec_id)
+                record_submission(TRAINING, self.training_id, self.group, exec_id, digest)
             self.__refresh_execution_list()
             run = MLOpsTrainingExecution(
                 training_id=self.training_id,
@@ -1308,22 +1401,81 @@ class MLOpsTrainingExperiment(BaseMLOps):
                 login=self.credentials[0],
                 password=self.credentials[1],
                 tenant=self.credentials[2],
+                parent=self,
             )
             response = run.get_status()
             status = response["Status"]
             if wait_complete:
                 print("Waiting the training run.", end="")
-                while status in ["Running", "Requested"]:
-                    sleep(30)
-                    print(".", end="", flush=True)
-                    response = run.get_status()
-                    status = response["Status"]
+                response = wait_until(
+                    run.get_status,
+                    lambda response: response["Status"] not in ["Running", "Requested"],
+                    policy=self.wait_policy,
+                    on_check=lambda _: print(".", end="", flush=True),
+                )
+                status = response["Status"]
             if status == "Failed":
                 logger.error(response["Message"])
                 raise ExecutionError("Training execution failed")
             else:
                 return run
 
+    def __journaled_execution(self, digest: Optional[str]) -> Optional[str]:
+        """Execution of the same inputs in the journal, when it succeeded or is still running"""
+        entry = find_submission(TRAINING, self.training_id, self.group, digest)
+        if entry is None:
+            return None
+        if not entry.finished:
+            if self.get_training_execution(entry.execution_id).status == "Failed":
+                return None
+        logger.info(
+            f"These inputs were already submitted as execution {entry.execution_id} ({entry.state}). Re-attaching to it"
+        )
+        return entry.execution_id
+
+    def resume_executions(
+        self, *, pending_only: bool = True
+    ) -> List[MLOpsTrainingExecution]:
+        """
+        Re-attach to the executions of this experiment found in the execution journal, like after a restart of the
+        process
+
+        Parameters
+        ----------
+        pending_only: bool, optional
+            Only the executions that did not succeed or fail yet. Default is True
+
+        Raises
+        ------
+        InputError
+            When the execution journal is not enabled
+
+        Returns
+        -------
+        List[MLOpsTrainingExecution]
+            Handles of the executions, in the order they were submitted
+        """
+        journal = get_execution_journal()
+        if journal is None:
+            raise InputError(
+                "The execution journal is not enabled. Use set_execution_journal or the env variable MLOPS_EXECUTION_JOURNAL"
+            )
+        filters = dict(kind=TRAINING, parent_hash=self.training_id, group=self.group)
+        entries = journal.pending(**filters) if pending_only else journal.entries(**filters)
+        logger.info(f"Re-attaching to {len(entries)} executions of training {self.training_id}")
+        return [
+            MLOpsTrainingExecution(
+                training_id=self.training_id,
+                group=self.group,
+                exec_id=entry.execution_id,
+                login=self.credentials[0],
+                password=self.credentials[1],
+                tenant=self.credentials[2],
+                parent=self,
+            )
+            for entry in entries
+        ]
+
     def get_training_execution(
         self, exec_id: Optional[str] = None
     ) -> MLOpsTrainingExecution:
@@ -1358,6 +1510,7 @@ class MLOpsTrainingExperiment(BaseMLOps):
             login=self.credentials[0],
             password=self.credentials[1],
             tenant=self.credentials[2],
+            parent=self,
         )
         exec.get_status()
 
@@ -1425,6 +1578,10 @@ class MLOpsTrainingClient(BaseMLOpsClient):
         Password for authenticating with the client. You can also use the env variable MLOPS_PASSWORD to set this
     url: str
         URL to MLOps Server. Default value is https://neomaril.datarisk.net, use it to test your deployment first before changing to production. You can also use the env variable MLOPS_URL to set this
+    transport: Optional[Transport], optional
+        Pooled HTTP transport shared by the client and every experiment and execution it returns. Use it to tune the connection pool
+    lazy_connect: bool, optional
+        Do not contact the server when the client is created. The user logs in on the first request instead
 
     Raises
     ------
@@ -1446,8 +1603,21 @@ class MLOpsTrainingClient(BaseMLOpsClient):
 
     """
 
-    def __init__(self, login: str, password: str, tenant: str) -> None:
-        super().__init__(login=login, password=password, tenant=tenant)
+    def __init__(
+        self,
+        login: str,
+        password: str,
+        tenant: str,
+        transport: Optional[Transport] = None,
+        lazy_connect: bool = False,
+    ) -> None:
+        super().__init__(
+            login=login,
+            password=password,
+            tenant=tenant,
+            transport=transport,
+            lazy_connect=lazy_connect,
+        )
 
     def __repr__(self) -> str:
         return f'API version {self.version} \n Token="{self.user_token}'
@@ -1489,6 +1659,7 @@ class MLOpsTrainingClient(BaseMLOpsClient):
             password=self.credentials[1],
             group=group,
             tenant=self.credentials[2],
+            parent=self,
         )
 
     def __get_repeated_thash(
@@ -1518,12 +1689,13 @@ class MLOpsTrainingClient(BaseMLOpsClient):
             str | None: THash if it is found, otherwise, None is returned
         """
         url = f"{self.base_url}/training/search"
-        response = requests.get(
+        response = self._transport.get(
             url,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url)
+                + self._token_manager.get_token()
             },
+            token_manager=self._token_manager,
         )
 
         formatted_msg = parse_json_to_yaml(response.json())
@@ -1586,15 +1758,16 @@ class MLOpsTrainingClient(BaseMLOpsClient):
 
         data = {"experiment_name": experiment_name, "model_type": model_type}
 
-        response = requests.post(
+        response = self._transport.post(
             url,
             data=data,
             headers={
                 "Authorization": "Bearer "
-                + refresh_token(*self.credentials, self.base_url),
+                + self._token_manager.get_token(),
                 "Neomaril-Origin": "Codex",
                 "Neomaril-Method": self.__create.__qualname__,
             },
+            token_manager=self._token_manager,
         )
 
         formatted_msg = parse_json_to_yaml(response.json())
@@ -1692,4 +1865,5 @@ class MLOpsTrainingClient(BaseMLOpsClient):
             password=self.credentials[1],
             group=group,
             tenant=self.credentials[2],
+            parent=self,
         )
@@ -0,0 +1,489 @@
+"""
+Execution Watcher Module
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mlops_codex.__model_states import ModelExecutionState
+from mlops_codex.exceptions import (
+    ExecutionError,
+    WaitCancelledError,
+    WaitTimeoutError,
+)
+from mlops_codex.logger_config import get_logger
+from mlops_codex.shared.utils import LazySingleton
+from mlops_codex.shared.waiter import (
+    CancelHook,
+    WaitPolicy,
+    is_cancelled,
+    sleep_unless_cancelled,
+)
+
+logger = get_logger()
+
+_FINAL_STATES = (ModelExecutionState.Succeeded, ModelExecutionState.Failed)
+
+
+def _execution_key(execution: Any) -> Tuple[str, Optional[str], str]:
+    """Identify an execution, so the same execution added twice is polled only once"""
+    model = getattr(execution, "model", None)
+    owner = (
+        getattr(model, "model_hash", None)
+        or getattr(execution, "preprocessing_hash", None)
+        or getattr(execution, "training_id", None)
+        or getattr(execution, "group", None)
+    )
+    return type(execution).__name__, owner, str(execution.exec_id)
+
+
+def _execution_state(execution: Any) -> ModelExecutionState:
+    """Fetch the status of any execution class and convert it to ModelExecutionState"""
+    status = execution.get_status()
+    if isinstance(status, dict):
+        status = status["Status"]
+    if isinstance(status, ModelExecutionState):
+        return status
+    return ModelExecutionState[status]
+
+
+class ExecutionWatcher:
+    """
+    Track many executions at once and get them back as they finish.
+
+    Works with `ModelExecution`, `PreprocessExecution`, `MLOpsExecution` and
+    `MLOpsTrainingExecution`. All the pending executions are checked in the same round,
+    at most `max_workers` at a time, and the rounds follow a single `WaitPolicy`
+    schedule. An execution added more than once is only checked once.
+
+    Parameters
+    ----------
+    executions: Iterable, optional
+        Executions to watch. More can be added later with `add`
+    max_workers: int, optional
+        Maximum number of status requests running at the same time. Default is 8
+    policy: Optional[WaitPolicy], optional
+        Intervals between the rounds of checks. Default is `WaitPolicy()`
+
+    Example
+    -------
+    .. code-block:: python
+
+        from mlops_codex.watcher import ExecutionWatcher
+
+        executions = [model.predict(path, wait_complete=False) for path in files]
+
+        watcher = ExecutionWatcher(executions, max_workers=16)
+        for execution in watcher.as_completed(timeout=3600):
+            if watcher.state(execution) == ModelExecutionState.Succeeded:
+                execution.download()
+    """
+
+    def __init__(
+        self,
+        executions: Iterable = (),
+        *,
+        max_workers: int = 8,
+        policy: Optional[WaitPolicy] = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.policy = policy or WaitPolicy()
+        self.__lock = threading.Lock()
+        self.__pending: Dict[Tuple, Any] = {}
+        self.__states: Dict[Tuple, ModelExecutionState] = {}
+        self.__errors: Dict[Tuple, Exception] = {}
+
+        for execution in executions:
+            self.add(execution)
+
+    def __repr__(self) -> str:
+        return f"ExecutionWatcher(pending={len(self.__pending)})"
+
+    def add(self, execution: Any) -> bool:
+        """
+        Start watching an execution
+
+        Parameters
+        ----------
+        execution: Any
+            Execution to watch
+
+        Returns
+        -------
+        bool
+            False if the execution was already being watched
+        """
+        key = _execution_key(execution)
+        with self.__lock:
+            if key in self.__pending or key in self.__states:
+                return False
+            self.__pending[key] = execution
+            return True
+
+    @property
+    def pending(self) -> List[Any]:
+        """Executions that did not finish yet"""
+        with self.__lock:
+            return list(self.__pending.values())
+
+    def state(self, execution: Any) -> Optional[ModelExecutionState]:
+        """
+        Last known state of an execution
+
+        Parameters
+        ----------
+        execution: Any
+            Watched execution
+
+        Returns
+        -------
+        Optional[ModelExecutionState]
+            The state, or None if it was not checked yet
+        """
+        return self.__states.get(_execution_key(execution))
+
+    def error(self, execution: Any) -> Optional[Exception]:
+        """
+        Error raised while checking an execution. Such executions are not checked again
+
+        Parameters
+        ----------
+        execution: Any
+            Watched execution
+
+        Returns
+        -------
+        Optional[Exception]
+            The error, or None if the status could be checked
+        """
+        return self.__errors.get(_execution_key(execution))
+
+    def __check(self, item: Tuple[Tuple, Any]) -> Tuple[Tuple, bool]:
+        key, execution = item
+        try:
+            state = _execution_state(execution)
+        except Exception as exc:
+            logger.warning(f"Could not check execution {execution.exec_id}: {exc}")
+            self.__errors[key] = exc
+            return key, True
+        self.__states[key] = state
+        return key, state in _FINAL_STATES
+
+    def as_completed(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ) -> Iterator[Any]:
+        """
+        Yield the executions as they finish, either succeeded or failed
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of the policy
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+
+        Raises
+        ------
+        WaitTimeoutError
+            Some executions did not finish before `timeout`
+        WaitCancelledError
+            The wait was cancelled
+
+        Returns
+        -------
+        Iterator[Any]
+            The finished executions
+        """
+        timeout = timeout if timeout is not None else self.policy.timeout
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        intervals = self.policy.intervals()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                if is_cancelled(cancel):
+                    raise WaitCancelledError("Wait cancelled")
+
+                with self.__lock:
+                    batch = list(self.__pending.items())
+                if not batch:
+                    return
+
+                for key, finished in pool.map(self.__check, batch):
+                    if finished:
+                        with self.__lock:
+                            execution = self.__pending.pop(key)
+                        yield execution
+
+                if not self.__pending:
+                    return
+
+                delay = next(intervals)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise WaitTimeoutError(
+                            f"{len(self.__pending)} executions still running after {timeout} seconds"
+                        )
+                    delay = min(delay, remaining)
+                sleep_unless_cancelled(delay, cancel)
+
+    def wait_all(
+        self, *, timeout: Optional[float] = None, cancel: Optional[CancelHook] = None
+    ) -> List[Any]:
+        """
+        Wait until every watched execution finishes
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is the timeout of the policy
+        cancel: Optional[Union[threading.Event, Callable[[], bool]]], optional
+            Stops waiting as soon as the event is set or the callable returns True
+
+        Returns
+        -------
+        List[Any]
+            The executions in the order they finished
+        """
+        return list(self.as_completed(timeout=timeout, cancel=cancel))
+
+
+class _Tracked:
+    """Execution followed by an `ExecutionPoller` and the future it resolves"""
+
+    __slots__ = ("execution", "future", "intervals", "next_check", "deadline")
+
+    def __init__(self, execution: Any, policy: WaitPolicy) -> None:
+        self.execution = execution
+        self.future: Future = Future()
+        self.intervals = policy.intervals()
+        self.next_check = time.monotonic()
+        self.deadline = (
+            time.monotonic() + policy.timeout if policy.timeout is not None else None
+        )
+
+
+class ExecutionPoller:
+    """
+    Background thread that checks executions and resolves their futures.
+
+    Each execution follows its own `WaitPolicy` schedule, but all of them are checked
+    by the same thread, with at most `max_workers` status requests at a time. The
+    thread only runs while there are executions to follow.
+
+    The future of an execution gets the execution as result when it succeeds, and an
+    `ExecutionError` when it fails. Callbacks run in the poller threads, so long work
+    inside them delays the checks of the other executions.
+
+    Parameters
+    ----------
+    max_workers: int, optional
+        Maximum number of status requests running at the same time. Default is 8
+    """
+
+    def __init__(self, *, max_workers: int = 8) -> None:
+        self.max_workers = max_workers
+        self.__lock = threading.Lock()
+        self.__wakeup = threading.Event()
+        self.__tracked: Dict[Tuple, _Tracked] = {}
+        self.__thread: Optional[threading.Thread] = None
+
+    def submit(self, execution: Any, policy: Optional[WaitPolicy] = None) -> Future:
+        """
+        Start following an execution
+
+        Parameters
+        ----------
+        execution: Any
+            Execution to follow
+        policy: Optional[WaitPolicy], optional
+            Intervals between the checks and timeout. Default is `WaitPolicy()`
+
+        Returns
+        -------
+        Future
+            Future resolved when the execution finishes. Following the same execution
+            twice returns the same future
+        """
+        key = _execution_key(execution)
+        with self.__lock:
+            tracked = self.__tracked.get(key)
+            if tracked is None:
+                tracked = _Tracked(execution, policy or WaitPolicy())
+                self.__tracked[key] = tracked
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self.__run, name="mlops-codex-poller", daemon=True
+                )
+                self.__thread.start()
+        self.__wakeup.set()
+        return tracked.future
+
+    def __check(self, item: Tuple[Tuple, _Tracked]) -> None:
+        key, tracked = item
+        execution = tracked.execution
+        try:
+            state = _execution_state(execution)
+        except Exception as exc:
+            self.__resolve(key, exc)
+            return
+
+        if state == ModelExecutionState.Succeeded:
+            self.__resolve(key, None)
+        elif state == ModelExecutionState.Failed:
+            self.__resolve(
+                key, ExecutionError(f'Execution "{execution.exec_id}" failed')
+            )
+        elif tracked.deadline is not None and time.monotonic() >= tracked.deadline:
+            self.__resolve(
+                key, WaitTimeoutError(f'Execution "{execution.exec_id}" still running')
+            )
+        else:
+            tracked.next_check = time.monotonic() + next(tracked.intervals)
+
+    def __resolve(self, key: Tuple, error: Optional[Exception]) -> None:
+        with self.__lock:
+            tracked = self.__tracked.pop(key, None)
+        if tracked is None or tracked.future.done():
+            return
+        if error is None:
+            tracked.future.set_result(tracked.execution)
+        else:
+            tracked.future.set_exception(error)
+
+    def __run(self) -> None:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                self.__wakeup.clear()
+                with self.__lock:
+                    cancelled = [
+                        key
+                        for key, tracked in self.__tracked.items()
+                        if tracked.future.cancelled()
+                    ]
+                    for key in cancelled:
+                        del self.__tracked[key]
+                    if not self.__tracked:
+                        self.__thread = None
+                        return
+                    now = time.monotonic()
+                    due = [
+                        (key, tracked)
+                        for key, tracked in self.__tracked.items()
+                        if tracked.next_check <= now
+                    ]
+
+                list(pool.map(self.__check, due))
+
+                with self.__lock:
+                    next_check = min(
+                        (t.next_check for t in self.__tracked.values()), default=None
+                    )
+                if next_check is not None:
+                    self.__wakeup.wait(max(0.0, next_check - time.monotonic()))
+
+
+_default_poller: LazySingleton[ExecutionPoller] = LazySingleton(ExecutionPoller)
+_future_lock = threading.Lock()
+
+
+def get_default_poller() -> ExecutionPoller:
+    """
+    Return the poller used by the futures of the executions
+
+    Returns
+    -------
+    ExecutionPoller
+        Poller shared by the whole process
+    """
+    return _default_poller.get()
+
+
+class FutureExecutionMixin:
+    """
+    Future-like interface for execution classes.
+
+    The execution is followed by the process `ExecutionPoller`, so no thread is blocked
+    per execution. Use `as_future` to combine executions with
+    `concurrent.futures.wait` or `concurrent.futures.as_completed`.
+    """
+
+    def as_future(self) -> Future:
+        """
+        Get a `concurrent.futures.Future` resolved when the execution finishes
+
+        Returns
+        -------
+        Future
+            Its result is the execution itself. If the execution fails, it raises `ExecutionError`
+        """
+        with _future_lock:
+            future = getattr(self, "_future", None)
+            if future is None:
+                future = get_default_poller().submit(
+                    self, getattr(self, "wait_policy", None)
+                )
+                self._future = future
+        return future
+
+    def done(self) -> bool:
+        """
+        Tell if the execution finished, without waiting for it
+
+        Returns
+        -------
+        bool
+            True if the execution succeeded or failed
+        """
+        return self.as_future().done()
+
+    def result(self, timeout: Optional[float] = None):
+        """
+        Wait for the execution to finish
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is None, which waits forever
+
+        Raises
+        ------
+        ExecutionError
+            The execution failed
+        concurrent.futures.TimeoutError
+            The execution did not finish before `timeout`
+
+        Returns
+        -------
+        The execution itself
+        """
+        return self.as_future().result(timeout)
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        """
+        Wait for the execution to finish and get the error that made it fail
+
+        Parameters
+        ----------
+        timeout: Optional[float], optional
+            Maximum number of seconds to wait. Default is None, which waits forever
+
+        Returns
+        -------
+        Optional[BaseException]
+            The error, or None if the execution succeeded
+        """
+        return self.as_future().exception(timeout)
+
+    def add_done_callback(self, fn: Callable[[Any], None]) -> None:
+        """
+        Call `fn` with the execution as soon as it finishes. If it already finished, `fn` is called right away
+
+        Parameters
+        ----------
+        fn: Callable[[Any], None]
+            Function that receives the execution
+        """
+        self.as_future().add_done_callback(lambda _: fn(self))
@@ -0,0 +1,163 @@
+"""
+Local stand-in for the chunked upload endpoints, so `chunked_upload` can be exercised
+offline. Run it with `python tests/chunked_upload_server.py`.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mlops_codex.exceptions import InputError, ServerError
+from mlops_codex.shared.data_transmitter import chunked_upload
+
+
+class ChunkedUploadServer(ThreadingHTTPServer):
+    """
+    Server for the `<url>/chunks` protocol of `chunked_upload`, plus the single-request
+    upload at `<url>` itself.
+
+    `failures` maps a part number to the statuses answered to its first attempts, like
+    `{2: [503, 503]}`, and a status of 0 closes the connection instead. Set `chunked` to
+    False to simulate a server without the protocol.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ChunkedUploadHandler)
+        self.uploads = {}
+        self.files = {}
+        self.failures = {}
+        self.part_requests = []
+        self.single_requests = 0
+        self.chunked = True
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/upload"
+
+
+class ChunkedUploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_POST(self):
+        body = self._body()
+        server = self.server
+        if self.path == "/upload":
+            server.single_requests += 1
+            server.files["single"] = body
+            return self._reply(201, {"Message": "Uploaded", "Size": len(body)})
+        if not server.chunked:
+            return self._reply(404, {"Message": "Not found"})
+        if self.path == "/upload/chunks":
+            upload_id = uuid.uuid4().hex
+            server.uploads[upload_id] = {"meta": json.loads(body), "parts": {}}
+            return self._reply(201, {"UploadId": upload_id})
+        match = re.fullmatch(r"/upload/chunks/(\w+)/complete", self.path)
+        if match and match.group(1) in server.uploads:
+            upload = server.uploads.pop(match.group(1))
+            for part in json.loads(body)["Parts"]:
+                data = upload["parts"].get(part["Part"])
+                if data is None or hashlib.sha256(data).hexdigest() != part["Sha256"]:
+                    return self._reply(400, {"Message": f"Bad part {part['Part']}"})
+            content = b"".join(data for _, data in sorted(upload["parts"].items()))
+            server.files[upload["meta"]["FileName"]] = content
+            return self._reply(201, {"Message": "Uploaded", "Size": len(content)})
+        return self._reply(404, {"Message": "Not found"})
+
+    def do_GET(self):
+        match = re.fullmatch(r"/upload/chunks/(\w+)", self.path)
+        if not match or match.group(1) not in self.server.uploads:
+            return self._reply(404, {"Message": "Not found"})
+        return self._reply(200, {"Parts": sorted(self.server.uploads[match.group(1)]["parts"])})
+
+    def do_PUT(self):
+        server = self.server
+        match = re.fullmatch(r"/upload/chunks/(\w+)/(\d+)", self.path)
+        if not match or match.group(1) not in server.uploads:
+            return self._reply(404, {"Message": "Not found"})
+        number = int(match.group(2))
+        with server.lock:
+            server.part_requests.append(number)
+            pending = server.failures.get(number) or []
+            status = pending.pop(0) if pending else None
+        data = self._body()
+        if status == 0:
+            self.close_connection = True
+            return self.connection.shutdown(2)
+        if status is not None:
+            return self._reply(status, {"Message": "Try again"})
+        server.uploads[match.group(1)]["parts"][number] = data
+        return self._reply(200, {"Part": number})
+
+
+def _upload(server, path, **kwargs):
+    request = dict(
+        url=server.url,
+        method="POST",
+        success_code=201,
+        custom_exception=InputError,
+        custom_exception_message="Upload failed",
+        specific_error_code=404,
+        logger_msg="Upload failed",
+        headers={"Authorization": "Bearer token"},
+    )
+    return chunked_upload(request, "input", path, part_size=1024 * 1024, **kwargs)
+
+
+if __name__ == "__main__":
+    server = ChunkedUploadServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.csv")
+        with open(path, "wb") as f:
+            f.write(os.urandom(5 * 1024 * 1024 + 123))
+        with open(path, "rb") as f:
+            content = f.read()
+
+        server.failures = {2: [503, 0]}
+        response = _upload(server, path, retries=2)
+        assert response.json()["Size"] == len(content)
+        assert server.files["input.csv"] == content
+        assert server.part_requests.count(2) == 3
+        print("Upload with retried parts succeeded")
+
+        server.part_requests.clear()
+        server.failures = {4: [503, 503]}
+        try:
+            _upload(server, path, retries=1)
+            raise AssertionError("The upload should have failed")
+        except ServerError:
+            pass
+        server.part_requests.clear()
+        _upload(server, path)
+        assert server.part_requests == [4]
+        assert server.files["input.csv"] == content
+        print("Interrupted upload resumed with the missing part only")
+
+        server.chunked = False
+        _upload(server, path)
+        assert server.single_requests == 1
+        assert content in server.files["single"]
+        print("Fallback to a single request succeeded")
+
+    server.shutdown()
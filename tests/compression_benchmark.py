@@ -0,0 +1,215 @@
+"""
+Benchmark of request compression against the uncompressed path, over a local server that
+simulates a slow link. Run it with `python tests/compression_benchmark.py`.
+
+For every encoding, it reports the bytes sent on the wire and the latency of sync predictions,
+multipart uploads and a download, and checks the server received the original bodies.
+"""
+
+import gzip
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mlops_codex.http_request_handler import Transport, make_request
+from mlops_codex.shared import json_codec
+from mlops_codex.shared.compression import ACCEPT_ENCODING, CompressionPolicy
+from mlops_codex.shared.data_transmitter import stream_to_file
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BANDWIDTH = 2 * 1024 * 1024
+"""Bytes per second of the simulated link"""
+
+CALLS = 10
+
+
+class BenchmarkServer(ThreadingHTTPServer):
+    """
+    Server that decodes compressed and chunked request bodies, and counts the bytes it
+    received and sent. Every transfer sleeps as long as the simulated link would take.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), BenchmarkHandler)
+        self.received = 0
+        self.sent = 0
+        self.bodies = []
+        self.download = b""
+        self.download_gzip = b""
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api"
+
+    def reset(self):
+        with self.lock:
+            self.received = 0
+            self.sent = 0
+            self.bodies.clear()
+
+
+class BenchmarkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _raw_body(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(body)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send(self, status, body, headers=None):
+        time.sleep(len(body) / BANDWIDTH)
+        with self.server.lock:
+            self.server.sent += len(body)
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        raw = self._raw_body()
+        time.sleep(len(raw) / BANDWIDTH)
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            body = gzip.decompress(raw)
+        elif encoding == "zstd":
+            body = zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+        else:
+            body = raw
+        with self.server.lock:
+            self.server.received += len(raw)
+            self.server.bodies.append(body)
+        self._send(200, b'{"Result": [0.42]}', {"Content-Type": "application/json"})
+
+    def do_GET(self):
+        body, headers = self.server.download, {"Content-Type": "text/csv"}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body, headers["Content-Encoding"] = self.server.download_gzip, "gzip"
+        self._send(200, body, headers)
+
+
+def _features(rows):
+    """Input of a sync prediction, like a few hundred KB of feature vectors"""
+    rng = random.Random(42)
+    segments = ["retail", "corporate", "private", "public"]
+    return [
+        {
+            "id": f"customer-{i:06d}",
+            "segment": rng.choice(segments),
+            **{f"feature_{j:03d}": round(rng.gauss(0, 1), 4) for j in range(40)},
+        }
+        for i in range(rows)
+    ]
+
+
+def _measure(server, send):
+    server.reset()
+    latencies = []
+    for _ in range(CALLS):
+        started = time.monotonic()
+        send()
+        latencies.append(time.monotonic() - started)
+    return server.received / CALLS, server.sent / CALLS, statistics.median(latencies)
+
+
+def _report(name, rows):
+    print(f"\n{name}")
+    print(f"{'encoding':<10}{'sent':>12}{'received':>12}{'p50':>10}")
+    for encoding, (sent, received, latency) in rows.items():
+        print(
+            f"{encoding:<10}{sent / 1024:>10.0f}KB{received / 1024:>10.0f}KB"
+            f"{latency * 1000:>8.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    server = BenchmarkServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    policies = {"none": None, "gzip": CompressionPolicy("gzip")}
+    if zstandard is not None:
+        policies["zstd"] = CompressionPolicy("zstd")
+
+    payload = {"Input": _features(600)}
+    expected = json_codec.dumps(payload)
+    with tempfile.TemporaryDirectory() as folder:
+        upload_path = os.path.join(folder, "input.csv")
+        with open(upload_path, "w") as f:
+            for row in _features(4000):
+                f.write(",".join(str(value) for value in row.values()) + "\n")
+
+        predictions, uploads = {}, {}
+        for encoding, policy in policies.items():
+            transport = Transport(compression=policy)
+            predictions[encoding] = _measure(
+                server,
+                lambda: make_request(
+                    f"{server.url}/model/sync/run/group/hash",
+                    "POST",
+                    200,
+                    data=json_codec.dumps(payload),
+                    transport=transport,
+                ),
+            )
+            assert all(body == expected for body in server.bodies)
+
+            def upload():
+                with open(upload_path, "rb") as f:
+                    make_request(
+                        f"{server.url}/model/async/run/group/hash",
+                        "POST",
+                        200,
+                        files={"input": ("input.csv", f)},
+                        transport=transport,
+                    )
+
+            uploads[encoding] = _measure(server, upload)
+            with open(upload_path, "rb") as f:
+                content = f.read()
+            assert all(content in body for body in server.bodies)
+
+        _report(f"Sync prediction ({len(expected) / 1024:.0f}KB of JSON)", predictions)
+        _report(f"Upload ({os.path.getsize(upload_path) / 1024:.0f}KB CSV)", uploads)
+
+        server.download = content
+        server.download_gzip = gzip.compress(content, compresslevel=6)
+        downloads = {}
+        accepts = {"identity": "identity", "negotiated": ACCEPT_ENCODING}
+        for encoding, accept in accepts.items():
+
+            def download():
+                response = make_request(
+                    f"{server.url}/model/async/result/group/1",
+                    "GET",
+                    200,
+                    headers={"Accept-Encoding": accept},
+                    stream=True,
+                )
+                path = stream_to_file(response, os.path.join(folder, "result.csv"))
+                with open(path, "rb") as f:
+                    assert f.read() == server.download
+
+            downloads[encoding] = _measure(server, download)
+        _report(f"Download ({len(server.download) / 1024:.0f}KB CSV)", downloads)
+
+    server.shutdown()